@@ -3,9 +3,27 @@
 Created on Thu Jan 22 20:46:49 2026
 
 @author: erika
+
+Run with no arguments for the chart and the interactive tax receipt viewer.
+Run headless over a file of scenarios (CSV or JSONL, '-' for stdin), one
+summary row per scenario streamed out as it is computed:
+
+    python "Portfolio Calculator.py" --batch scenarios.csv --out summary.csv
+    cat scenarios.jsonl | python "Portfolio Calculator.py" --batch - --ledgers ledgers.jsonl
+
+Each input row may set any of the assumptions below by name, plus an
+optional 'id' (copied to the output) and 'receipt_age' (age of the tax
+receipt figures in the summary; default start_age). --monthly pays
+contributions monthly and amortizes the mortgage monthly, in either mode.
 """
 
-import matplotlib.pyplot as plt
+import argparse
+import csv
+import json
+import sys
+
+import uk_tax
+from ledger import Ledger
 
 # =========================
 # Core assumptions
@@ -18,6 +36,9 @@ start_age = 22
 growth_rate = 0.06
 inflation = 0.03
 
+# 1 = contributions paid monthly and a monthly repayment mortgage (--monthly)
+monthly_steps = 0
+
 # =========================
 # Investment assumptions
 # =========================
@@ -48,62 +69,80 @@ property_price_start = 170000
 deposit_rate = 0.10
 house_price_growth = 0.05
 mortgage_rate = 0.045
-mortgage_rate_real = (1 + mortgage_rate) / (1 + inflation) - 1
 mortgage_term = 30
 
+# Every assumption above, by name (batch rows override these)
+DEFAULTS = {
+    "base_salary": base_salary,
+    "years": years,
+    "start_age": start_age,
+    "growth_rate": growth_rate,
+    "inflation": inflation,
+    "monthly_steps": monthly_steps,
+    "pension_base": pension_base,
+    "isa_base": isa_base,
+    "cash_base": cash_base,
+    "lisa_base": lisa_base,
+    "pension_rate": pension_rate,
+    "isa_rate": isa_rate,
+    "cash_rate": cash_rate,
+    "lisa_rate": lisa_rate,
+    "pension_contribution_rate": pension_contribution_rate,
+    "isa_contribution_rate": isa_contribution_rate,
+    "lisa_contribution_rate": lisa_contribution_rate,
+    "lisa_monthly_amount": lisa_monthly_amount,
+    "lisa_max_bonus_limit": lisa_max_bonus_limit,
+    "lisa_bonus_rate": lisa_bonus_rate,
+    "property_price_start": property_price_start,
+    "deposit_rate": deposit_rate,
+    "house_price_growth": house_price_growth,
+    "mortgage_rate": mortgage_rate,
+    "mortgage_term": mortgage_term,
+}
+
 # =========================
 # Net pay function
 # =========================
 
 def net_pay(gross):
-    personal_allowance = 12570
-    basic_limit = 50270
-    NI_lower = 12570
-    NI_upper = 50270
-
-    basic_rate = 0.20
-    NI_main_rate = 0.08
-    NI_upper_rate = 0.02
-
-    loan_threshold = 28470
-    loan_rate = 0.09
-
-    pension_contribution = 0.05 * gross
-    taxable = max(0, gross - pension_contribution)
-
-    # Income tax
-    if taxable <= personal_allowance:
-        tax = 0
-    else:
-        tax = min(taxable - personal_allowance, basic_limit - personal_allowance) * basic_rate
-
-    # NI
-    if taxable <= NI_lower:
-        ni = 0
-    elif taxable <= NI_upper:
-        ni = (taxable - NI_lower) * NI_main_rate
-    else:
-        ni = (NI_upper - NI_lower) * NI_main_rate + (taxable - NI_upper) * NI_upper_rate
-
-    # Student loan
-    loan = max(0, (taxable - loan_threshold) * loan_rate)
-
-    net = gross - pension_contribution - tax - ni - loan
-    return net, pension_contribution, tax, ni, loan
+    pay = uk_tax.breakdown(gross, pension_rate=0.05)
+    return (float(pay["net"]), float(pay["pension"]), float(pay["income_tax"]),
+            float(pay["ni"]), float(pay["student_loan"]))
 
-def print_tax_receipt(gross, needs_rate=0.60, isa_rate=0.15, savings_rate=0.05, wants_rate=0.20):
+def tax_receipt(gross, needs_rate=0.60, isa_rate=0.15, savings_rate=0.05, wants_rate=0.20):
+    """Figures on the tax receipt for one gross salary (annual amounts)."""
     net, pension, tax, ni, loan = net_pay(gross)
+    return {
+        "gross": gross,
+        "pension": pension,
+        "tax": tax,
+        "ni": ni,
+        "loan": loan,
+        "employer_pension": 0.10 * gross,
+        "net": net,
+        # Split net pay
+        "needs": net * needs_rate,
+        "isa_contribution": net * isa_rate,
+        "savings": net * savings_rate,
+        "wants": net * wants_rate,
+    }
 
-    employer_pension = 0.10 * gross
+def print_tax_receipt(gross, needs_rate=0.60, isa_rate=0.15, savings_rate=0.05, wants_rate=0.20):
+    receipt = tax_receipt(gross, needs_rate, isa_rate, savings_rate, wants_rate)
+    net = receipt["net"]
+    pension = receipt["pension"]
+    tax = receipt["tax"]
+    ni = receipt["ni"]
+    loan = receipt["loan"]
+    employer_pension = receipt["employer_pension"]
 
     monthly_net = net / 12
     monthly_gross = gross / 12
 
-    # Split net pay
-    needs = net * needs_rate
-    isa_contribution = net * isa_rate
-    savings = net * savings_rate
-    wants = net * wants_rate
+    needs = receipt["needs"]
+    isa_contribution = receipt["isa_contribution"]
+    savings = receipt["savings"]
+    wants = receipt["wants"]
 
     monthly_needs = needs / 12
     monthly_isa = isa_contribution / 12
@@ -141,181 +180,441 @@ def print_tax_receipt(gross, needs_rate=0.60, isa_rate=0.15, savings_rate=0.05,
     print("=" * 45)
 
 # =========================
-# Tracking lists (year 0)
+# Projection
 # =========================
 
-nominal_salary = [base_salary]
-real_salary = [base_salary]
-net_salary = [net_pay(base_salary)[0]]
+def monthly_growth(annual_rate):
+    """
+    (g, G, A) for a year of 12 monthly steps at a real annual rate: the monthly
+    factor g, the year's growth G = g**12 and the annuity factor A = (G - 1) / (g - 1).
+    """
+    g = max(1 + annual_rate, 0) ** (1 / 12)
+    G = g ** 12
+    A = 12.0 if abs(g - 1) < 1e-12 else (G - 1) / (g - 1)
+    return g, G, A
+
+def year_end(balance, monthly_flow, growth):
+    """A balance after 12 months of growth with a level monthly flow paid at each month end."""
+    _, G, A = growth
+    return balance * G + monthly_flow * A
+
+def repayment(loan, growth, months):
+    """Level monthly payment that repays loan over the given number of months."""
+    g = growth[0]
+    if abs(g - 1) < 1e-12:
+        return loan / months
+    return loan * (g - 1) / (1 - g ** -months)
+
+COLUMNS = [
+    "nominal_salary", "real_salary", "net_salary",
+    "pension", "isa", "cash", "lisa",
+    "property_value", "mortgage_balance", "home_equity",
+    "net_worth",
+]
 
-pension = [pension_base]
-isa = [isa_base]
-cash = [cash_base]
-lisa = [lisa_base]
+def project(params=None):
+    """
+    Run the projection for the assumptions above, with any of them
+    overridden by `params`. Returns (ledger, purchase_year), purchase_year
+    being None if the house is never bought.
+    """
+    p = dict(DEFAULTS)
+    unknown = set(params or {}) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown assumptions: {sorted(unknown)}")
+    p.update(params or {})
+
+    base_salary = p["base_salary"]
+    years = int(p["years"])
+    growth_rate = p["growth_rate"]
+    inflation = p["inflation"]
+    pension_rate = p["pension_rate"]
+    isa_rate = p["isa_rate"]
+    cash_rate = p["cash_rate"]
+    lisa_rate = p["lisa_rate"]
+    pension_contribution_rate = p["pension_contribution_rate"]
+    isa_contribution_rate = p["isa_contribution_rate"]
+    lisa_contribution_rate = p["lisa_contribution_rate"]
+    lisa_monthly_amount = p["lisa_monthly_amount"]
+    lisa_max_bonus_limit = p["lisa_max_bonus_limit"]
+    lisa_bonus_rate = p["lisa_bonus_rate"]
+    property_price_start = p["property_price_start"]
+    deposit_rate = p["deposit_rate"]
+    house_price_growth = p["house_price_growth"]
+    mortgage_rate_real = (1 + p["mortgage_rate"]) / (1 + inflation) - 1
+    mortgage_term = p["mortgage_term"]
+    monthly = bool(p["monthly_steps"])
+
+    # Monthly steps: each year's 12 payments compounded in closed form
+    pension_growth = monthly_growth(pension_rate - inflation)
+    isa_growth = monthly_growth(isa_rate - inflation)
+    lisa_growth = monthly_growth(lisa_rate - inflation)
+    mortgage_growth = monthly_growth(mortgage_rate_real)
+
+    # =========================
+    # Ledger (year 0)
+    # =========================
+
+    # One preallocated row per year; ledger["pension"] etc. are column views
+    ledger = Ledger(COLUMNS, years)
+
+    nominal_salary = ledger["nominal_salary"]
+    real_salary = ledger["real_salary"]
+    net_salary = ledger["net_salary"]
+
+    pension = ledger["pension"]
+    isa = ledger["isa"]
+    cash = ledger["cash"]
+    lisa = ledger["lisa"]
+
+    property_value = ledger["property_value"]
+    mortgage_balance = ledger["mortgage_balance"]
+    home_equity = ledger["home_equity"]
+
+    nominal_salary[0] = base_salary
+    real_salary[0] = base_salary
+    net_salary[0] = net_pay(base_salary)[0]
+
+    pension[0] = p["pension_base"]
+    isa[0] = p["isa_base"]
+    cash[0] = p["cash_base"]
+    lisa[0] = p["lisa_base"]
+
+    property_value[0] = 0
+    mortgage_balance[0] = 0
+    home_equity[0] = 0
+
+    house_bought = False
+    annual_mortgage_payment = None
+    purchase_year = None
+
+    # =========================
+    # Simulation loop
+    # =========================
+
+    for year in range(1, years):
+
+        # Salaries
+        nominal_salary[year] = nominal_salary[year - 1] * (1 + growth_rate)
+        real_salary[year] = real_salary[year - 1] * (1 + growth_rate - inflation)
+        current_net = net_pay(real_salary[year])[0]
+        net_salary[year] = current_net
+
+        # Pension / ISA / Cash
+        if monthly:
+            pension[year] = year_end(pension[year - 1], pension_contribution_rate * real_salary[year] / 12,
+                                     pension_growth)
+            isa[year] = year_end(isa[year - 1], isa_contribution_rate * current_net / 12, isa_growth)
+        else:
+            pension[year] = (
+                pension[year - 1] * (1 + pension_rate - inflation) +
+                pension_contribution_rate * real_salary[year]
+            )
 
-property_value = [0]
-mortgage_balance = [0]
-home_equity = [0]
+            isa[year] = (
+                isa[year - 1] * (1 + isa_rate - inflation) +
+                isa_contribution_rate * current_net
+            )
 
-house_bought = False
-annual_mortgage_payment = None
-purchase_year = None
+        cash[year] = cash[year - 1] * (1 + cash_rate - inflation)
 
-# =========================
-# Simulation loop
-# =========================
+        # ---------- LISA ----------
+        actual_lisa_annual = 0
+        lisa_bonus = 0
 
-for year in range(1, years):
-
-    # Salaries
-    nominal_salary.append(nominal_salary[-1] * (1 + growth_rate))
-    real_salary.append(real_salary[-1] * (1 + growth_rate - inflation))
-    current_net = net_pay(real_salary[-1])[0]
-    net_salary.append(current_net)
-
-    # Pension / ISA / Cash
-    pension.append(
-        pension[-1] * (1 + pension_rate - inflation) +
-        pension_contribution_rate * real_salary[-1]
-    )
-
-    isa.append(
-        isa[-1] * (1 + isa_rate - inflation) +
-        isa_contribution_rate * current_net
-    )
-
-    cash.append(
-        cash[-1] * (1 + cash_rate - inflation)
-    )
-
-    # ---------- LISA ----------
-    actual_lisa_annual = 0
-    lisa_bonus = 0
-    
-    if not house_bought:
-        current_house_price = property_price_start * ((1 + house_price_growth - inflation) ** year)
-        target = current_house_price * deposit_rate
-        projected_with_interest = lisa[-1] * (1 + lisa_rate - inflation)
-        
-        if projected_with_interest < target:
-            needed = target - projected_with_interest
-            
-            # User defined max
-            if lisa_monthly_amount > 0:
-                max_annual = lisa_monthly_amount * 12
-            else:
-                max_annual = lisa_contribution_rate * current_net
-            
-            # Needed contrib accounting for 25% bonus
-            if needed <= 5000:
-                needed_contrib = needed / 1.25
-            else:
-                needed_contrib = needed - 1000
-                
-            actual_lisa_annual = min(max_annual, needed_contrib)
-            lisa_bonus = min(actual_lisa_annual, 4000) * lisa_bonus_rate
+        if not house_bought:
+            current_house_price = property_price_start * ((1 + house_price_growth - inflation) ** year)
+            target = current_house_price * deposit_rate
+            projected_with_interest = lisa[year - 1] * (1 + lisa_rate - inflation)
 
-    lisa.append(
-        lisa[-1] * (1 + lisa_rate - inflation) +
-        actual_lisa_annual +
-        lisa_bonus
-    )
+            if projected_with_interest < target:
+                needed = target - projected_with_interest
 
-    # ---------- PROPERTY ----------
-    current_house_price = property_price_start * (
-        (1 + house_price_growth - inflation) ** year
-    )
-    deposit_required = current_house_price * deposit_rate
+                # User defined max
+                if lisa_monthly_amount > 0:
+                    max_annual = lisa_monthly_amount * 12
+                else:
+                    max_annual = lisa_contribution_rate * current_net
 
-    if not house_bought and lisa[-1] >= deposit_required:
-        house_bought = True
-        purchase_year = year
+                # Needed contrib accounting for 25% bonus
+                if needed <= 5000:
+                    needed_contrib = needed / 1.25
+                else:
+                    needed_contrib = needed - 1000
 
-        property_value.append(current_house_price)
+                actual_lisa_annual = min(max_annual, needed_contrib)
+                lisa_bonus = min(actual_lisa_annual, lisa_max_bonus_limit) * lisa_bonus_rate
 
-        initial_mortgage = current_house_price - deposit_required
-        mortgage_balance.append(initial_mortgage)
+        if monthly:
+            lisa[year] = year_end(lisa[year - 1], (actual_lisa_annual + lisa_bonus) / 12, lisa_growth)
+        else:
+            lisa[year] = (
+                lisa[year - 1] * (1 + lisa_rate - inflation) +
+                actual_lisa_annual +
+                lisa_bonus
+            )
 
-        home_equity.append(deposit_required)
+        # ---------- PROPERTY ----------
+        current_house_price = property_price_start * (
+            (1 + house_price_growth - inflation) ** year
+        )
+        deposit_required = current_house_price * deposit_rate
 
-        lisa[-1] -= deposit_required
-        annual_mortgage_payment = initial_mortgage / mortgage_term
+        if not house_bought and lisa[year] >= deposit_required:
+            if mortgage_term <= 0:
+                raise ValueError(f"mortgage_term must be above 0 (the house is bought in year {year})")
+            house_bought = True
+            purchase_year = year
 
+            property_value[year] = current_house_price
 
-    elif house_bought:
-        property_value.append(
-            property_value[-1] * (1 + house_price_growth - inflation)
-        )
+            initial_mortgage = current_house_price - deposit_required
+            mortgage_balance[year] = initial_mortgage
 
-        mortgage_balance.append(
-            max(
-                0,
-                mortgage_balance[-1] * (1 + mortgage_rate_real) - annual_mortgage_payment
-            )
-        )
+            home_equity[year] = deposit_required
 
-        home_equity.append(
-            property_value[-1] - mortgage_balance[-1]
-        )
+            lisa[year] -= deposit_required
+            if monthly:
+                # Level monthly repayment (in real terms) over the whole term
+                monthly_mortgage_payment = repayment(initial_mortgage, mortgage_growth, mortgage_term * 12)
+            else:
+                annual_mortgage_payment = initial_mortgage / mortgage_term
 
-    else:
-        property_value.append(0)
-        mortgage_balance.append(0)
-        home_equity.append(0)
 
-# =========================
-# Net worth
-# =========================
+        elif house_bought:
+            property_value[year] = property_value[year - 1] * (1 + house_price_growth - inflation)
 
-net_worth = [
-    p + i + c + l + e
-    for p, i, c, l, e in zip(pension, isa, cash, lisa, home_equity)
-]
+            if monthly:
+                mortgage_balance[year] = max(0, year_end(mortgage_balance[year - 1], -monthly_mortgage_payment,
+                                                         mortgage_growth))
+            else:
+                mortgage_balance[year] = max(
+                    0,
+                    mortgage_balance[year - 1] * (1 + mortgage_rate_real) - annual_mortgage_payment
+                )
+
+            home_equity[year] = property_value[year] - mortgage_balance[year]
+
+        else:
+            property_value[year] = 0
+            mortgage_balance[year] = 0
+            home_equity[year] = 0
+
+    # =========================
+    # Net worth
+    # =========================
+
+    net_worth = ledger["net_worth"]
+    net_worth[:] = pension + isa + cash + lisa + home_equity
+
+    return ledger, purchase_year
 
 # =========================
 # Plot
 # =========================
 
-ages = [start_age + i for i in range(years)]
+def show_plot(ledger, purchase_year, start_age):
+    import matplotlib.pyplot as plt
+
+    ages = [start_age + i for i in range(ledger.years)]
 
-plt.figure(figsize=(10, 6))
-plt.plot(ages, pension, label="Pension")
-plt.plot(ages, isa, label="ISA")
-plt.plot(ages, lisa, label="LISA")
-plt.plot(ages, cash, label="Cash")
-plt.plot(ages, home_equity, label="Home Equity")
-plt.plot(ages, net_worth, label="Total Net Worth", linewidth=3)
+    plt.figure(figsize=(10, 6))
+    plt.plot(ages, ledger["pension"], label="Pension")
+    plt.plot(ages, ledger["isa"], label="ISA")
+    plt.plot(ages, ledger["lisa"], label="LISA")
+    plt.plot(ages, ledger["cash"], label="Cash")
+    plt.plot(ages, ledger["home_equity"], label="Home Equity")
+    plt.plot(ages, ledger["net_worth"], label="Total Net Worth", linewidth=3)
 
-if purchase_year is not None:
-    plt.axvline(
-        start_age + purchase_year,
-        linestyle="--",
-        label="House Purchase"
-    )
+    if purchase_year is not None:
+        plt.axvline(
+            start_age + purchase_year,
+            linestyle="--",
+            label="House Purchase"
+        )
 
-plt.legend()
-plt.title("Real Net Worth Growth")
-plt.grid(True)
-plt.show()
+    plt.legend()
+    plt.title("Real Net Worth Growth")
+    plt.grid(True)
+    plt.show()
 
 # =========================
 # Tax Receipt Interactive
 # =========================
 
-while True:
-    print("\n--- Tax Receipt Viewer ---")
-    try:
-        user_age = int(input(f"Enter age to view receipt ({start_age} to {start_age + years - 1}) or 0 to exit: "))
-        if user_age == 0:
-            break
-        
-        index = user_age - start_age
-        if 0 <= index < len(real_salary):
-            current_gross = real_salary[index]
-            print_tax_receipt(current_gross)
-        else:
-            print("Invalid age range.")
-    except ValueError:
-        print("Please enter a valid number.")
+def receipt_viewer(ledger, start_age):
+    real_salary = ledger["real_salary"]
+    years = ledger.years
+
+    while True:
+        print("\n--- Tax Receipt Viewer ---")
+        try:
+            user_age = int(input(f"Enter age to view receipt ({start_age} to {start_age + years - 1}) or 0 to exit: "))
+            if user_age == 0:
+                break
+            
+            index = user_age - start_age
+            if 0 <= index < len(real_salary):
+                current_gross = real_salary[index]
+                print_tax_receipt(current_gross)
+            else:
+                print("Invalid age range.")
+        except ValueError:
+            print("Please enter a valid number.")
+
+# =========================
+# Headless batch mode
+# =========================
 
-print(net_salary)
\ No newline at end of file
+SUMMARY_FIELDS = (
+    ["scenario", "id", "final_age", "purchase_age"]
+    + [f"final_{name}" for name in COLUMNS]
+    + ["receipt_age", "receipt_gross", "receipt_net", "receipt_tax", "receipt_ni", "receipt_loan"]
+)
+
+def read_scenarios(stream, fmt):
+    """
+    Yield one raw input row at a time (never the whole file at once): a JSONL
+    line as text, a CSV row as a dict. parse_scenario() checks it.
+    """
+    if fmt == "jsonl":
+        for line in stream:
+            if line.strip():
+                yield line
+    else:
+        yield from csv.DictReader(stream)
+
+def parse_scenario(raw):
+    """A raw row as a dict of values; ValueError if it is not a flat object of fields."""
+    row = json.loads(raw) if isinstance(raw, str) else raw
+    if not isinstance(row, dict):
+        raise ValueError(f"expected an object of fields, got {type(row).__name__}")
+    if None in row:
+        # csv.DictReader puts values beyond the header under None
+        raise ValueError(f"{len(row[None])} more values than header columns")
+    return {key: value for key, value in row.items() if value not in ("", None) or key == "id"}
+
+def _number(key, value):
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"{key} must be a number, got {json.dumps(value)}")
+    return float(value)
+
+def summarize(number, row, monthly=False):
+    """Run one raw input row; returns (summary, ledger, start_age). monthly sets monthly_steps unless the row does."""
+    row = parse_scenario(row)
+    scenario_id = row.pop("id", "") or ""
+    params = {key: _number(key, value) for key, value in row.items()}
+    if monthly:
+        params.setdefault("monthly_steps", 1)
+    receipt_age = params.pop("receipt_age", None)
+    if int(params.get("years", DEFAULTS["years"])) < 1:
+        raise ValueError("years must be at least 1")
+
+    ledger, purchase_year = project(params)
+    first_age = int(params.get("start_age", DEFAULTS["start_age"]))
+    receipt_age = first_age if receipt_age is None else int(receipt_age)
+    index = min(max(receipt_age - first_age, 0), ledger.years - 1)
+    receipt = tax_receipt(float(ledger["real_salary"][index]))
+
+    summary = {
+        "scenario": number,
+        "id": scenario_id,
+        "final_age": first_age + ledger.years - 1,
+        "purchase_age": "" if purchase_year is None else first_age + purchase_year,
+    }
+    summary.update({f"final_{name}": float(ledger[name][-1]) for name in COLUMNS})
+    summary.update({
+        "receipt_age": first_age + index,
+        "receipt_gross": receipt["gross"],
+        "receipt_net": receipt["net"],
+        "receipt_tax": receipt["tax"],
+        "receipt_ni": receipt["ni"],
+        "receipt_loan": receipt["loan"],
+    })
+    return summary, ledger, first_age
+
+class RowWriter:
+    """Writes dict rows as CSV (header first) or JSONL."""
+
+    def __init__(self, stream, fmt, fields, flush=False):
+        self.stream = stream
+        self.fmt = fmt
+        self.flush = flush
+        if fmt == "csv":
+            self.writer = csv.DictWriter(stream, fieldnames=fields, lineterminator="\n")
+            self.writer.writeheader()
+
+    def write(self, row):
+        if self.fmt == "csv":
+            self.writer.writerow(row)
+        else:
+            self.stream.write(json.dumps(row) + "\n")
+        if self.flush:
+            self.stream.flush()
+
+def _format_for(path, default):
+    if path and path != "-":
+        return "jsonl" if path.endswith((".jsonl", ".json")) else "csv"
+    return default
+
+def run_batch(args):
+    in_stream = sys.stdin if args.batch == "-" else open(args.batch, newline="", encoding="utf-8")
+    out_stream = sys.stdout if not args.out or args.out == "-" else open(args.out, "w", newline="", encoding="utf-8")
+    ledger_stream = open(args.ledgers, "w", newline="", encoding="utf-8") if args.ledgers else None
+    in_format = args.input_format or _format_for(args.batch, "csv")
+    try:
+        summaries = RowWriter(out_stream, args.format or _format_for(args.out, in_format), SUMMARY_FIELDS,
+                              flush=out_stream is sys.stdout)
+        ledgers = None
+        if ledger_stream is not None:
+            ledgers = RowWriter(ledger_stream, _format_for(args.ledgers, "csv"),
+                                ["scenario", "id", "age"] + COLUMNS)
+
+        count = 0
+        failed = 0
+        for count, row in enumerate(read_scenarios(in_stream, in_format), start=1):
+            try:
+                summary, ledger, first_age = summarize(count, row, args.monthly)
+            except (ValueError, TypeError) as e:
+                # Skip the row and carry on (bad JSON is a ValueError too);
+                # the exit code reports it at the end
+                failed += 1
+                print(f"Scenario {count} skipped: {e}", file=sys.stderr)
+                continue
+            summaries.write(summary)
+            if ledgers is not None:
+                for year in range(ledger.years):
+                    entry = {"scenario": count, "id": summary["id"], "age": first_age + year}
+                    entry.update({name: float(ledger[name][year]) for name in COLUMNS})
+                    ledgers.write(entry)
+        print(f"{count:,} scenarios" + (f", {failed:,} failed" if failed else ""), file=sys.stderr)
+        return 1 if failed else 0
+    finally:
+        for stream in (in_stream, out_stream, ledger_stream):
+            if stream is not None and stream not in (sys.stdin, sys.stdout):
+                stream.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Real net worth projection with tax receipts.")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="run every scenario in a CSV or JSONL file ('-' = stdin), no plot or prompts")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"],
+                        help="format of --batch (default: from its extension, CSV for stdin)")
+    parser.add_argument("--out", metavar="FILE", help="summary rows (default: stdout)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="summary format (default: from --out)")
+    parser.add_argument("--ledgers", metavar="FILE", help="also write every year of every scenario (.csv or .jsonl)")
+    parser.add_argument("--monthly", action="store_true",
+                        help="monthly contributions and mortgage repayments (sets monthly_steps)")
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        return run_batch(args)
+
+    ledger, purchase_year = project({"monthly_steps": 1} if args.monthly else None)
+    show_plot(ledger, purchase_year, start_age)
+    receipt_viewer(ledger, start_age)
+    print(ledger["net_salary"].tolist())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
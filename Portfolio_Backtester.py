@@ -1,10 +1,11 @@
 import customtkinter as ctk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import yfinance as yf
-import pandas as pd
 from datetime import datetime, timedelta
 import threading
+from chart_layer import ChartLayer
+import backtest_kernel
+import startup
+from instrumentation import Tracer
+from price_cache import PriceCache
 
 # Set appearance mode and default color theme
 ctk.set_appearance_mode("System")
@@ -22,10 +23,9 @@ class BacktestApp(ctk.CTk):
         self.grid_columnconfigure(1, weight=1)
         self.grid_rowconfigure(0, weight=1)
 
-        # Left Sidebar for Inputs
-        self.sidebar = ctk.CTkFrame(self, width=300)
+        # Left Sidebar for Inputs (scrolls, as the portfolio inputs make it long)
+        self.sidebar = ctk.CTkScrollableFrame(self, width=300)
         self.sidebar.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
-        self.sidebar.grid_propagate(False)
 
         # Right Frame for Plot
         self.plot_frame = ctk.CTkFrame(self)
@@ -33,12 +33,24 @@ class BacktestApp(ctk.CTk):
         self.plot_frame.grid_rowconfigure(0, weight=1)
         self.plot_frame.grid_columnconfigure(0, weight=1)
         
-        # Data storage
-        self.data_cache = {}
+        # Daily prices from the configured source (see price_providers.py); downloads
+        # are kept on disk between runs and only missing days are fetched
+        self.prices = PriceCache.from_env()
+
+        # Opt-in timing of load / fetch / parse / simulate / draw (see instrumentation.py)
+        self.tracer = Tracer.from_env("backtester")
 
         # Tracking widgets
         self.widgets = {}
 
+        # Index mapping
+        self.indices = {
+            "S&P 500": "^GSPC",
+            "Nasdaq Composite": "^IXIC", 
+            "FTSE 100": "^FTSE",
+            "Global (ACWI ETF)": "ACWI" 
+        }
+
         # Create Inputs
         self.create_inputs()
 
@@ -49,19 +61,63 @@ class BacktestApp(ctk.CTk):
         # Status Label
         self.status_label = ctk.CTkLabel(self.sidebar, text="Ready", text_color="gray")
         self.status_label.pack(pady=5)
+        self.backtest_started = False  # from then on the label shows backtest status only
+
+        # Matplotlib Figure (matplotlib is loaded once the window is on screen)
+        self.chart = None
+        self.pending_plot = None  # backtest that finished before the chart existed
+        startup.after_mapped(self, lambda: startup.load_then(self, startup.CHART_MODULES, self.build_chart))
+
+    def build_chart(self):
+        from matplotlib.figure import Figure
+        from matplotlib.ticker import FuncFormatter
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-        # Matplotlib Figure
-        self.fig, self.ax = plt.subplots(figsize=(8, 6))
+        self.fig = Figure(figsize=(8, 6))
+        self.ax = self.fig.add_subplot()
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_frame)
         self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+        self.chart = ChartLayer(self.ax, self.canvas)
 
-        # Index mapping
-        self.indices = {
-            "S&P 500": "^GSPC",
-            "Nasdaq Composite": "^IXIC", 
-            "FTSE 100": "^FTSE",
-            "Global (ACWI ETF)": "ACWI" 
-        }
+        # Static chart decorations (set once; updates only touch the artists)
+        self.ax.set_xlabel("Date")
+        self.ax.set_ylabel("Value")
+        self.ax.grid(True, alpha=0.3)
+        self.chart.legend()
+
+        # Format y-axis with comma
+        self.ax.get_yaxis().set_major_formatter(
+            FuncFormatter(lambda x, p: format(int(x), ',')))
+
+        # Load every index's prices (and the data libraries) while the user fills in the inputs
+        self.prefetch_prices()
+
+        if self.pending_plot is not None:
+            self.update_plot(*self.pending_plot)
+            self.pending_plot = None
+
+    def prefetch_prices(self, min_years=30):
+        """Bring every index up to date in the background, so switching index needs no download."""
+        years = self.get_val("years")
+        years = max(min_years, int(years)) if isinstance(years, float) else min_years
+
+        end_date = datetime.now().date() + timedelta(days=1)
+        start_date = end_date - timedelta(days=years*365)
+        tickers = list(self.indices.values())
+        self.show_prefetch(0, len(tickers), [])
+        self.prices.prefetch(tickers, start_date, end_date,
+                             progress=lambda *state: self.after(0, lambda: self.show_prefetch(*state)))
+
+    def show_prefetch(self, done, total, failed):
+        if self.backtest_started:
+            return
+        if done < total:
+            text = f"Loading prices {done}/{total}..."
+        elif failed:
+            text = f"Prices ready ({', '.join(failed)} unavailable)"
+        else:
+            text = "Prices ready"
+        self.status_label.configure(text=text, text_color="gray")
 
     def add_section_header(self, text):
         label = ctk.CTkLabel(self.sidebar, text=text, font=("font", 16, "bold"), anchor="w")
@@ -96,14 +152,22 @@ class BacktestApp(ctk.CTk):
     def create_inputs(self):
         self.add_section_header("Strategy Settings")
         
-        self.add_dropdown("Select Index", "index", 
-                          ["S&P 500", "Nasdaq Composite", "FTSE 100", "Global (ACWI ETF)"], 
-                          "S&P 500")
+        self.add_dropdown("Backtest", "mode", ["Single Index", "Portfolio"], "Single Index")
+        self.add_dropdown("Select Index", "index", list(self.indices), "S&P 500")
         
         self.add_input("Years to Backtest", "years", 10)
         self.add_input("Initial Investment (£/$)", "initial_investment", 10000)
         self.add_input("Monthly Contribution (DCA)", "monthly_dca", 500)
 
+        # Portfolio mode: contributions are split by weight across the indices
+        self.add_section_header("Portfolio Weights (%)")
+        default_weights = {"Global (ACWI ETF)": 60, "FTSE 100": 20, "S&P 500": 20}
+        for name in self.indices:
+            self.add_input(name, f"weight:{name}", default_weights.get(name, 0))
+        self.add_dropdown("Rebalance", "rebalance",
+                          ["Never", "Monthly", "Quarterly", "Annually", "Threshold"], "Quarterly")
+        self.add_input("Rebalance Threshold (%)", "threshold", 5)
+
     def get_val(self, key):
         val = self.widgets[key].get()
         # Try converting to float if possible
@@ -112,22 +176,29 @@ class BacktestApp(ctk.CTk):
         except ValueError:
             return val
 
-    def fetch_data(self, ticker, start_date, end_date):
-        # Check cache first
-        cache_key = (ticker, start_date, end_date)
-        if cache_key in self.data_cache:
-            return self.data_cache[cache_key]
-        
-        self.status_label.configure(text=f"Fetching data for {ticker}...")
-        data = yf.download(ticker, start=start_date, end=end_date, progress=False)
-        self.data_cache[cache_key] = data
-        return data
+    def portfolio_weights(self):
+        """{index name: weight} of the indices with a weight above zero."""
+        weights = {name: self.get_val(f"weight:{name}") for name in self.indices}
+        if not all(isinstance(weight, float) and weight >= 0 for weight in weights.values()):
+            raise ValueError("Portfolio weights must be numbers of 0 or more")
+        weights = {name: weight for name, weight in weights.items() if weight > 0}
+        if not weights:
+            raise ValueError("Give at least one index a portfolio weight")
+        return weights
+
+    def fetch_data(self, ticker, start_date, end_date, run):
+        """(dates, prices) for [start_date, end_date) from the price cache."""
+        if self.prices.missing(ticker, start_date, end_date):
+            self.status_label.configure(text=f"Fetching data for {ticker}...")
+        return self.prices.get(ticker, start_date, end_date, run)
 
     def run_backtest_thread(self):
         # Run in separate thread to keep GUI responsive
         threading.Thread(target=self.calculate_and_plot, daemon=True).start()
 
     def calculate_and_plot(self):
+        run = self.tracer.start("backtest")
+        self.backtest_started = True
         try:
             self.status_label.configure(text="Running Backtest...", text_color="blue")
             self.run_button.configure(state="disabled")
@@ -137,89 +208,48 @@ class BacktestApp(ctk.CTk):
             years = int(self.get_val("years"))
             initial_inv = self.get_val("initial_investment")
             monthly_dca = self.get_val("monthly_dca")
+            portfolio = self.get_val("mode") == "Portfolio"
             
-            ticker = self.indices[index_name]
+            weights = self.portfolio_weights() if portfolio else {index_name: 1.0}
             
-            # Calculate dates
-            end_date = datetime.now()
+            # Calculate dates (whole days, up to and including today)
+            end_date = datetime.now().date() + timedelta(days=1)
             start_date = end_date - timedelta(days=years*365)
             
-            # Fetch data
-            df = self.fetch_data(ticker, start_date, end_date)
+            # Fetch data (load / fetch / parse spans come from the price cache)
+            series = [self.fetch_data(self.indices[name], start_date, end_date, run) for name in weights]
             
-            if df.empty:
-                self.status_label.configure(text="Error: No data found", text_color="red")
+            empty = [name for name, (_, prices) in zip(weights, series) if not len(prices)]
+            if empty:
+                detail = f" for {', '.join(empty)}" if portfolio else ""
+                self.status_label.configure(text=f"Error: No data found{detail}", text_color="red")
                 self.run_button.configure(state="normal")
                 return
 
-            # Prepare Backtest
-            # Resample to monthly to easier handle DCA
-            # We use 'Adj Close' for accurate return calculations (dividends etc if available in adj close, otherwise just price)
-            # Note: Index tickers often don't include dividends in Adj Close, but ETFs (ACWI) do. 
-            # For simplicity in this script we assume price return for indices unless we switch to TR indices.
-            
-            # Using daily data for more accuracy on volatility, but adding cash flow monthly
-            
-            # Determine price column (Adj Close preferred, fallback to Close)
-            # Check if using MultiIndex or flat index
-            price_col = 'Adj Close'
-            if isinstance(df.columns, pd.MultiIndex):
-                # Check top level
-                if 'Adj Close' not in df.columns.get_level_values(0):
-                    price_col = 'Close'
-            else:
-                if 'Adj Close' not in df.columns:
-                    price_col = 'Close'
+            if portfolio:
+                rebalance = self.get_val("rebalance").lower()
+                threshold = self.get_val("threshold")
+                if not isinstance(threshold, float) or threshold <= 0:
+                    raise ValueError("Rebalance threshold must be a number above 0")
+                threshold /= 100
+                index_name = self.portfolio_name(weights, rebalance, threshold)
 
-            # Extract the relevant price data
-            if isinstance(df.columns, pd.MultiIndex):
-                df = df.xs(price_col, axis=1, level=0, drop_level=True)
+                # One (days x assets) matrix on the days any of the markets traded
+                with run.span("align"):
+                    dates, prices = backtest_kernel.align(series)
+                with run.span("simulate"):
+                    portfolio_value, total_invested, _ = backtest_kernel.portfolio_backtest(
+                        dates, prices, list(weights.values()), initial_inv, monthly_dca,
+                        rebalance, threshold)
             else:
-                df = df[[price_col]]
-            
-            # Now df should have tickers as columns (e.g., "^GSPC") or be a single column
-            # Since we only requested one ticker, it should be a single column dataframe usually, 
-            # but yfinance sometimes returns it with the ticker name.
-            
-            # Ensure we have just one column called 'Price'
-            if df.shape[1] >= 1:
-                # Take the first column regardless of name
-                df = df.iloc[:, [0]]
-            
-            df.columns = ['Price']
-            df = df.dropna()
-
-            portfolio_value = []
-            total_invested = []
-            
-            current_units = initial_inv / df.iloc[0]['Price']
-            invested = initial_inv
-            
-            # Find the day of month of start date to approximate "monthly" contributions
-            start_day = df.index[0].day
-            last_month = df.index[0].month
-            
-            dates = df.index
-            prices = df['Price'].values
-            
-            # Iterate through days
-            for i, date in enumerate(dates):
-                price = prices[i]
-                
-                # Check if new month has started for DCA
-                if date.month != last_month:
-                    # Buy more units
-                    units_bought = monthly_dca / price
-                    current_units += units_bought
-                    invested += monthly_dca
-                    last_month = date.month
-                
-                portfolio_value.append(current_units * price)
-                total_invested.append(invested)
+                dates, prices = series[0]
+                with run.span("simulate"):
+                    portfolio_value, total_invested = backtest_kernel.dca_backtest(
+                        dates, prices, initial_inv, monthly_dca)
 
             # Plotting (must be on main thread usually, but matplotlib backend might handle it or we use after method)
             # In tkinter, it's safer to schedule the update
-            self.after(0, lambda: self.update_plot(dates, portfolio_value, total_invested, index_name))
+            self.after(0, lambda: self.update_plot(dates, portfolio_value, total_invested, index_name, run))
 
         except Exception as e:
             print(e)
@@ -227,11 +257,32 @@ class BacktestApp(ctk.CTk):
         finally:
              self.after(0, lambda: self.run_button.configure(state="normal"))
 
-    def update_plot(self, dates, portfolio_value, total_invested, index_name):
-        self.ax.clear()
-        
-        self.ax.plot(dates, portfolio_value, label="Portfolio Value", color="#1f77b4", linewidth=2)
-        self.ax.plot(dates, total_invested, label="Total Invested", color="#d62728", linestyle="--", linewidth=1.5)
+    def portfolio_name(self, weights, rebalance, threshold):
+        """Chart title for a portfolio, e.g. '60% ACWI / 40% ^GSPC, rebalanced quarterly'."""
+        total = sum(weights.values())
+        mix = " / ".join(f"{weight / total:.0%} {self.indices[name]}" for name, weight in weights.items())
+        if rebalance == "never":
+            return f"{mix}, never rebalanced"
+        if rebalance == "threshold":
+            return f"{mix}, rebalanced at {threshold:.0%} drift"
+        return f"{mix}, rebalanced {rebalance}"
+
+    def update_plot(self, dates, portfolio_value, total_invested, index_name, run):
+        if self.chart is None:
+            self.pending_plot = (dates, portfolio_value, total_invested, index_name, run)
+            return
+        with run.span("update"):
+            self.update_artists(dates, portfolio_value, total_invested, index_name)
+        with run.span("draw"):
+            self.chart.redraw()
+        timings = run.finish()
+        status = f"Backtest Complete\n{self.prices.status_text()}"
+        self.status_label.configure(text=status + (f"\n{timings}" if timings else ""),
+                                    text_color="green")
+
+    def update_artists(self, dates, portfolio_value, total_invested, index_name):
+        self.chart.line("Portfolio Value", dates, portfolio_value, label="Portfolio Value", color="#1f77b4", linewidth=2)
+        self.chart.line("Total Invested", dates, total_invested, label="Total Invested", color="#d62728", linestyle="--", linewidth=1.5)
         
         final_value = portfolio_value[-1]
         final_invested = total_invested[-1]
@@ -239,19 +290,10 @@ class BacktestApp(ctk.CTk):
         roi = (profit / final_invested) * 100 if final_invested > 0 else 0
         
         title = f"Backtest Results: {index_name}\nFinal Value: {final_value:,.2f} | Returns: {roi:.2f}%"
-        
-        self.ax.set_title(title)
-        self.ax.set_xlabel("Date")
-        self.ax.set_ylabel("Value")
-        self.ax.legend()
-        self.ax.grid(True, alpha=0.3)
-        
-        # Format y-axis with comma
-        self.ax.get_yaxis().set_major_formatter(
-            plt.FuncFormatter(lambda x, p: format(int(x), ',')))
+        self.chart.text("title", self.ax.title, title)
 
-        self.canvas.draw()
-        self.status_label.configure(text="Backtest Complete", text_color="green")
+        # Only rescales (and fully redraws) when the data leaves the current view
+        self.chart.rescale()
 
 if __name__ == "__main__":
     app = BacktestApp()
@@ -1,12 +1,24 @@
 import customtkinter as ctk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import math
+import projection_engine
+import monte_carlo
+import ledger
+import startup
+import uk_tax
+from recompute import RecomputeScheduler
+from result_cache import ResultCache, canonical_key
+from chart_layer import ChartLayer, HoverCursor
+from instrumentation import Tracer
 
 # Set appearance mode and default color theme
 ctk.set_appearance_mode("System")  # Modes: "System" (standard), "Dark", "Light"
 ctk.set_default_color_theme("blue")  # Themes: "blue" (standard), "green", "dark-blue"
 
+def format_money(val):
+    if val >= 1_000_000:
+        return f"£{val/1_000_000:.2f}M"
+    return f"£{val/1_000:.0f}k"
+
 class PortfolioApp(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -32,6 +44,18 @@ class PortfolioApp(ctk.CTk):
         # Storage for input widgets
         self.widgets = {}
 
+        # Re-simulates only the years a changed input can affect
+        self.projector = projection_engine.IncrementalProjector()
+
+        # Opt-in timing of simulate / update / draw (see instrumentation.py)
+        self.tracer = Tracer.from_env("projector")
+
+        # Recent results, so flipping between configurations does not re-run them
+        self.cache = ResultCache(max_entries=32, max_bytes=256 * 2**20)
+
+        # Runs simulations off the Tk thread, keeping only the newest request
+        self.scheduler = RecomputeScheduler(self, self.compute, self.show_result, self.show_error)
+
         # Create Input Fields
         self.create_inputs()
 
@@ -39,17 +63,38 @@ class PortfolioApp(ctk.CTk):
         self.calc_button = ctk.CTkButton(self.sidebar, text="Update Plot", command=self.calculate_and_plot, height=40, font=("font", 14, "bold"))
         self.calc_button.pack(pady=20, fill="x", padx=10)
 
-        # Matplotlib Figure
-        self.fig, self.ax = plt.subplots(figsize=(8, 6))
+        # Status Label
+        self.status_label = ctk.CTkLabel(self.sidebar, text="Ready", text_color="gray")
+        self.status_label.pack(pady=5)
+
+        # Matplotlib Figure (matplotlib is loaded once the window is on screen)
+        self.chart = None
+        self.chart_mode = None
+        self.pending_output = None  # result that arrived before the chart existed
+        startup.after_mapped(self, lambda: startup.load_then(self, startup.CHART_MODULES, self.build_chart))
+
+        # Initial Calculation (served from the on-disk snapshot when it is current)
+        self.load_snapshot()
+        self.calculate_and_plot()
+
+    def build_chart(self):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.fig = Figure(figsize=(8, 6))
+        self.ax = self.fig.add_subplot()
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_frame)
         self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+        self.chart = ChartLayer(self.ax, self.canvas)
+        self.cursor = HoverCursor(self.chart)
 
-        # Initial Calculation
-        self.calculate_and_plot()
-        
         # Connect Hover Event
         self.canvas.mpl_connect("motion_notify_event", self.on_hover)
 
+        if self.pending_output is not None:
+            self.show_result(self.pending_output)
+            self.pending_output = None
+
     def add_section_header(self, text):
         label = ctk.CTkLabel(self.sidebar, text=text, font=("font", 16, "bold"), anchor="w")
         label.pack(pady=(20, 5), padx=5, fill="x")
@@ -94,6 +139,14 @@ class PortfolioApp(ctk.CTk):
         
         self.widgets[var_name] = slider
 
+    def add_switch(self, label_text, var_name, default_value=False):
+        switch = ctk.CTkSwitch(self.sidebar, text=label_text, command=self.calculate_and_plot)
+        switch.pack(pady=5, fill="x", padx=5)
+        if default_value:
+            switch.select()
+
+        self.widgets[var_name] = switch
+
     def create_inputs(self):
         # Core Assumptions
         self.add_section_header("Core Assumptions")
@@ -102,6 +155,7 @@ class PortfolioApp(ctk.CTk):
         self.add_slider("Start Age", "start_age", 22, 18, 60, 1, format_str="{:.0f}")
         self.add_slider("Salary Growth Rate", "growth_rate", 0.06, 0.0, 0.20)
         self.add_slider("Inflation Rate", "inflation", 0.03, 0.0, 0.20)
+        self.add_switch("Monthly Steps", "monthly")
 
         # Retirement Goals
         self.add_section_header("Retirement Goals")
@@ -138,475 +192,198 @@ class PortfolioApp(ctk.CTk):
         self.add_slider("Mortgage Rate", "mortgage_rate", 0.045, 0.0, 0.20)
         self.add_input("Mortgage Term (Years)", "mortgage_term", 30)
 
+        # Stochastic Mode
+        self.add_section_header("Monte Carlo")
+        self.add_switch("Random Returns & Inflation", "monte_carlo")
+        self.add_input("Simulated Paths", "mc_paths", 10000)
+
     def get_val(self, key):
         try:
             return float(self.widgets[key].get())
         except ValueError:
             return 0.0
 
-    def net_pay(self, gross, pension_rate=0.05):
-        personal_allowance = 12570
-        basic_limit = 50270
-        NI_lower = 12570
-        NI_upper = 50270
-
-        basic_rate = 0.20
-        NI_main_rate = 0.08
-        NI_upper_rate = 0.02
-
-        loan_threshold = 28470
-        loan_rate = 0.09
-
-        pension_contrib = pension_rate * gross
-        taxable = max(0, gross - pension_contrib)
-
-        # Income tax
-        if taxable <= personal_allowance:
-            tax = 0
-        else:
-            # Handle Higher Rate bands explicitly?
-            # Basic rate logic here was: min(taxable-PA, basic_limit-PA). 
-            # If taxable > basic_limit, this capped at basic band tax.
-            # Missing Higher Rate Tax logic!
-            # Let's add simple HRT logic:
-            
-            # Taxable income above Personal Allowance
-            taxable_income = taxable - personal_allowance
-            
-            # Basic Band: £37,700 width (50270 - 12570)
-            basic_band_width = basic_limit - personal_allowance
-            
-            if taxable_income <= basic_band_width:
-                 tax = taxable_income * basic_rate
-            else:
-                 # Higher Rate
-                 # Assuming logic is strictly BRT and HRT (40%) and ART (45%)
-                 # For simplicity in this fix, let's just add the 40% band
-                 # Everything above basic_limit is 40% (ignoring 100k taper and 125k limit for now to keep it simpler)
-                 tax = (basic_band_width * basic_rate) + (taxable_income - basic_band_width) * 0.40
-
-        # NI
-        # NI is technically on Gross usually, but if Salary Sacrifice, it's on the reduced amount.
-        # This function treats pension_contrib as Salary Sacrifice (reducing taxable and NI-able pay).
-        
-        if taxable <= NI_lower:
-            ni = 0
-        elif taxable <= NI_upper:
-            ni = (taxable - NI_lower) * NI_main_rate
-        else:
-            ni = (NI_upper - NI_lower) * NI_main_rate + (taxable - NI_upper) * NI_upper_rate
-
-        # Student loan
-        loan = max(0, (taxable - loan_threshold) * loan_rate)
-
-        net = gross - pension_contrib - tax - ni - loan
-        return net
+    def collect_inputs(self):
+        params = {key: self.get_val(key) for key in projection_engine.PARAM_DEFAULTS}
+        mc_paths = max(int(self.get_val("mc_paths")), 1) if self.widgets["monte_carlo"].get() else 0
+        monthly = bool(self.widgets["monthly"].get())
+        return params, mc_paths, monthly
 
     def calculate_and_plot(self):
-        # Retrieve values
-        base_salary = self.get_val("base_salary")
-        years = int(self.get_val("years"))
-        start_age = int(self.get_val("start_age"))
-
-        growth_rate = self.get_val("growth_rate")
-        inflation = self.get_val("inflation")
-
-        pension_base = self.get_val("pension_base")
-        isa_base = self.get_val("isa_base")
-        cash_base = self.get_val("cash_base")
-        lisa_base = self.get_val("lisa_base")
-
-        pension_rate = self.get_val("pension_rate")
-        isa_rate = self.get_val("isa_rate")
-        cash_rate = self.get_val("cash_rate")
-        lisa_rate = self.get_val("lisa_rate")
-
-        pension_employee_rate = self.get_val("pension_employee_rate")
-        pension_employer_rate = self.get_val("pension_employer_rate")
-        isa_contribution_rate = self.get_val("isa_contribution_rate")
-        lisa_max_contribution = self.get_val("lisa_max_contribution")
-        lisa_bonus_rate = self.get_val("lisa_bonus_rate")
-
-        property_price_start = self.get_val("property_price_start")
-        deposit_rate = self.get_val("deposit_rate")
-        house_price_growth = self.get_val("house_price_growth")
-        mortgage_rate = self.get_val("mortgage_rate")
-        mortgage_term = self.get_val("mortgage_term")
-
-        mortgage_rate_real = (1 + mortgage_rate) / (1 + inflation) - 1
-
-        # Tracking lists (year 0)
-        nominal_salary = [base_salary]
-        real_salary = [base_salary]
-        
-        # Initial Net Pay using ONLY user's contribution
-        net_salary = [self.net_pay(base_salary, pension_employee_rate)]
-
-        pension = [pension_base]
-        isa = [isa_base]
-        cash = [cash_base]
-        lisa = [lisa_base]
-
-        property_value = [0]
-        mortgage_balance = [0]
-        home_equity = [0]
-
-        house_bought = False
-        annual_mortgage_payment = None
-        purchase_year = None
-
-        # Simulation loop
-        # Retirement Parameters
-        retire_age = int(self.get_val("retire_age"))
-        retire_income = self.get_val("retire_income")
-        
-        state_pension_age = 67
-        state_pension_amount = 12000
-        pension_access_age = 57
-        lisa_access_age = 60
-
-        # Simulation loop
-        for year in range(1, years):
-            current_age = start_age + year
-            is_retired = current_age >= retire_age
-            
-            # --- Returns & Growth (Before Cashflows) ---
-            # Calculate growth on previous balances
-            pen_growth = pension[-1] * (1 + pension_rate - inflation)
-            isa_growth = isa[-1] * (1 + isa_rate - inflation)
-            cash_growth = cash[-1] * (1 + cash_rate - inflation)
-            lisa_growth = lisa[-1] * (1 + lisa_rate - inflation)
-            
-            # --- Cashflows ---
-            
-            # Salary
-            if not is_retired:
-                nominal_salary.append(nominal_salary[-1] * (1 + growth_rate))
-                real_salary.append(real_salary[-1] * (1 + growth_rate - inflation))
-                
-                # Deduct ONLY employee contribution for Net Pay calc
-                current_net_pay = self.net_pay(real_salary[-1], pension_employee_rate)
-                net_salary.append(current_net_pay)
-                
-                # Pension Pot Contribution = Employee + Employer
-                total_pension_rate = pension_employee_rate + pension_employer_rate
-                pen_contrib = total_pension_rate * real_salary[-1]
-                
-                isa_contrib = isa_contribution_rate * current_net_pay
-                
-                # LISA
-                if not house_bought:
-                    lisa_contrib = min(lisa_max_contribution, 0.2 * current_net_pay)
-                    lisa_bonus = lisa_contrib * lisa_bonus_rate
-                else:
-                    lisa_contrib = 0
-                    lisa_bonus = 0
+        # Inputs are read here (Tk thread); the simulation runs on the worker
+        self.scheduler.submit(*self.collect_inputs())
+
+    def compute(self, params, mc_paths, monthly):
+        # Worker thread: no Tk access in here. Configurations seen recently
+        # (e.g. flipping retire_age back) come straight from the cache.
+        run = self.tracer.start("monte_carlo" if mc_paths else "projection")
+        key = canonical_key(params, mc_paths=mc_paths, monthly=monthly)
+        run.note(cache="hit" if key in self.cache else "miss")
+        with run.span("simulate"):
+            output = self.cache.get_or_compute(key, lambda: self.run_model(params, mc_paths, monthly))
+        self.save_snapshot(key, output)
+        return output, run
+
+    def load_snapshot(self):
+        # Result for the inputs the app starts with, saved by an earlier run of the
+        # same code; seeding the cache with it makes the first chart free
+        params, mc_paths, monthly = self.collect_inputs()
+        self.snapshot_key = canonical_key(params, mc_paths=mc_paths, monthly=monthly)
+        self.snapshot_id = f"{self.snapshot_key}-{startup.source_hash(projection_engine, uk_tax, ledger)}"
+        result = startup.load_snapshot("portfolio_gui", self.snapshot_id, ledger.Ledger.load)
+        self.snapshot_saved = result is not None
+        if result is not None:
+            self.cache.put(self.snapshot_key, ("projection", result, None))
+
+    def save_snapshot(self, key, output):
+        # Worker thread: keep the first result for the starting inputs for next time
+        kind, result, _ = output
+        if key == self.snapshot_key and kind == "projection" and not self.snapshot_saved:
+            self.snapshot_saved = True
+            startup.save_snapshot("portfolio_gui", self.snapshot_id, result.save)
+
+    def run_model(self, params, mc_paths, monthly):
+        if mc_paths:
+            return "monte_carlo", monte_carlo.run(params, paths=mc_paths), mc_paths
+        if monthly:
+            # Monthly steps, aggregated to the same annual series
+            return "projection", projection_engine.simulate_monthly(params), None
+        return "projection", self.projector.run(params), None
+
+    def show_result(self, computed):
+        output, run = computed
+        kind, result, mc_paths = output
+        if self.chart is None:
+            self.pending_output = computed  # drawn by build_chart
+            return
+        with run.span("update"):
+            if kind == "monte_carlo":
+                self.plot_monte_carlo(result, mc_paths)
             else:
-                # Retired: No Salary, No Contributions
-                nominal_salary.append(0)
-                real_salary.append(0)
-                net_salary.append(0)
-                
-                pen_contrib = 0
-                isa_contrib = 0
-                lisa_contrib = 0
-                lisa_bonus = 0
-            
-            # --- Drawdown Logic (If Retired) ---
-            pen_withdraw = 0
-            isa_withdraw = 0
-            cash_withdraw = 0
-            lisa_withdraw = 0
-            
-            if is_retired:
-                required = retire_income
-                
-                # Apply State Pension
-                if current_age >= state_pension_age:
-                    required = max(0, required - state_pension_amount)
-                
-                remaining_need = required
-                
-                # Strategy:
-                # 1. Use ISA/Cash if < 57 (Mandatory)
-                # 2. Use Pension if >= 57 (Preserves ISA)
-                # 3. Use LISA if >= 60 (Preserves ISA)
-                # 4. Fallback to ISA/Cash if Pension/LISA empty
-                
-                # Step A: Locked Pension Phase (< 57)
-                if current_age < pension_access_age:
-                    # Must use ISA/Cash
-                    can_take_isa = isa_growth
-                    take_isa = min(remaining_need, can_take_isa)
-                    isa_withdraw += take_isa
-                    remaining_need -= take_isa
-                    
-                    if remaining_need > 0:
-                        can_take_cash = cash_growth
-                        take_cash = min(remaining_need, can_take_cash)
-                        cash_withdraw += take_cash
-                        remaining_need -= take_cash
-                        
-                else:
-                    # Accessible Pension Phase
-                    # Prefer Pension/LISA to drain them? Or preserve ISA?
-                    # Generally drawing pension is standard.
-                    
-                    # 1. Try Pension
-                    can_take_pen = pen_growth
-                    take_pen = min(remaining_need, can_take_pen)
-                    pen_withdraw += take_pen
-                    remaining_need -= take_pen
-                    
-                    # 2. Try LISA (if accessible)
-                    if remaining_need > 0 and current_age >= lisa_access_age:
-                        can_take_lisa = lisa_growth
-                        take_lisa = min(remaining_need, can_take_lisa)
-                        lisa_withdraw += take_lisa
-                        remaining_need -= take_lisa
-                        
-                    # 3. Fallback to ISA
-                    if remaining_need > 0:
-                        can_take_isa = isa_growth
-                        take_isa = min(remaining_need, can_take_isa)
-                        isa_withdraw += take_isa
-                        remaining_need -= take_isa
-                        
-                    # 4. Fallback to Cash
-                    if remaining_need > 0:
-                        can_take_cash = cash_growth
-                        take_cash = min(remaining_need, can_take_cash)
-                        cash_withdraw += take_cash
-                        remaining_need -= take_cash
-                        
-                    # Note: Home Equity is intentionally NOT accessed for income. 
-                    # If remaining_need > 0 here, it represents a shortfall (running out of money).
-
-            # --- Apply Changes ---
-            pension.append( max(0, pen_growth + pen_contrib - pen_withdraw) )
-            isa.append( max(0, isa_growth + isa_contrib - isa_withdraw) )
-            cash.append( max(0, cash_growth - cash_withdraw) ) # Cash doesn't usually get contribs in this model aside from initial? Check
-            
-            # LISA Update
-            new_lisa = lisa_growth + lisa_contrib + lisa_bonus - lisa_withdraw
-            lisa.append( max(0, new_lisa) )
+                self.plot_projection(result)
+        with run.span("draw"):
+            # Redraw canvas (blits unless the limits or legend changed)
+            self.chart.redraw()
+        timings = run.finish()
+        status = f"{self.scheduler.status_text()}\n{self.cache.status_text()}"
+        self.status_label.configure(text=status + (f"\n{timings}" if timings else ""), text_color="gray")
+
+    def show_error(self, error):
+        self.status_label.configure(text=f"Error: {error}", text_color="red")
+
+    def plot_projection(self, result):
+        # Column views into the result ledger (nothing is copied)
+        columns = result.scenario(0)
+        pension = columns["pension"]
+        isa = columns["isa"]
+        cash = columns["cash"]
+        lisa = columns["lisa"]
+        home_equity = columns["home_equity"]
+        net_worth = columns["net_worth"]
+
+        start_age = int(result["ages"][0, 0])
+        years = len(net_worth)
+
+        purchase_year = result["purchase_year"][0]
+        if purchase_year < 0:
+            purchase_year = None
+
+        # Plotting (artists persist between runs and are updated in place)
+        self.start_chart("projection")
+        ages = [start_age + i for i in range(years)]
+
+        series = [
+            ("Pension", pension, {}),
+            ("ISA", isa, {}),
+            ("LISA", lisa, {}),
+            ("Cash", cash, {}),
+            ("Home Equity", home_equity, {}),
+            ("Total Net Worth", net_worth, {"linewidth": 3, "color": "black"}),
+        ]
+        for label, values, style in series:
+            line = self.chart.line(label, ages, values, label=label, **style)
+            # Annotate last point
+            self.chart.end_label(f"{label} (last)", ages[-1], values[-1],
+                                 format_money(values[-1]), line.get_color())
+
+        self.chart.vline(
+            "House Purchase",
+            start_age + purchase_year if purchase_year is not None else None,
+            linestyle="--",
+            color="gray",
+            label="House Purchase"
+        )
+
+        # --- Interactive Features ---
+        # Hover tooltips are precomputed once per result
+        self.sim_data = {
+            "Total": net_worth,
+            "Pension": pension,
+            "ISA": isa,
+            "LISA": lisa,
+            "Cash": cash,
+            "Equity": home_equity
+        }
+        self.sim_ages = ages
+        self.cursor.set_table(ages, self.sim_data, format_money)
 
+        self.chart.rescale()
 
-            # ---------- PROPERTY ----------
-            current_house_price = property_price_start * (
-                (1 + house_price_growth - inflation) ** year
-            )
-            deposit_required = current_house_price * deposit_rate
+    def plot_monte_carlo(self, mc, paths):
+        ages = list(mc["ages"])
+        p5, p25, p50, p75, p95 = mc["net_worth"]
 
-            if not house_bought and lisa[-1] >= deposit_required:
-                house_bought = True
-                purchase_year = year
+        # Plotting
+        self.start_chart("monte_carlo")
 
-                property_value.append(current_house_price)
+        self.chart.band("P5 - P95", ages, p5, p95, color="tab:blue", alpha=0.15, label="P5 - P95")
+        self.chart.band("P25 - P75", ages, p25, p75, color="tab:blue", alpha=0.35, label="P25 - P75")
+        self.chart.line("Median", ages, p50, label="Median Net Worth", linewidth=3, color="black")
 
-                initial_mortgage = current_house_price - deposit_required
-                mortgage_balance.append(initial_mortgage)
+        self.chart.text(
+            "title", self.ax.title,
+            f"Real Net Worth ({paths:,} paths) | "
+            f"Chance of running out in retirement: {mc['ruin_probability']:.1%}"
+        )
 
-                home_equity.append(deposit_required)
+        # Save data for hover
+        self.sim_data = {
+            "P95": p95,
+            "P75": p75,
+            "Median": p50,
+            "P25": p25,
+            "P5": p5
+        }
+        self.sim_ages = ages
+        self.cursor.set_table(ages, self.sim_data, format_money)
 
-                lisa[-1] -= deposit_required
-                annual_mortgage_payment = initial_mortgage / mortgage_term
+        self.chart.rescale()
 
-            elif house_bought:
-                property_value.append(
-                    property_value[-1] * (1 + house_price_growth - inflation)
-                )
+    def start_chart(self, mode):
+        # Static decorations are set up once per chart type, not on every run
+        if self.chart_mode == mode:
+            return
+        self.chart_mode = mode
+        self.chart.reset()
 
-                mortgage_balance.append(
-                    max(
-                        0,
-                        mortgage_balance[-1] * (1 + mortgage_rate_real) - annual_mortgage_payment
-                    )
-                )
+        from matplotlib.ticker import AutoMinorLocator, FuncFormatter
 
-                home_equity.append(
-                    property_value[-1] - mortgage_balance[-1]
-                )
+        self.ax.yaxis.set_major_formatter(FuncFormatter(lambda x, p: f'£{x/1000:,.0f}k'))
 
-            else:
-                property_value.append(0)
-                mortgage_balance.append(0)
-                home_equity.append(0)
-
-        # Net worth calculation
-        net_worth = [
-            p + i + c + l + e
-            for p, i, c, l, e in zip(pension, isa, cash, lisa, home_equity)
-        ]
+        if mode == "projection":
+            # Minor ticks and grid
+            self.ax.xaxis.set_minor_locator(AutoMinorLocator())
+            self.ax.yaxis.set_minor_locator(AutoMinorLocator())
+            self.ax.grid(True, which='both', linestyle='--', linewidth=0.5, alpha=0.7)
+            self.ax.set_title("Real Net Worth Growth")
 
-        # Plotting
-        self.ax.clear()
-        ages = [start_age + i for i in range(years)]
-        
-        self.ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'£{x/1000:,.0f}k'))
-        
-        lines = []
-        lines.append(self.ax.plot(ages, pension, label="Pension")[0])
-        lines.append(self.ax.plot(ages, isa, label="ISA")[0])
-        lines.append(self.ax.plot(ages, lisa, label="LISA")[0])
-        lines.append(self.ax.plot(ages, cash, label="Cash")[0])
-        lines.append(self.ax.plot(ages, home_equity, label="Home Equity")[0])
-        lines.append(self.ax.plot(ages, net_worth, label="Total Net Worth", linewidth=3, color="black")[0])
-        
-        if purchase_year is not None:
-            self.ax.axvline(
-                start_age + purchase_year,
-                linestyle="--",
-                color="gray",
-                label="House Purchase"
-            )
-
-        # Minor ticks and grid
-        from matplotlib.ticker import AutoMinorLocator
-        self.ax.xaxis.set_minor_locator(AutoMinorLocator())
-        self.ax.yaxis.set_minor_locator(AutoMinorLocator())
-        self.ax.grid(True, which='both', linestyle='--', linewidth=0.5, alpha=0.7)
         self.ax.grid(True, which='major', linestyle='-', linewidth=0.8, alpha=1.0)
-
-        # Annotate last points
-        for line in lines:
-            y_data = line.get_ydata()
-            x_data = line.get_xdata()
-            if len(y_data) > 0:
-                last_val = y_data[-1]
-                last_age = x_data[-1]
-                
-                # Format value
-                if last_val >= 1_000_000:
-                    val_str = f"£{last_val/1_000_000:.2f}M"
-                else:
-                    val_str = f"£{last_val/1_000:.0f}k"
-                
-                # Marker
-                self.ax.plot(last_age, last_val, marker='o', color=line.get_color(), markersize=5)
-                
-                # Text annotation
-                self.ax.annotate(
-                    f"{val_str}",
-                    xy=(last_age, last_val),
-                    xytext=(5, 5),
-                    textcoords="offset points",
-                    fontsize=9,
-                    color=line.get_color(),
-                    fontweight='bold'
-                )
-
-        self.ax.set_title("Real Net Worth Growth")
         self.ax.set_xlabel("Age")
         self.ax.set_ylabel("Value")
-        self.ax.legend(loc='upper left')
-        
-        # Redraw canvas
-        self.canvas.draw()
-        
-        # --- Interactive Features ---
-        # Save data for hover
-        self.sim_data = {
-            "Pension": pension,
-            "ISA": isa,
-            "LISA": lisa,
-            "Cash": cash,
-            "Equity": home_equity,
-            "Total": net_worth
-        }
-        self.sim_ages = ages
-        self.sim_start_age = start_age
-        
-        # Create Cursor Artists (hidden by default)
-        self.cursor_line = self.ax.axvline(x=start_age, visible=False, color='gray', linestyle=':', alpha=0.8)
-        
-        # Create a text box for the tooltip
-        # We use a fixed axis-aligned box (top-left or wherever) or a floating one. 
-        # Floating is better for "analysing curves".
-        self.cursor_text = self.ax.text(
-            1.02, 1.0, "", 
-            transform=self.ax.transAxes, 
-            verticalalignment='top',
-            horizontalalignment='left',
-            fontdict={'size': 9},
-            bbox=dict(boxstyle="round", facecolor="white", alpha=0.9, edgecolor="gray")
-        )
-        self.cursor_text.set_visible(False)
+        self.chart.legend(loc='upper left')
 
     def on_hover(self, event):
-        # Check if mouse is on the plot area
-        if event.inaxes != self.ax:
-            if hasattr(self, 'cursor_line') and self.cursor_line.get_visible():
-                self.cursor_line.set_visible(False)
-                self.cursor_text.set_visible(False)
-                self.canvas.draw_idle()
-            return
-
-        # Get nearest age index
-        # xdata is the age (float). 
-        # We want to snap to the nearest integer year in our data
-        try:
-            hover_age = int(round(event.xdata))
-            
-            # Find index
-            start_age = self.sim_start_age
-            idx = hover_age - start_age
-            
-            # Bounds check
-            if idx < 0 or idx >= len(self.sim_ages):
-                return
-                
-            # Update Cursor Line
-            self.cursor_line.set_xdata([hover_age])
-            self.cursor_line.set_visible(True)
-            
-            # Build Text
-            info = f"Age: {hover_age}\n"
-            info += "-" * 15 + "\n"
-            
-            # Sort keys to be consistent or by value? 
-            # Consistent order is usually better to read as you scroll.
-            # Order: Total, Pension, ISA, LISA, Cash, Equity
-            keys = ["Total", "Pension", "ISA", "LISA", "Cash", "Equity"]
-            
-            for key in keys:
-                if key in self.sim_data:
-                    val = self.sim_data[key][idx]
-                    # Format
-                    if val > 1_000_000:
-                        v_str = f"£{val/1_000_000:.2f}M"
-                    else:
-                        v_str = f"£{val/1_000:.0f}k"
-                    
-                    info += f"{key}: {v_str}\n"
-
-            self.cursor_text.set_text(info)
-            # Move text box to follow cursor but stay within bounds?
-            # Or just keep it fixed in a better spot?
-            # User asked to "move the box... not same pos as legend". 
-            # Moving to outside the plot (right side) is safest if space permits.
-            # Or fixed Top-Right.
-            # Let's try putting it OUTSIDE the plot to the right. 
-            # The canvas might clip it. 
-            # Safest is floating near cursor.
-            
-            # Let's Implement Floating Tooltip
-            # transforming data coords to axes coords
-            # x, y = event.xdata, event.ydata
-            # We want to place it slightly offset.
-            
-            # However, simpler request: "move the box". 
-            # I will move it to Top Left (offset) or Right.
-            
-            # Let's stick to Fixed Top Right inside axes.
-            pass
-            
-            self.cursor_text.set_visible(True)
-            
-            self.canvas.draw_idle()
-            
-        except Exception:
-            pass
+        self.cursor.on_move(event)
 
 if __name__ == "__main__":
     app = PortfolioApp()
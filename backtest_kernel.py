@@ -0,0 +1,205 @@
+"""
+Dollar-cost-averaging backtest, separated from the Tk app so it can be timed
+and checked headless.
+
+The price series must already be clean (one float price per trading day, no
+gaps); price_cache.py stores prices that way.
+
+dca_backtest works on whole arrays: the buy days are found in one pass over
+the dates, and units held / capital invested are running sums. dca_backtest_loop
+is the original day-by-day loop, kept as the reference it is checked against.
+
+portfolio_backtest does the same for a weighted basket of assets held as one
+(days x assets) price matrix (see align), with optional rebalancing.
+"""
+
+import numpy as np
+
+
+def month_of(dates):
+    """Calendar month (1-12) of every date, as an int array."""
+    month = getattr(dates, "month", None)  # DatetimeIndex
+    if month is not None:
+        return np.asarray(month)
+    return np.asarray(dates, dtype="datetime64[M]").astype(np.int64) % 12 + 1
+
+
+def new_period(dates, months=1):
+    """True on the first trading day of every calendar period (of `months` months) after the first one."""
+    period = np.asarray(dates, dtype="datetime64[M]").astype(np.int64) // months
+    starts = np.zeros(len(period), dtype=bool)
+    starts[1:] = period[1:] != period[:-1]
+    return starts
+
+
+def buy_days(dates):
+    """True on the first trading day of every month after the first one."""
+    month = month_of(dates)
+    buys = np.zeros(len(month), dtype=bool)
+    buys[1:] = month[1:] != month[:-1]
+    return buys
+
+
+def dca_backtest(dates, prices, initial_investment, monthly_dca):
+    """
+    Buy initial_investment of units on the first day, then monthly_dca on the
+    first trading day of every new month.
+
+    dates  - trading days (DatetimeIndex or datetime64 array)
+    prices - price per day, same length as dates
+
+    Returns (portfolio_value, total_invested) as float arrays, one value per day.
+    Several tickers or settings can be run at once: prices of shape (..., days)
+    and amounts of shape (..., 1) broadcast, with days always the last axis.
+    """
+    prices = np.asarray(prices, dtype=float)
+    initial_investment = np.asarray(initial_investment, dtype=float)
+    buys = buy_days(dates)
+
+    # Units bought each day, with the opening purchase on day 0; the running
+    # sum adds them in the same order as the day-by-day loop
+    units = np.where(buys, monthly_dca / prices, 0.0)
+    units, first = np.broadcast_arrays(units, initial_investment / prices[..., :1])
+    units = units.copy()
+    units[..., 0] = first[..., 0]
+    np.cumsum(units, axis=-1, out=units)
+
+    invested = np.where(buys, np.asarray(monthly_dca, dtype=float), 0.0)
+    invested, first = np.broadcast_arrays(invested, initial_investment)
+    invested = invested.copy()
+    invested[..., 0] = first[..., 0]
+    np.cumsum(invested, axis=-1, out=invested)
+
+    return units * prices, invested
+
+
+def dca_backtest_loop(dates, prices, initial_investment, monthly_dca):
+    """Reference day-by-day version of dca_backtest (returns lists)."""
+    portfolio_value = []
+    total_invested = []
+
+    current_units = initial_investment / prices[0]
+    invested = initial_investment
+
+    last_month = dates[0].month
+
+    # Iterate through days
+    for i, date in enumerate(dates):
+        price = prices[i]
+
+        # Check if new month has started for DCA
+        if date.month != last_month:
+            # Buy more units
+            units_bought = monthly_dca / price
+            current_units += units_bought
+            invested += monthly_dca
+            last_month = date.month
+
+        portfolio_value.append(current_units * price)
+        total_invested.append(invested)
+
+    return portfolio_value, total_invested
+
+
+# =========================
+# Portfolios
+# =========================
+
+REBALANCE = ("never", "monthly", "quarterly", "annually", "threshold")
+
+_REBALANCE_MONTHS = {"monthly": 1, "quarterly": 3, "annually": 12}
+
+
+def align(series):
+    """
+    Put several (dates, prices) series on common days: every day any of them
+    traded, from the first day all of them have a price. A market that was
+    closed keeps its last price. Returns (dates, prices of shape (days, assets)).
+    """
+    series = [(np.asarray(d, dtype="datetime64[D]"), np.asarray(p, dtype=float)) for d, p in series]
+    if not series or any(not len(d) for d, _ in series):
+        raise ValueError("every asset needs at least one price")
+
+    dates = np.unique(np.concatenate([d for d, _ in series]))
+    dates = dates[dates >= max(d[0] for d, _ in series)]
+    prices = np.column_stack([p[np.searchsorted(d, dates, side="right") - 1] for d, p in series])
+    return dates, prices
+
+
+def portfolio_backtest(dates, prices, weights, initial_investment, monthly_dca,
+                       rebalance="never", threshold=0.05):
+    """
+    DCA into a weighted basket: the initial investment and every monthly
+    contribution are split across the assets by weight.
+
+    dates     - trading days
+    prices    - (days, assets) price matrix, e.g. from align()
+    weights   - target weight per asset (scaled to add up to 1)
+    rebalance - never, or back to the target weights after the contribution on
+                the first trading day of each month / quarter / year, or on any
+                day an asset's weight is more than `threshold` from its target
+
+    Returns (portfolio_value, total_invested, asset_values of shape (days, assets)).
+    """
+    prices = np.asarray(prices, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    weights = weights / weights.sum()
+    if rebalance not in REBALANCE:
+        raise ValueError(f"unknown rebalance {rebalance!r} (expected one of {', '.join(REBALANCE)})")
+
+    cash = np.where(buy_days(dates), float(monthly_dca), 0.0)
+    cash[0] = initial_investment
+    invested = np.cumsum(cash)
+    bought = np.cumsum(cash[:, None] * weights / prices, axis=0)  # units bought up to each day
+
+    # Holdings are rebalanced at `starts` (day 0 included) to `units`; in
+    # between they only grow by the contributions
+    if rebalance == "threshold":
+        starts, units = _threshold_rebalances(prices, weights, bought, threshold)
+    else:
+        months = _REBALANCE_MONTHS.get(rebalance)
+        starts = np.flatnonzero(new_period(dates, months)) if months else np.empty(0, dtype=int)
+        starts = np.concatenate([[0], starts])
+        units = _calendar_rebalances(prices, weights, bought, starts)
+
+    segment = np.searchsorted(starts, np.arange(len(prices)), side="right") - 1
+    held = units[segment] + bought - bought[starts][segment]
+    values = held * prices
+    return values.sum(axis=1), invested, values
+
+
+def _calendar_rebalances(prices, weights, bought, starts):
+    # Value at each rebalance, V_k = g_k * V_(k-1) + c_k: g_k is the growth of
+    # the target mix over the period and c_k what its contributions are worth
+    # at its end. Solved for all k at once with running products and sums
+    p = prices[starts]
+    growth = (weights * p[1:] / p[:-1]).sum(axis=1)
+    added = ((bought[starts][1:] - bought[starts][:-1]) * p[1:]).sum(axis=1)
+
+    scale = np.concatenate([[1.0], np.cumprod(growth)])
+    value = scale * ((bought[0] * p[0]).sum() + np.concatenate([[0.0], np.cumsum(added / scale[1:])]))
+    return weights * value[:, None] / p
+
+
+def _threshold_rebalances(prices, weights, bought, threshold, window=256):
+    # Rebalance days depend on the holdings, so they are found one after the
+    # other, each by scanning the following days as arrays (a window that
+    # doubles until the weights drift far enough)
+    starts = [0]
+    units = [bought[0]]
+    day, size = 1, window
+    while day < len(prices):
+        stop = min(day + size, len(prices))
+        values = (units[-1] + bought[day:stop] - bought[starts[-1]]) * prices[day:stop]
+        total = values.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            drift = np.abs(values / total[:, None] - weights).max(axis=1)
+        hits = np.flatnonzero(drift > threshold)
+        if not len(hits):
+            day, size = stop, size * 2
+            continue
+        day += hits[0]
+        starts.append(day)
+        units.append(weights * total[hits[0]] / prices[day])
+        day, size = day + 1, window
+    return np.array(starts), np.array(units)
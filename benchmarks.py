@@ -0,0 +1,383 @@
+"""
+Micro-benchmarks for the compute hot paths.
+
+Every benchmark runs headless on synthetic inputs (no Tk window, no network)
+and is timed as the best of several repeats, each averaged over enough calls
+to last ~0.2s. Results can be written to JSON and compared against a stored
+baseline; the run fails if any benchmark is slower than its baseline by more
+than the tolerance.
+
+Example:
+    python benchmarks.py --save-baseline            # record this machine's numbers
+    python benchmarks.py                            # compare against them (exit 1 on regression)
+    python benchmarks.py --check                    # the same, and exit 2 without a baseline
+    python benchmarks.py net_pay dca --out run.json # a subset, saving the results
+
+Baselines are machine specific, so record one on the machine that checks it;
+--check fails when there is none.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+from datetime import datetime
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, "benchmarks_baseline.json")
+DEFAULT_TOLERANCE = 0.30
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register a setup function; it returns the zero-argument callable to time."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+# =========================
+# Synthetic inputs
+# =========================
+
+def synthetic_prices(years=30, seed=0, ticker="^GSPC"):
+    """Daily prices from 1995 on from the synthetic price source: (DatetimeIndex, prices)."""
+    import pandas as pd
+    import price_providers
+
+    dates, prices = price_providers.SyntheticProvider(seed=seed).fetch(ticker, "1995-01-01", f"{1995 + years}-01-01")
+    return pd.DatetimeIndex(dates), prices
+
+
+def _load_calculator():
+    # "Portfolio Calculator.py" is a script (space in the name), so import it by path
+    spec = importlib.util.spec_from_file_location("portfolio_calculator",
+                                                  os.path.join(HERE, "Portfolio Calculator.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# =========================
+# Benchmarks
+# =========================
+
+# --- Take-home pay ---
+
+@benchmark("net_pay")
+def bench_net_pay():
+    # One salary at a time, as the calculator script and GUI hover code call it
+    import projection_engine
+    return lambda: projection_engine.net_pay(45000.0)
+
+
+@benchmark("net_pay_batch")
+def bench_net_pay_batch():
+    import uk_tax
+    salaries = np.linspace(0, 200000, 10000)
+    return lambda: uk_tax.net_pay(salaries)
+
+
+# --- Net worth projection ---
+
+@benchmark("projection")
+def bench_projection():
+    # What the Portfolio Projector runs for a full recompute
+    import projection_engine
+    params = dict(projection_engine.PARAM_DEFAULTS)
+    return lambda: projection_engine.simulate(params)
+
+
+@benchmark("projection_incremental")
+def bench_projection_incremental():
+    # A retire_age slider drag on a primed projector
+    import projection_engine
+    projector = projection_engine.IncrementalProjector()
+    params = dict(projection_engine.PARAM_DEFAULTS)
+    ages = iter(np.tile([60, 61], 10 ** 7))
+
+    def run():
+        params["retire_age"] = next(ages)
+        projector.run(params)
+    return run
+
+
+@benchmark("projection_batch")
+def bench_projection_batch():
+    import projection_engine
+    params = {"retire_age": np.linspace(50, 70, 10000)}
+    return lambda: projection_engine.simulate(params)
+
+
+@benchmark("projection_monthly")
+def bench_projection_monthly():
+    # The projector with Monthly Steps switched on
+    import projection_engine
+    params = dict(projection_engine.PARAM_DEFAULTS)
+    return lambda: projection_engine.simulate_monthly(params)
+
+
+@benchmark("projection_monthly_batch")
+def bench_projection_monthly_batch():
+    import projection_engine
+    params = {"retire_age": np.linspace(50, 70, 10000)}
+    return lambda: projection_engine.simulate_monthly(params)
+
+
+@benchmark("calculator_script")
+def bench_calculator_script():
+    # The per-year loop of the original CLI script
+    calculator = _load_calculator()
+    return calculator.project
+
+
+# --- Backtester ---
+
+@benchmark("dca")
+def bench_dca():
+    # 30 years of daily prices through the DCA kernel
+    import backtest_kernel
+    dates, prices = synthetic_prices()
+    return lambda: backtest_kernel.dca_backtest(dates, prices, 10000.0, 500.0)
+
+
+@benchmark("dca_loop")
+def bench_dca_loop():
+    # The original day-by-day loop, for comparison
+    import backtest_kernel
+    dates, prices = synthetic_prices()
+    return lambda: backtest_kernel.dca_backtest_loop(dates, prices, 10000.0, 500.0)
+
+
+@benchmark("dca_batch")
+def bench_dca_batch():
+    # 20 tickers x 5 monthly amounts in one call
+    import backtest_kernel
+    dates, _ = synthetic_prices()
+    prices = np.stack([synthetic_prices(seed=seed)[1] for seed in range(20)])[:, None, :]
+    monthly = np.array([100.0, 250.0, 500.0, 1000.0, 2000.0])[:, None]
+    return lambda: backtest_kernel.dca_backtest(dates, prices, 10000.0, monthly)
+
+
+def _portfolio_prices(assets=40, years=40):
+    # A mix of NYSE and London listings, aligned the way the backtester does it
+    import backtest_kernel
+    import price_providers
+    source = price_providers.SyntheticProvider()
+    tickers = [f"ASSET{i}" + (".L" if i % 3 == 0 else "") for i in range(assets)]
+    return backtest_kernel.align([source.fetch(ticker, f"{2025 - years}-01-01", "2025-01-01")
+                                  for ticker in tickers])
+
+
+@benchmark("portfolio")
+def bench_portfolio():
+    # 40 assets x 40 years of daily prices, rebalanced quarterly
+    import backtest_kernel
+    dates, prices = _portfolio_prices()
+    weights = np.linspace(1, 2, prices.shape[1])
+    return lambda: backtest_kernel.portfolio_backtest(dates, prices, weights, 10000.0, 500.0, "quarterly")
+
+
+@benchmark("portfolio_threshold")
+def bench_portfolio_threshold():
+    import backtest_kernel
+    dates, prices = _portfolio_prices()
+    weights = np.linspace(1, 2, prices.shape[1])
+    return lambda: backtest_kernel.portfolio_backtest(dates, prices, weights, 10000.0, 500.0, "threshold", 0.05)
+
+
+@benchmark("prices_local")
+def bench_prices_local():
+    # Reading 30 years of one ticker from a local fixture file, uncached
+    import tempfile
+    import price_providers
+    # The directory is removed once the returned callable is released
+    directory = tempfile.TemporaryDirectory(prefix="finance_bench_")
+    dates, prices = price_providers.SyntheticProvider().fetch("^GSPC", "1995-01-01", "2025-01-01")
+    price_providers.DirectoryProvider(directory.name).store("^GSPC", dates, prices)
+
+    def run(directory=directory):
+        return price_providers.DirectoryProvider(directory.name).fetch("^GSPC", "1995-01-01", "2025-01-01")
+    return run
+
+
+@benchmark("backtest_offline")
+def bench_backtest_offline():
+    # A repeat backtest: 30 years from the price cache (synthetic source) through the DCA kernel
+    import backtest_kernel
+    import price_providers
+    from price_cache import PriceCache
+    cache = PriceCache(None, price_providers.SyntheticProvider().fetch)
+
+    def run():
+        dates, prices = cache.get("^GSPC", "1995-01-01", "2025-01-01")
+        return backtest_kernel.dca_backtest(dates, prices, 10000.0, 500.0)
+    return run
+
+
+# --- Pension efficiency ---
+
+@benchmark("pension_efficiency")
+def bench_pension_efficiency():
+    from pension_efficiency import PensionLogic
+    logic = PensionLogic()
+    return lambda: logic.calculate_efficiency(55000, "Basic", 5, 3)
+
+
+@benchmark("pension_efficiency_exact")
+def bench_pension_efficiency_exact():
+    from pension_efficiency import PensionLogic
+    logic = PensionLogic()
+    return lambda: logic.calculate_efficiency(55000, "Basic", 5, 3, exact=True)
+
+
+@benchmark("pension_curves")
+def bench_pension_curves():
+    from pension_efficiency import PensionLogic
+    logic = PensionLogic()
+    return lambda: logic.efficiency_curves()
+
+
+# =========================
+# Runner
+# =========================
+
+def time_call(fn, repeat=5, min_time=0.2):
+    """Best seconds per call over `repeat` runs of enough calls to last min_time."""
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 10 ** 6:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.1))
+    best = min([elapsed] + timer.repeat(repeat - 1, number))
+    return best / number, number
+
+
+def run(names=None, repeat=5, min_time=0.2):
+    results = {}
+    for name in names or BENCHMARKS:
+        fn = BENCHMARKS[name]()
+        fn()  # warm-up (imports, compiled tax tables, caches)
+        seconds, number = time_call(fn, repeat, min_time)
+        results[name] = {"seconds": seconds, "calls": number}
+        print(f"  {name:<26} {_format_time(seconds):>10}", flush=True)
+    return results
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def _regressed(results, baseline, tolerance):
+    return [name for name, result in results.items()
+            if name in baseline and result["seconds"] > baseline[name]["seconds"] * (1 + tolerance)]
+
+
+def compare(results, baseline, tolerance):
+    """Print current vs baseline; returns the names that regressed."""
+    regressed = []
+    print(f"\n  {'benchmark':<26} {'now':>10} {'baseline':>10} {'ratio':>7}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"  {name:<26} {_format_time(result['seconds']):>10} {'-':>10} {'-':>7}  (new)")
+            continue
+        ratio = result["seconds"] / base["seconds"]
+        flag = ""
+        if ratio > 1 + tolerance:
+            regressed.append(name)
+            flag = "  REGRESSED"
+        elif ratio < 1 - tolerance:
+            flag = "  faster"
+        print(f"  {name:<26} {_format_time(result['seconds']):>10} "
+              f"{_format_time(base['seconds']):>10} {ratio:>6.2f}x{flag}")
+    return regressed
+
+
+def _format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the compute hot paths.")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--check", action="store_true",
+                        help="fail (exit 2) when there is no baseline to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown before failing, as a fraction (default 0.30)")
+    parser.add_argument("--out", help="also write this run's results to a JSON file")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per repeat")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    started = time.perf_counter()
+    results = run(args.names, args.repeat, args.min_time)
+    report = {"environment": environment(), "results": results}
+    print(f"  ({time.perf_counter() - started:.1f}s)")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        # Keep the baseline of benchmarks that were not run this time
+        saved = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                saved = json.load(f)["results"]
+        saved.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump({"environment": report["environment"], "results": saved}, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one",
+              file=sys.stderr if args.check else sys.stdout)
+        return 2 if args.check else 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+
+    # Timings on a busy machine are noisy: time anything that looks slower once more
+    # and keep the better of the two runs before calling it a regression
+    suspects = _regressed(results, baseline, args.tolerance)
+    if suspects:
+        print("  re-timing:", ", ".join(suspects))
+        for name, result in run(suspects, args.repeat, args.min_time).items():
+            if result["seconds"] < results[name]["seconds"]:
+                results[name] = result
+
+    regressed = compare(results, baseline, args.tolerance)
+    if regressed:
+        print(f"\nRegressed beyond {args.tolerance:.0%}: {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,390 @@
+"""
+Persistent-artist chart rendering shared by the GUIs.
+
+Artists are created once per chart and updated in place (set_data, set_height,
+set_text). They are marked animated, so a full canvas.draw() only happens
+when something structural changes (axis limits, legend, new artists, window
+resize); every other update restores the cached background and blits the
+changed artists on top of it.
+
+Overlays (e.g. the HoverCursor) sit on top of the finished chart: moving them
+restores a cached copy of the chart and blits just the overlay artists.
+"""
+
+import numpy as np
+
+
+class ChartLayer:
+    def __init__(self, ax, canvas):
+        self.ax = ax
+        self.canvas = canvas
+        self.fig = ax.figure
+
+        self.artists = {}         # name -> artist (or list of artists)
+        self.overlays = []        # drawn on top of everything, see redraw_overlays()
+        self.legend_kwargs = None
+        self.legend_artist = None
+        self.full_draws = 0
+        self.blits = 0
+
+        self._bounds = {}         # name -> (xmin, xmax, ymin, ymax) in data units
+        self._background = None   # chart without its animated artists
+        self._frame = None        # finished chart, without overlays
+        self._stale = True        # needs a full draw
+
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    # --- Lifecycle ---
+
+    def reset(self):
+        """Clear the axes and forget every artist (e.g. when the chart type changes)."""
+        self.ax.clear()
+        self.artists.clear()
+        self.overlays.clear()
+        self._bounds.clear()
+        self.legend_kwargs = None
+        self.legend_artist = None
+        self._stale = True
+
+    def invalidate(self):
+        """Force a full draw on the next redraw()."""
+        self._stale = True
+
+    def _register(self, name, artist):
+        for a in _each(artist):
+            a.set_animated(True)
+        self.artists[name] = artist
+        self._stale = True
+        return artist
+
+    # --- Artists ---
+
+    def line(self, name, x, y, **style):
+        line = self.artists.get(name)
+        if line is None:
+            line = self._register(name, self.ax.plot(x, y, **style)[0])
+        else:
+            line.set_data(x, y)
+            self._show(line)
+        xy = line.get_xydata()
+        self._set_bounds(name, xy[:, 0], xy[:, 1])
+        return line
+
+    def end_label(self, name, x, y, text, color):
+        """Marker and text annotation on a single point (e.g. the last value of a line)."""
+        artists = self.artists.get(name)
+        if artists is None:
+            marker = self.ax.plot([x], [y], marker='o', color=color, markersize=5)[0]
+            label = self.ax.annotate(
+                text,
+                xy=(x, y),
+                xytext=(5, 5),
+                textcoords="offset points",
+                fontsize=9,
+                color=color,
+                fontweight='bold'
+            )
+            artists = self._register(name, [marker, label])
+        else:
+            marker, label = artists
+            marker.set_data([x], [y])
+            label.xy = (x, y)
+            label.set_text(text)
+            for a in artists:
+                self._show(a)
+        return artists
+
+    def vline(self, name, x, **style):
+        """Vertical line at x; x=None hides it."""
+        line = self.artists.get(name)
+        if x is None:
+            if line is not None:
+                self._hide(line)
+            return line
+        if line is None:
+            line = self._register(name, self.ax.axvline(x, **style))
+        else:
+            line.set_xdata([x, x])
+            self._show(line)
+        return line
+
+    def band(self, name, x, y1, y2, **style):
+        """Filled region between y1 and y2."""
+        x = np.asarray(x, dtype=float)
+        y1 = np.asarray(y1, dtype=float)
+        y2 = np.asarray(y2, dtype=float)
+        poly = self.artists.get(name)
+        if poly is None:
+            poly = self._register(name, self.ax.fill_between(x, y1, y2, **style))
+        else:
+            verts = np.concatenate([np.column_stack([x, y1]), np.column_stack([x[::-1], y2[::-1]])])
+            poly.set_verts([verts])
+            self._show(poly)
+        self._set_bounds(name, x, np.concatenate([y1, y2]))
+        return poly
+
+    def bars(self, name, heights, colors=None, **style):
+        """Bar chart at x = 0..n-1; heights (and colors) are updated in place."""
+        heights = np.asarray(heights, dtype=float)
+        rects = self.artists.get(name)
+        if rects is None or len(rects) != len(heights):
+            container = self.ax.bar(range(len(heights)), heights, color=colors, **style)
+            rects = self._register(name, list(container))
+        else:
+            for rect, height in zip(rects, heights):
+                rect.set_height(height)
+            if colors is not None:
+                for rect, color in zip(rects, colors):
+                    rect.set_color(color)
+        self._set_bounds(name, np.array([-0.5, len(heights) - 0.5]), np.append(heights, 0))
+        return rects
+
+    def bar_labels(self, name, rects, texts):
+        """Value labels on top of bars."""
+        labels = self.artists.get(name)
+        if labels is None or len(labels) != len(rects):
+            labels = [self.ax.annotate("", xy=(0, 0), xytext=(0, 3), textcoords="offset points",
+                                       ha='center', va='bottom') for _ in rects]
+            self._register(name, labels)
+        for label, rect, text in zip(labels, rects, texts):
+            label.xy = (rect.get_x() + rect.get_width() / 2, rect.get_height())
+            label.set_text(text)
+        return labels
+
+    def image(self, name, data, extent, vmin=None, vmax=None, **style):
+        """Image (e.g. a heatmap) stretched over extent = (x0, x1, y0, y1); updated in place."""
+        image = self.artists.get(name)
+        if image is None:
+            image = self._register(name, self.ax.imshow(
+                data, extent=extent, origin='lower', aspect='auto', vmin=vmin, vmax=vmax, **style))
+        else:
+            image.set_data(data)
+            if tuple(image.get_extent()) != tuple(extent):
+                image.set_extent(extent)
+                self._stale = True
+            if (vmin, vmax) != (None, None) and (vmin, vmax) != image.get_clim():
+                # A colorbar (part of the background) follows the limits
+                image.set_clim(vmin, vmax)
+                self._stale = True
+            self._show(image)
+        self._set_bounds(name, extent[:2], extent[2:])
+        return image
+
+    def text(self, name, artist, text):
+        """Animate an existing text artist, e.g. ax.title for a changing title."""
+        if name not in self.artists:
+            self._register(name, artist)
+        artist.set_text(text)
+        return artist
+
+    def add_overlay(self, artist):
+        artist.set_animated(True)
+        self.overlays.append(artist)
+        return artist
+
+    def hide(self, name):
+        for a in _each(self.artists.get(name)):
+            self._hide(a)
+        self._bounds.pop(name, None)
+
+    def legend(self, **kwargs):
+        """Keep a legend of the visible, labelled artists (rebuilt on full draws)."""
+        self.legend_kwargs = kwargs
+
+    def _show(self, artist):
+        if not artist.get_visible():
+            artist.set_visible(True)
+            self._stale = True
+
+    def _hide(self, artist):
+        if artist.get_visible():
+            artist.set_visible(False)
+            self._stale = True
+
+    # --- Limits ---
+
+    def _set_bounds(self, name, x, y):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        x = x[np.isfinite(x)]
+        y = y[np.isfinite(y)]
+        if len(x) and len(y):
+            self._bounds[name] = (x.min(), x.max(), y.min(), y.max())
+
+    def rescale(self, x=True, y=True, y_floor=None, margin=0.05, shrink=0.6):
+        """
+        Fit the axes to the data, but only touch the limits when the data
+        leaves them or shrinks below `shrink` of the current span.
+        """
+        if not self._bounds:
+            return
+        b = np.array(list(self._bounds.values()))
+        xmin, xmax = b[:, 0].min(), b[:, 1].max()
+        ymin, ymax = b[:, 2].min(), b[:, 3].max()
+        if y_floor is not None:
+            ymin = min(ymin, y_floor)
+
+        if x:
+            self._fit(self.ax.get_xlim, self.ax.set_xlim, xmin, xmax, margin, shrink, pad_low=True)
+        if y:
+            self._fit(self.ax.get_ylim, self.ax.set_ylim, ymin, ymax, margin, shrink,
+                      pad_low=y_floor is None)
+
+    def _fit(self, get_lim, set_lim, lo, hi, margin, shrink, pad_low):
+        cur_lo, cur_hi = get_lim()
+        fits = cur_lo <= lo and hi <= cur_hi
+        tight = (hi - lo) >= shrink * (cur_hi - cur_lo)
+        if fits and tight:
+            return
+        span = (hi - lo) or max(abs(hi), 1.0)
+        set_lim(lo - span * margin if pad_low else lo, hi + span * margin)
+        self._stale = True
+
+    # --- Drawing ---
+
+    def redraw(self):
+        if self._stale or self._background is None:
+            self._stale = False
+            if self.legend_kwargs is not None:
+                self._rebuild_legend()
+            self.full_draws += 1
+            self.canvas.draw()  # triggers _on_draw
+        else:
+            self.blits += 1
+            self.canvas.restore_region(self._background)
+            self._draw_animated()
+            self.canvas.blit(self.fig.bbox)
+
+    def redraw_overlays(self):
+        """Redraw only the overlays on top of the cached chart."""
+        if self._frame is None or self._stale:
+            self.redraw()
+            return
+        self.canvas.restore_region(self._frame)
+        self._draw_overlays()
+        self.canvas.blit(self.fig.bbox)
+
+    def _rebuild_legend(self):
+        handles = []
+        for artist in self.artists.values():
+            for a in _each(artist):
+                label = a.get_label()
+                if a.get_visible() and label and not label.startswith("_") and not hasattr(a, "get_text"):
+                    handles.append(a)
+        # Animated too, so it stays on top of the lines it describes
+        self.legend_artist = self.ax.legend(handles=handles, **self.legend_kwargs)
+        self.legend_artist.set_animated(True)
+
+    def _on_draw(self, event):
+        # Background is everything except the animated artists
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for artist in self.artists.values():
+            for a in _each(artist):
+                if a.get_visible():
+                    self.fig.draw_artist(a)
+        if self.legend_artist is not None:
+            self.fig.draw_artist(self.legend_artist)
+
+        self._frame = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_overlays()
+
+    def _draw_overlays(self):
+        for a in self.overlays:
+            if a.get_visible():
+                self.fig.draw_artist(a)
+
+
+class HoverCursor:
+    """
+    Vertical cursor line plus a tooltip box that snaps to whole x values
+    (e.g. ages). Tooltip text is built once per result by set_table(); mouse
+    moves within the same x value are ignored, and a move only blits the two
+    cursor artists over the cached chart.
+    """
+
+    def __init__(self, chart, title="Age"):
+        self.chart = chart
+        self.title = title
+        self.line = None
+        self.box = None
+        self.start = 0
+        self.texts = []
+        self.last_index = None
+
+    def _create(self):
+        ax = self.chart.ax
+        self.line = self.chart.add_overlay(
+            ax.axvline(x=0, visible=False, color='gray', linestyle=':', alpha=0.8))
+        # Fixed box just outside the top right of the axes
+        self.box = self.chart.add_overlay(ax.text(
+            1.02, 1.0, "",
+            transform=ax.transAxes,
+            verticalalignment='top',
+            horizontalalignment='left',
+            fontdict={'size': 9},
+            bbox=dict(boxstyle="round", facecolor="white", alpha=0.9, edgecolor="gray"),
+            visible=False
+        ))
+
+    def set_table(self, xs, series, fmt):
+        """
+        Precompute the tooltip for every x. Call before the chart's redraw().
+
+        xs     - whole-number x values (e.g. ages), evenly spaced by 1
+        series - dict of name -> values, in display order
+        fmt    - formats a single value
+        """
+        if self.line is None or self.line not in self.chart.overlays:
+            self._create()
+            self.last_index = None  # the new artists start hidden
+
+        self.start = int(xs[0]) if len(xs) else 0
+        columns = [[f"{name}: {fmt(v)}" for v in values] for name, values in series.items()]
+        self.texts = [
+            "\n".join([f"{self.title}: {self.start + i}", "-" * 15] + [col[i] for col in columns])
+            for i in range(len(xs))
+        ]
+        # Keep a visible cursor at the same index, moved to its new x and showing the new values
+        if self.last_index is not None and self.last_index < len(self.texts):
+            self.line.set_xdata([self.start + self.last_index])
+            self.box.set_text(self.texts[self.last_index])
+        else:
+            self.last_index = None
+            self.line.set_visible(False)
+            self.box.set_visible(False)
+
+    def hide(self):
+        if self.line is not None and self.line.get_visible():
+            self.line.set_visible(False)
+            self.box.set_visible(False)
+            self.last_index = None
+            self.chart.redraw_overlays()
+
+    def on_move(self, event):
+        if event.inaxes is not self.chart.ax or event.xdata is None or not self.texts:
+            self.hide()
+            return
+
+        index = int(round(event.xdata)) - self.start
+        if index < 0 or index >= len(self.texts):
+            self.hide()
+            return
+        if index == self.last_index:
+            return  # same whole age as last time, nothing to redraw
+
+        self.last_index = index
+        self.line.set_xdata([self.start + index])
+        self.box.set_text(self.texts[index])
+        self.line.set_visible(True)
+        self.box.set_visible(True)
+        self.chart.redraw_overlays()
+
+
+def _each(artist):
+    """Iterate a registered entry, which is a single artist, a list, or None."""
+    if artist is None:
+        return []
+    return artist if isinstance(artist, list) else [artist]
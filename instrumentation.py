@@ -0,0 +1,144 @@
+"""
+Opt-in timing spans for the GUIs.
+
+Each app run (a backtest, a projection update, a pension recalculation) is
+one Run, timed as named spans such as fetch, parse, simulate, update and
+draw. A run can start on a worker thread and finish on the Tk thread, so
+the Run object travels with the result and finish() is called after the draw.
+
+Tracing is off unless switched on with environment variables:
+
+    FINANCE_TRACE=1                  show the last run's breakdown in the status label
+    FINANCE_TRACE_FILE=trace.jsonl   also append one JSON line per run (rolled over at ~5 MB)
+    FINANCE_TRACE_MEMORY=1           also record each run's peak traced memory (tracemalloc)
+
+When it is off, spans are a shared no-op and cost next to nothing. Memory
+tracing slows every allocation down, so compare timings with it switched off.
+"""
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+MAX_TRACE_BYTES = 5 * 2**20
+
+
+class Run:
+    def __init__(self, tracer, kind):
+        self.tracer = tracer
+        self.kind = kind
+        self.spans = {}   # name -> seconds, in the order first seen
+        self.notes = {}
+        self.started = time.perf_counter()
+        if tracer.memory:
+            tracemalloc.reset_peak()
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans[name] = self.spans.get(name, 0.0) + time.perf_counter() - start
+
+    def note(self, **values):
+        """Extra values for the trace record (e.g. cache="hit")."""
+        self.notes.update(values)
+
+    def finish(self):
+        """Close the run; returns the status text ('' when tracing is off)."""
+        return self.tracer._finish(self)
+
+
+class _NullRun:
+    @contextmanager
+    def span(self, name):
+        yield
+
+    def note(self, **values):
+        pass
+
+    def finish(self):
+        return ""
+
+
+# Shared no-op run, also a default for code that may or may not be traced
+NULL_RUN = _NullRun()
+
+
+class Tracer:
+    def __init__(self, app, enabled=False, trace_path=None, memory=False):
+        """
+        app        - name written to every trace record
+        enabled    - time runs and keep the last breakdown
+        trace_path - JSONL file to append each finished run to (implies enabled)
+        memory     - record peak traced memory per run (implies enabled)
+        """
+        self.app = app
+        self.trace_path = trace_path
+        self.memory = memory
+        self.enabled = bool(enabled or trace_path or memory)
+        self.runs = 0
+        self.last = None  # record of the last finished run
+        self._lock = threading.Lock()
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @classmethod
+    def from_env(cls, app):
+        return cls(app,
+                   enabled=os.environ.get("FINANCE_TRACE", "") not in ("", "0"),
+                   trace_path=os.environ.get("FINANCE_TRACE_FILE") or None,
+                   memory=os.environ.get("FINANCE_TRACE_MEMORY", "") not in ("", "0"))
+
+    def start(self, kind="run"):
+        """A new Run (a no-op one when tracing is off)."""
+        return Run(self, kind) if self.enabled else NULL_RUN
+
+    def _finish(self, run):
+        total = time.perf_counter() - run.started
+        with self._lock:
+            self.runs += 1
+            record = {
+                "app": self.app,
+                "kind": run.kind,
+                "run": self.runs,
+                "time": datetime.now().isoformat(timespec="milliseconds"),
+                "total_ms": round(total * 1000, 3),
+                "spans_ms": {name: round(seconds * 1000, 3) for name, seconds in run.spans.items()},
+            }
+            if self.memory:
+                record["peak_kb"] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+            record.update(run.notes)
+            self.last = record
+            if self.trace_path:
+                self._write(record)
+        return self.status_text()
+
+    def _write(self, record):
+        try:
+            if os.path.exists(self.trace_path) and os.path.getsize(self.trace_path) > MAX_TRACE_BYTES:
+                os.replace(self.trace_path, self.trace_path + ".1")  # keep one older file
+            with open(self.trace_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError:
+            self.trace_path = None  # stop trying; the status label still works
+
+    def status_text(self, sep="\n"):
+        """Last run's spans, one per line: 'fetch 812 ms', ..., 'total 861 ms'."""
+        record = self.last
+        if record is None:
+            return ""
+        parts = [f"{name} {_ms(ms)}" for name, ms in record["spans_ms"].items()]
+        parts.append(f"total {_ms(record['total_ms'])}")
+        if "peak_kb" in record:
+            parts.append(f"peak {record['peak_kb'] / 1024:.1f} MB")
+        return sep.join(parts)
+
+
+def _ms(ms):
+    return f"{ms:.0f} ms" if ms >= 10 else f"{ms:.1f} ms"
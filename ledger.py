@@ -0,0 +1,97 @@
+"""
+Per-year ledger for projection results.
+
+Every series of a run lives in one preallocated NumPy structured array, sized
+once for the horizon: shape (years,) for a single projection or
+(scenarios, years) for a batch, with one float field per series. Reading a
+column (ledger["pension"]) returns a view into that block, never a copy, so
+plotting, hover tables and exports all share the same memory, and a finished
+result is a single allocation that is cheap to keep around.
+
+Besides the series, a ledger can carry a few extra per-run values (e.g. ages,
+purchase_year); these are stored as given and read the same way.
+"""
+
+from collections.abc import Mapping
+
+import numpy as np
+
+
+class Ledger(Mapping):
+    __slots__ = ("data", "extras")
+
+    def __init__(self, names, shape):
+        """
+        names - series stored as columns
+        shape - years, or (scenarios, years)
+        """
+        self.data = np.empty(shape, dtype=[(name, "f8") for name in names])
+        self.extras = {}
+
+    # --- Columns ---
+
+    @property
+    def names(self):
+        return self.data.dtype.names
+
+    @property
+    def years(self):
+        return self.data.shape[-1]
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes + sum(getattr(v, "nbytes", 0) for v in self.extras.values())
+
+    def __getitem__(self, name):
+        if name in self.data.dtype.fields:
+            return self.data[name]
+        return self.extras[name]
+
+    def __setitem__(self, name, value):
+        """Fill a whole column in place, or store an extra value."""
+        if name in self.data.dtype.fields:
+            self.data[name] = value
+        else:
+            self.extras[name] = value
+
+    def __iter__(self):
+        yield from self.data.dtype.names
+        yield from self.extras
+
+    def __len__(self):
+        return len(self.data.dtype.names) + len(self.extras)
+
+    # --- Rows ---
+
+    def set_year(self, year, row):
+        """
+        Write one year (or a slice of years) of every column from a
+        name -> values mapping.
+        """
+        for name in self.data.dtype.names:
+            self.data[name][..., year] = row[name]
+
+    def scenario(self, index):
+        """Column views of one scenario of a batch, as a dict of (years,) arrays."""
+        record = self.data[index]
+        return {name: record[name] for name in self.data.dtype.names}
+
+    # --- Files ---
+
+    def save(self, path, **meta):
+        """Write the columns and array extras (plus any meta arrays) to an .npz file."""
+        extras = {f"extra.{name}": value for name, value in self.extras.items()
+                  if isinstance(value, np.ndarray)}
+        np.savez(path, data=self.data, **extras, **meta)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            ledger = cls.__new__(cls)
+            ledger.data = f["data"]
+            ledger.extras = {name[len("extra."):]: f[name] for name in f.files
+                             if name.startswith("extra.")}
+        return ledger
+
+    def __repr__(self):
+        return f"Ledger({list(self.names)}, shape={self.data.shape})"
@@ -0,0 +1,84 @@
+"""
+Stochastic (Monte Carlo) mode for the net worth projection.
+
+Annual returns, inflation and house price growth are drawn as correlated
+normal variables for every path at once, then the whole (paths x years) batch
+is run through projection_engine in a single call.
+"""
+
+import numpy as np
+
+import projection_engine
+
+# Annual standard deviation of each time-varying input
+DEFAULT_VOLATILITY = {
+    "pension_rate": 0.12,
+    "isa_rate": 0.16,
+    "cash_rate": 0.01,
+    "lisa_rate": 0.12,
+    "inflation": 0.015,
+    "house_price_growth": 0.06,
+}
+
+# Correlations, in projection_engine.TIME_VARYING order:
+# pension, isa, cash, lisa, inflation, house price growth
+DEFAULT_CORRELATION = np.array([
+    [1.00, 0.90, 0.00, 0.90, -0.10, 0.30],
+    [0.90, 1.00, 0.00, 0.85, -0.10, 0.30],
+    [0.00, 0.00, 1.00, 0.00, 0.50, 0.10],
+    [0.90, 0.85, 0.00, 1.00, -0.10, 0.30],
+    [-0.10, -0.10, 0.50, -0.10, 1.00, 0.30],
+    [0.30, 0.30, 0.10, 0.30, 0.30, 1.00],
+])
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def draw_rate_paths(means, paths, years, volatility=None, correlation=None, seed=None):
+    """
+    Draw correlated annual rates for every time-varying input.
+
+    means maps each name in projection_engine.TIME_VARYING to its expected
+    annual value. Returns a dict of (paths x years) arrays.
+    """
+    volatility = {**DEFAULT_VOLATILITY, **(volatility or {})}
+    correlation = DEFAULT_CORRELATION if correlation is None else np.asarray(correlation)
+
+    keys = projection_engine.TIME_VARYING
+    mean = np.array([means[key] for key in keys], dtype=float)
+    sigma = np.array([volatility[key] for key in keys], dtype=float)
+
+    rng = np.random.default_rng(seed)
+    chol = np.linalg.cholesky(correlation)
+    shocks = rng.standard_normal((paths, years, len(keys))) @ chol.T
+    draws = mean + shocks * sigma
+
+    return {key: draws[:, :, i] for i, key in enumerate(keys)}
+
+
+def run(params, paths=10000, volatility=None, correlation=None, seed=None):
+    """
+    Run a Monte Carlo projection of a single scenario.
+
+    Returns a dict with 'ages' (years,), 'percentiles' (the PERCENTILES
+    tuple), 'net_worth' (len(PERCENTILES) x years) and 'ruin_probability',
+    the share of paths that cannot fund the retirement income in some year.
+    """
+    p = projection_engine.as_batch(params)
+    if len(p["base_salary"]) != 1:
+        raise ValueError("Monte Carlo runs take a single scenario")
+
+    years = projection_engine.horizon(p)
+    batch = {key: np.repeat(value, paths) for key, value in p.items()}
+    means = {key: p[key][0] for key in projection_engine.TIME_VARYING}
+
+    rate_paths = draw_rate_paths(means, paths, years, volatility, correlation, seed)
+    result = projection_engine.simulate(batch, rate_paths, record=("net_worth", "shortfall"))
+
+    ran_out = (result["shortfall"] > 1e-6).any(axis=1)
+    return {
+        "ages": result["ages"][0],
+        "percentiles": PERCENTILES,
+        "net_worth": np.percentile(result["net_worth"], PERCENTILES, axis=0),
+        "ruin_probability": ran_out.mean(),
+    }
@@ -1,162 +1,311 @@
 import customtkinter as ctk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import numpy as np
 import sys
+from chart_layer import ChartLayer
+import projection_engine
+import startup
+import uk_tax
+from instrumentation import Tracer
 
 # Set theme
 ctk.set_appearance_mode("System")
 ctk.set_default_color_theme("blue")
 
+# Vehicles in display order
+VEHICLES = ['Workplace (Match)', 'Pension (SS)', 'Pension (SIPP)', 'LISA', 'ISA']
+
+# Income tax paid on the taxable 75% of pension withdrawals
+RETIRE_TAX_RATES = {"Basic": 0.20, "Higher": 0.40, "Additional": 0.45, "Zero": 0.0}
+
+NET_INVESTMENT = 1000.0
+
+VEHICLE_COLORS = ['tab:purple', 'tab:blue', 'tab:cyan', 'tab:orange', 'tab:green']
+
+# Access rules for horizon comparisons
+PENSION_ACCESS_AGE = projection_engine.PENSION_ACCESS_AGE
+LISA_ACCESS_AGE = projection_engine.LISA_ACCESS_AGE
+LISA_EARLY_CHARGE = 0.25   # withdrawal charge before 60 (other than for a first home)
+
+
+def pension_withdrawal(pot_value, retire_tax):
+    """Net cash from a pension pot: 25% tax free, the rest taxed at the retirement rate."""
+    return pot_value * 0.25 + pot_value * 0.75 * (1 - retire_tax)
+
+
 class PensionLogic:
-    def __init__(self):
-        # 2024/25 Tax Years parameters
-        self.personal_allowance = 12570
-        self.basic_rate_limit = 50270
-        self.additional_rate_limit = 125140
-        self.taper_threshold = 100000
-        
-        # Rates
-        self.tax_basic = 0.20
-        self.tax_higher = 0.40
-        self.tax_additional = 0.45
-        
-        # NI Rates (Jan 2024 update: 10% -> 8% from April 2024)
-        # However, the user linked an article that says "Updated for 8% NI".
-        self.ni_lower_limit = 12570
-        self.ni_upper_limit = 50270
-        self.ni_rate_main = 0.08
-        self.ni_rate_upper = 0.02
-        
+    def __init__(self, tax_year=uk_tax.DEFAULT_TAX_YEAR):
+        # Bands, NI and the £100k allowance taper come from uk_tax
+        self.tax_year = tax_year
+
     def get_marginal_rates(self, gross_salary):
         """
         Returns (income_tax_rate, ni_rate) for the marginal £1 earned at this salary.
         Handles Personal Allowance Taper (60% effective rate).
+        Accepts a single salary or an array of salaries.
         """
-        # Income Tax
-        if gross_salary < self.personal_allowance:
-            tax_rate = 0.0
-        elif gross_salary < self.basic_rate_limit:
-            tax_rate = self.tax_basic
-        elif gross_salary < self.taper_threshold:
-            tax_rate = self.tax_higher
-        elif gross_salary < self.additional_rate_limit:
-            # Between 100k and 125k, PA tapers £1 for every £2.
-            # Effective rate = 40% + 20% (lost PA) = 60%.
-            # Strictly, for every £1 earned, you pay £0.40 tax and lose £0.50 allowance (which is taxed at 40%, so £0.20 extra tax).
-            if gross_salary < 125140:
-                tax_rate = 0.60
-            else:
-                tax_rate = self.tax_additional # 45%
-        else:
-            tax_rate = self.tax_additional
+        return uk_tax.marginal_rates(gross_salary, self.tax_year)
 
-        # NI
-        if gross_salary < self.ni_lower_limit:
-            ni_rate = 0.0
-        elif gross_salary < self.ni_upper_limit:
-            ni_rate = self.ni_rate_main
-        else:
-            ni_rate = self.ni_rate_upper
-            
-        return tax_rate, ni_rate
+    @staticmethod
+    def net_withdrawals(marg_tax, marg_ni, retire_tax, employee_pct=5.0, employer_pct=3.0):
+        """
+        Pot and net withdrawal of every vehicle for £1000 of net pay invested.
+
+        marg_tax/marg_ni/retire_tax are broadcast against each other, so a
+        salary grid (S,) against retirement rates (B, 1) gives (B, S) results.
+        Returns (pots, net) dicts keyed by vehicle.
+        """
+        marg_tax = np.asarray(marg_tax, dtype=float)
+        retire_tax = np.asarray(retire_tax, dtype=float)
+        retention_rate = 1 - (marg_tax + np.asarray(marg_ni, dtype=float))
+
+        # Salary sacrifice: to get £1000 net you needed 1000 / retention gross
+        ss_pot = np.divide(NET_INVESTMENT, retention_rate,
+                           out=np.zeros_like(retention_rate), where=retention_rate > 0)
+        # Workplace: employer adds £(employer%/employee%) per £1 of sacrifice
+        match_ratio = employer_pct / employee_pct if employee_pct > 0 else 0
+        matched_pot = ss_pot * (1 + match_ratio)
+        # SIPP (relief at source): non-taxpayers still get basic rate relief
+        sipp_pot = np.where(marg_tax < 0.2, NET_INVESTMENT / 0.8, NET_INVESTMENT / (1 - marg_tax))
+
+        shape = np.broadcast(ss_pot, retire_tax).shape
+        isa = np.full(shape, NET_INVESTMENT)
+        lisa = np.full(shape, NET_INVESTMENT * 1.25)  # 25% bonus, tax free after 60
+
+        pots = {
+            'Workplace (Match)': np.broadcast_to(matched_pot, shape),
+            'Pension (SS)': np.broadcast_to(ss_pot, shape),
+            'Pension (SIPP)': np.broadcast_to(sipp_pot, shape),
+            'LISA': lisa,
+            'ISA': isa,
+        }
+        net = {
+            'Workplace (Match)': pension_withdrawal(pots['Workplace (Match)'], retire_tax),
+            'Pension (SS)': pension_withdrawal(pots['Pension (SS)'], retire_tax),
+            'Pension (SIPP)': pension_withdrawal(pots['Pension (SIPP)'], retire_tax),
+            'LISA': lisa,
+            'ISA': isa,
+        }
+        return pots, net
 
     def calculate_efficiency(self, current_salary, retire_tax_band="Basic", 
-                             employee_pct=5.0, employer_pct=3.0):
+                             employee_pct=5.0, employer_pct=3.0, exact=False):
         """
         Calculates the value of £1000 Net Pay sacrificed/invested.
+
+        exact=True sizes the salary sacrifice so that it really costs £1000 of
+        take-home pay, with tax and NI integrated across any band edges it
+        crosses (instead of one marginal rate), and caps the employer match
+        at employer_pct of salary.
         """
-        NET_INVESTMENT = 1000.0
-        
-        # 1. Determine Marginal Rates
         marg_tax, marg_ni = self.get_marginal_rates(current_salary)
-        total_deduction = marg_tax + marg_ni
-        retention_rate = 1 - total_deduction
-        
-        # 2. Determine Retirement Tax Rate
-        if retire_tax_band == "Zero":
-            retire_tax = 0.0
-        elif retire_tax_band == "Basic":
-            retire_tax = 0.20
-        elif retire_tax_band == "Higher":
-            retire_tax = 0.40
-        elif retire_tax_band == "Additional":
-            retire_tax = 0.45
-        else:
-            retire_tax = 0.20
-
-        results = {}
+        retire_tax = RETIRE_TAX_RATES.get(retire_tax_band, 0.20)
 
-        # --- OPTION 1: ISA ---
-        # Baseline. £1000 Net -> £1000 Pot. No Tax on way out.
-        results['ISA'] = {
-            'pot': NET_INVESTMENT,
-            'net_withdrawal': NET_INVESTMENT,
-            'label': 'ISA'
+        pots, net = self.net_withdrawals(marg_tax, marg_ni, retire_tax, employee_pct, employer_pct)
+        if exact:
+            sacrifice = self.sacrifice_for_net_cost(current_salary, NET_INVESTMENT)
+            exact_ss = self.sacrifice_curve(current_salary, sacrifice, retire_tax_band,
+                                            employee_pct, employer_pct)
+            pots['Pension (SS)'] = exact_ss['pot']
+            pots['Workplace (Match)'] = exact_ss['matched_pot']
+            net['Pension (SS)'] = exact_ss['net_withdrawal']
+            net['Workplace (Match)'] = exact_ss['matched_withdrawal']
+        labels = {
+            'Pension (SS)': 'Pension (Sal. Sac.)',
+            'Workplace (Match)': 'Workplace (Matched)',
         }
-        
-        # --- OPTION 2: LISA ---
-        # £1000 Net -> +25% Bonus.
-        # Withdrawal Tax Free (if >60).
-        lisa_pot = NET_INVESTMENT * 1.25
-        results['LISA'] = {
-            'pot': lisa_pot,
-            'net_withdrawal': lisa_pot,
-            'label': 'LISA'
+        results = {
+            v: {
+                'pot': float(pots[v]),
+                'net_withdrawal': float(net[v]),
+                'label': labels.get(v, v)
+            }
+            for v in ['ISA', 'LISA', 'Pension (SS)', 'Workplace (Match)', 'Pension (SIPP)']
         }
+        return results, marg_tax, marg_ni
+
+    # --- Exact (non-marginal) salary sacrifice ---
+
+    def take_home(self, gross, student_loan=False):
+        """Take-home pay after income tax and NI (and optionally student loan)."""
+        gross = np.maximum(np.asarray(gross, dtype=float), 0.0)
+        return gross - uk_tax.rules(self.tax_year).total_deductions(gross, student_loan)
+
+    def sacrifice_curve(self, salary, sacrifices, retire_tax_band="Basic",
+                        employee_pct=5.0, employer_pct=3.0):
+        """
+        Exact outcome of sacrificing each amount in `sacrifices` (array of
+        gross pounds, clipped to 0 - salary) from a single salary.
+
+        The net cost is the real drop in take-home pay, so a sacrifice that
+        crosses band edges (e.g. from £110k down through the taper into the
+        higher-rate band) is charged each band's rate on the part inside it.
+        The employer adds employer/employee pounds per pound sacrificed, up
+        to employer_pct of salary.
+
+        Returns a dict of arrays: sacrifice, net_cost, pot, matched_pot,
+        net_withdrawal, matched_withdrawal and the per-£-of-net-pay values
+        per_pound and matched_per_pound (NaN for a zero sacrifice).
+        """
+        sacrifices = np.clip(np.asarray(sacrifices, dtype=float), 0.0, salary)
+        retire_tax = RETIRE_TAX_RATES.get(retire_tax_band, 0.20)
+
+        net_cost = self.take_home(salary) - self.take_home(salary - sacrifices)
+
+        match_ratio = employer_pct / employee_pct if employee_pct > 0 else 0
+        match = np.minimum(sacrifices * match_ratio, salary * employer_pct / 100)
+        matched_pot = sacrifices + match
+
+        net_withdrawal = pension_withdrawal(sacrifices, retire_tax)
+        matched_withdrawal = pension_withdrawal(matched_pot, retire_tax)
+        paid = net_cost > 0
 
-        # --- Share Function for Pension Withdrawal ---
-        def calc_pension_withdrawal(pot_value):
-            tax_free_cash = pot_value * 0.25
-            taxable_cash = pot_value * 0.75
-            net_taxable = taxable_cash * (1 - retire_tax)
-            return tax_free_cash + net_taxable
-
-        # --- OPTION 3: PENSION (Salary Sacrifice) ---
-        # To get £1000 Net, you needed Gross = 1000 / retention_rate
-        # That Gross goes entirely into Pension.
-        ss_gross_needed = NET_INVESTMENT / retention_rate if retention_rate > 0 else 0
-        ss_pot = ss_gross_needed
-        results['Pension (SS)'] = {
-            'pot': ss_pot,
-            'net_withdrawal': calc_pension_withdrawal(ss_pot),
-            'label': 'Pension (Sal. Sac.)'
+        return {
+            'sacrifice': sacrifices,
+            'net_cost': net_cost,
+            'pot': sacrifices,
+            'matched_pot': matched_pot,
+            'net_withdrawal': net_withdrawal,
+            'matched_withdrawal': matched_withdrawal,
+            'per_pound': np.divide(net_withdrawal, net_cost, out=np.full_like(net_cost, np.nan), where=paid),
+            'matched_per_pound': np.divide(matched_withdrawal, net_cost,
+                                           out=np.full_like(net_cost, np.nan), where=paid),
         }
-        
-        # --- OPTION 4: PENSION (Workplace Match) ---
-        # Same as SS, but for every £1 Gross I put in (Employee%), Employer adds £(Employer%/Employee%).
-        # Match Ratio
-        if employee_pct > 0:
-            match_ratio = employer_pct / employee_pct
-        else:
-            match_ratio = 0
-            
-        matched_pot = ss_gross_needed * (1 + match_ratio)
-        results['Workplace (Match)'] = {
-            'pot': matched_pot,
-            'net_withdrawal': calc_pension_withdrawal(matched_pot),
-            'label': 'Workplace (Matched)'
+
+    def sacrifice_for_net_cost(self, salary, net_cost):
+        """
+        Gross sacrifice that reduces take-home pay by exactly `net_cost`
+        (NaN if even the whole salary costs less).
+
+        The net cost is piecewise linear in the sacrifice, with corners where
+        salary - sacrifice crosses a tax breakpoint, so it is inverted exactly
+        by interpolating between those corners.
+        """
+        breakpoints = uk_tax.rules(self.tax_year).breakpoints
+        corners = np.unique(np.clip(np.concatenate([[0.0, salary], salary - breakpoints]), 0.0, salary))
+        costs = self.take_home(salary) - self.take_home(salary - corners)
+        return np.interp(net_cost, costs, corners, right=np.nan)
+
+    def optimize_sacrifice(self, salary, retire_tax_band="Basic", employee_pct=5.0,
+                           employer_pct=3.0, with_match=True):
+        """
+        Find the sacrifice from £0 to the whole salary where net withdrawal
+        per £ of take-home pay given up peaks.
+
+        The withdrawal is linear in the sacrifice and the net cost piecewise
+        linear, with corners where salary - sacrifice crosses a tax
+        breakpoint (plus the sacrifice where the employer match is capped).
+        Between corners the ratio is monotone, so the peak is at a corner and
+        only those few sacrifices are evaluated.
+
+        Several sacrifice levels often share the peak (e.g. anything inside
+        the 60% taper); the largest one is reported, i.e. how far you can go
+        at the best rate. Returns the sacrifice_curve() dict over the corners
+        plus 'best' (index), 'best_sacrifice' and 'best_per_pound'.
+        """
+        breakpoints = uk_tax.rules(self.tax_year).breakpoints
+        corners = np.concatenate([[0.0, salary, salary * employee_pct / 100], salary - breakpoints])
+        sacrifices = np.unique(np.clip(corners, 0.0, salary))
+        curve = self.sacrifice_curve(salary, sacrifices, retire_tax_band, employee_pct, employer_pct)
+
+        per_pound = curve['matched_per_pound' if with_match else 'per_pound']
+        peak = np.nanmax(per_pound) if np.isfinite(per_pound).any() else np.nan
+        best = int(np.flatnonzero(per_pound >= peak - 1e-9)[-1]) if np.isfinite(peak) else 0
+
+        curve.update(best=best, best_sacrifice=sacrifices[best], best_per_pound=peak)
+        return curve
+
+    def horizon_matrix(self, current_salary, current_age, horizons=None, growth_rates=None,
+                       retire_tax_band="Basic", employee_pct=5.0, employer_pct=3.0, exact=False):
+        """
+        Net withdrawal of every vehicle after growing for each investment
+        horizon at each (real) growth rate, for £1000 of net pay invested
+        today at current_age.
+
+        Starting pots come from calculate_efficiency. Pots compound in closed
+        form, (1 + g) ** horizon, over the whole horizon x growth grid at once.
+        Withdrawals follow the access rules at current_age + horizon: pensions
+        are NaN before PENSION_ACCESS_AGE and then taxed as in
+        pension_withdrawal, and the LISA pays the early withdrawal charge
+        before LISA_ACCESS_AGE.
+
+        horizons defaults to 1 - 40 years and growth_rates to -2% - 10% in
+        0.25% steps. Returns a dict with 'horizons' (H,), 'growth_rates' (G,),
+        'ages' (H,), 'net_withdrawal' (vehicle, H, G) in VEHICLES order and
+        'best' (H, G), the index of the winning vehicle.
+        """
+        if horizons is None:
+            horizons = np.arange(1, 41)
+        if growth_rates is None:
+            growth_rates = np.linspace(-0.02, 0.10, 49)
+        horizons = np.asarray(horizons, dtype=float)
+        growth_rates = np.asarray(growth_rates, dtype=float)
+
+        results, _, _ = self.calculate_efficiency(current_salary, retire_tax_band,
+                                                  employee_pct, employer_pct, exact)
+        retire_tax = RETIRE_TAX_RATES.get(retire_tax_band, 0.20)
+
+        growth = (1 + growth_rates)[None, :] ** horizons[:, None]  # (H, G)
+        ages = current_age + horizons[:, None]
+        pension_open = ages >= PENSION_ACCESS_AGE
+        lisa_penalty = np.where(ages >= LISA_ACCESS_AGE, 1.0, 1 - LISA_EARLY_CHARGE)
+
+        net = []
+        for vehicle in VEHICLES:
+            pot = results[vehicle]['pot'] * growth
+            if vehicle == 'ISA':
+                net.append(pot)
+            elif vehicle == 'LISA':
+                net.append(pot * lisa_penalty)
+            else:
+                net.append(np.where(pension_open, pension_withdrawal(pot, retire_tax), np.nan))
+        net = np.stack(net)
+
+        return {
+            'horizons': horizons,
+            'growth_rates': growth_rates,
+            'ages': ages[:, 0],
+            'net_withdrawal': net,
+            'best': np.nanargmax(net, axis=0),  # the ISA is always accessible
         }
-        
-        # --- OPTION 5: PENSION (SIPP / Relief at Source) ---
-        if marg_tax < 0.2:
-             # Non-taxpayer relief logic
-            sipp_pot = NET_INVESTMENT / 0.8
-        else:
-            sipp_pot = NET_INVESTMENT / (1 - marg_tax)
-            
-        results['Pension (SIPP)'] = {
-            'pot': sipp_pot,
-            'net_withdrawal': calc_pension_withdrawal(sipp_pot),
-            'label': 'Pension (SIPP)'
+
+    def efficiency_curves(self, salaries=None, employee_pct=5.0, employer_pct=3.0):
+        """
+        Net withdrawal of every vehicle across a salary grid and every
+        retirement tax band, in one vectorized pass.
+
+        salaries defaults to £0 - £200k in £10 steps. Returns a dict with
+        'salaries' (S,), 'bands' (B,), 'marginal_tax' and 'marginal_ni' (S,),
+        'net_withdrawal' (vehicle, band, salary) in VEHICLES order, and
+        'best' (band, salary), the index of the winning vehicle.
+        """
+        if salaries is None:
+            salaries = np.arange(0, 200000 + 10, 10, dtype=float)
+        salaries = np.asarray(salaries, dtype=float)
+        bands = list(RETIRE_TAX_RATES)
+
+        marg_tax, marg_ni = self.get_marginal_rates(salaries)
+        retire_tax = np.array([RETIRE_TAX_RATES[b] for b in bands])[:, None]
+
+        _, net = self.net_withdrawals(marg_tax, marg_ni, retire_tax, employee_pct, employer_pct)
+        net = np.stack([net[v] for v in VEHICLES])
+
+        return {
+            'salaries': salaries,
+            'bands': bands,
+            'marginal_tax': marg_tax,
+            'marginal_ni': marg_ni,
+            'net_withdrawal': net,
+            'best': net.argmax(axis=0),
         }
-        
-        return results, marg_tax, marg_ni
 
 class App(ctk.CTk):
     def __init__(self):
         super().__init__()
         
         self.logic = PensionLogic()
+
+        # Opt-in timing of compute / update / draw (see instrumentation.py)
+        self.tracer = Tracer.from_env("pension_efficiency")
         self.title("Pension Tax Efficiency Calculator")
         self.geometry("1400x800")
         
@@ -193,10 +342,33 @@ class App(ctk.CTk):
         self.chart_frame = ctk.CTkFrame(self.main_frame)
         self.chart_frame.grid(row=1, column=0, sticky="nsew", pady=20)
         
-        self.fig, self.ax = plt.subplots(figsize=(6, 4))
+        # Snapshot at one salary, or the whole salary range as curves / heatmap
+        self.view = ctk.CTkSegmentedButton(self.chart_frame, values=["Snapshot", "Curves", "Heatmap", "Horizon"],
+                                           command=lambda _: self.calculate())
+        self.view.set("Snapshot")
+        self.view.pack(pady=(10, 0))
+
+        # Chart (matplotlib is loaded once the window is on screen)
+        self.chart = None
+        self.chart_mode = None
+        self.colorbar = None
+        startup.after_mapped(self, lambda: startup.load_then(self, startup.CHART_MODULES, self.build_chart))
+
+        # Salary-range results only depend on the match settings
+        self.curves = None
+        self.curves_key = None
+        
+        self.calculate()
+
+    def build_chart(self):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.fig = Figure(figsize=(6, 4))
+        self.ax = self.fig.add_subplot()
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.chart_frame)
         self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
-        
+        self.chart = ChartLayer(self.ax, self.canvas)
         self.calculate()
         
     def create_sidebar_inputs(self):
@@ -206,42 +378,60 @@ class App(ctk.CTk):
         self.entry_salary = ctk.CTkEntry(self.sidebar)
         self.entry_salary.grid(row=2, column=0, padx=20, pady=(5, 10), sticky="ew")
         self.entry_salary.insert(0, "55000")
+
+        # Age (for access ages in the horizon view)
+        self.lbl_age = ctk.CTkLabel(self.sidebar, text="Current Age", anchor="w")
+        self.lbl_age.grid(row=3, column=0, padx=20, pady=(10, 0), sticky="ew")
+        self.entry_age = ctk.CTkEntry(self.sidebar)
+        self.entry_age.grid(row=4, column=0, padx=20, pady=(5, 10), sticky="ew")
+        self.entry_age.insert(0, "30")
         
         # Retirement Tax Band
         self.lbl_retire = ctk.CTkLabel(self.sidebar, text="Expected Retirement Tax Band", anchor="w")
-        self.lbl_retire.grid(row=3, column=0, padx=20, pady=(10, 0), sticky="ew")
+        self.lbl_retire.grid(row=5, column=0, padx=20, pady=(10, 0), sticky="ew")
         self.opt_retire = ctk.CTkOptionMenu(self.sidebar, values=["Basic", "Higher", "Additional", "Zero"])
-        self.opt_retire.grid(row=4, column=0, padx=20, pady=(5, 10), sticky="ew")
+        self.opt_retire.grid(row=6, column=0, padx=20, pady=(5, 10), sticky="ew")
         
         # Workplace Match Section
         self.lbl_match_title = ctk.CTkLabel(self.sidebar, text="Workplace Match Settings", font=ctk.CTkFont(size=14, weight="bold"))
-        self.lbl_match_title.grid(row=5, column=0, padx=20, pady=(20, 5), sticky="w")
+        self.lbl_match_title.grid(row=7, column=0, padx=20, pady=(20, 5), sticky="w")
         
         self.lbl_emp_cont = ctk.CTkLabel(self.sidebar, text="My Contribution (%)", anchor="w")
-        self.lbl_emp_cont.grid(row=6, column=0, padx=20, pady=(5, 0), sticky="ew")
+        self.lbl_emp_cont.grid(row=8, column=0, padx=20, pady=(5, 0), sticky="ew")
         self.entry_emp_cont = ctk.CTkEntry(self.sidebar)
-        self.entry_emp_cont.grid(row=7, column=0, padx=20, pady=(2, 10), sticky="ew")
+        self.entry_emp_cont.grid(row=9, column=0, padx=20, pady=(2, 10), sticky="ew")
         self.entry_emp_cont.insert(0, "5")
         
         self.lbl_employer_cont = ctk.CTkLabel(self.sidebar, text="Employer Match (%)", anchor="w")
-        self.lbl_employer_cont.grid(row=8, column=0, padx=20, pady=(5, 0), sticky="ew")
+        self.lbl_employer_cont.grid(row=10, column=0, padx=20, pady=(5, 0), sticky="ew")
         self.entry_employer_cont = ctk.CTkEntry(self.sidebar)
-        self.entry_employer_cont.grid(row=9, column=0, padx=20, pady=(2, 10), sticky="ew")
+        self.entry_employer_cont.grid(row=11, column=0, padx=20, pady=(2, 10), sticky="ew")
         self.entry_employer_cont.insert(0, "3")
 
+        # Exact sacrifice (integrates tax/NI across band edges instead of one marginal rate)
+        self.chk_exact = ctk.CTkCheckBox(self.sidebar, text="Exact Sacrifice (Across Bands)",
+                                         command=self.calculate)
+        self.chk_exact.grid(row=12, column=0, padx=20, pady=(10, 0), sticky="w")
+
         # Calculate Button
         self.btn_calc = ctk.CTkButton(self.sidebar, text="Calculate ROI", command=self.calculate)
-        self.btn_calc.grid(row=10, column=0, padx=20, pady=20, sticky="ew")
+        self.btn_calc.grid(row=13, column=0, padx=20, pady=20, sticky="ew")
         
         # Info Box
         self.info_box = ctk.CTkTextbox(self.sidebar, height=180)
-        self.info_box.grid(row=11, column=0, padx=20, pady=10, sticky="ew")
+        self.info_box.grid(row=14, column=0, padx=20, pady=10, sticky="ew")
         self.info_box.insert("0.0", "Compares value of £1000 net income sacrificed.\n\nWorkplace Matching:\nAssumes matched portion is added on top of your contribution.")
 
+        # Timings of the last calculation (only when tracing is on)
+        self.lbl_status = None
+        if self.tracer.enabled:
+            self.lbl_status = ctk.CTkLabel(self.sidebar, text="", text_color="gray", justify="left")
+            self.lbl_status.grid(row=15, column=0, padx=20, pady=(0, 10), sticky="w")
+
     def create_results_cards(self):
         self.cards = {}
         # Included 'Workplace (Match)' in list
-        vehicle_list = ['Workplace (Match)', 'Pension (SS)', 'Pension (SIPP)', 'LISA', 'ISA']
+        vehicle_list = VEHICLES
         
         for i, vehicle in enumerate(vehicle_list):
             card = ctk.CTkFrame(self.cards_frame, border_width=2, border_color="#3B8ED0")
@@ -265,16 +455,19 @@ class App(ctk.CTk):
     def calculate(self):
         try:
             salary = float(self.entry_salary.get())
+            age = float(self.entry_age.get())
             emp_pct = float(self.entry_emp_cont.get())
             employer_pct = float(self.entry_employer_cont.get())
         except ValueError:
             return
 
         retire_band = self.opt_retire.get()
+        run = self.tracer.start(self.view.get())
         
-        results, marg_tax, marg_ni = self.logic.calculate_efficiency(
-            salary, retire_band, emp_pct, employer_pct
-        )
+        with run.span("compute"):
+            results, marg_tax, marg_ni = self.logic.calculate_efficiency(
+                salary, retire_band, emp_pct, employer_pct, exact=bool(self.chk_exact.get())
+            )
         
         # Update info
         marg_total = marg_tax + marg_ni
@@ -283,11 +476,19 @@ class App(ctk.CTk):
         self.info_box.insert("end", f"Ded: {marg_total*100:.1f}% (Tx:{marg_tax*100:.0f} NI:{marg_ni*100:.0f})\n")
         
         # Find winner
-        winner = max(results.items(), key=lambda x: x[1]['net_withdrawal'])
+        # (NaN = exact sacrifice larger than the whole salary)
+        winner = max(results.items(), key=lambda x: np.nan_to_num(x[1]['net_withdrawal'], nan=-np.inf))
         self.info_box.insert("end", f"Best: {winner[0]}\n")
+
+        # Best salary sacrifice level (exact mode only: it needs the real net cost)
+        if self.chk_exact.get() and salary > 0:
+            with run.span("compute"):
+                opt = self.logic.optimize_sacrifice(salary, retire_band, emp_pct, employer_pct)
+            self.info_box.insert("end", f"Best sacrifice: £{opt['best_sacrifice']:,.0f} "
+                                        f"(£{opt['best_per_pound']:.2f} per £1 net)\n")
         
         # Update Cards & Plot
-        vehicles = ['Workplace (Match)', 'Pension (SS)', 'Pension (SIPP)', 'LISA', 'ISA']
+        vehicles = VEHICLES
         values = []
         colors = []
         
@@ -298,8 +499,13 @@ class App(ctk.CTk):
             val = res['net_withdrawal']
             roi = (val - base_investment) / base_investment
             
-            self.cards[v]['val'].configure(text=f"£{val:,.0f}")
-            self.cards[v]['roi'].configure(text=f"+{roi*100:.1f}%")
+            # NaN: an exact sacrifice can't reach £1,000 of net pay at this salary
+            if np.isnan(val):
+                self.cards[v]['val'].configure(text="n/a")
+                self.cards[v]['roi'].configure(text="n/a")
+            else:
+                self.cards[v]['val'].configure(text=f"£{val:,.0f}")
+                self.cards[v]['roi'].configure(text=f"+{roi*100:.1f}%")
             
             if v == winner[0]:
                 self.cards[v]['frame'].configure(border_color="#2CC985")
@@ -310,28 +516,129 @@ class App(ctk.CTk):
                 
             values.append(val)
 
-        # Plot
-        self.ax.clear()
-        bars = self.ax.bar(vehicles, values, color=colors)
-        self.ax.set_title("Net Value of £1,000 (Post-Tax Income) Invested")
-        self.ax.set_ylabel("Net Withdrawal (£)")
-        self.ax.axhline(y=1000, color='gray', linestyle='--', label="Original Net Cash")
-        
-        # Wrap labels for the chart axis
-        wrapped_labels = [v.replace(" ", "\n") for v in vehicles]
-        self.ax.set_xticks(range(len(vehicles)))
-        self.ax.set_xticklabels(wrapped_labels, fontsize=9)
-        
-        for bar in bars:
-            height = bar.get_height()
-            self.ax.annotate(f'£{height:.0f}',
-                            xy=(bar.get_x() + bar.get_width() / 2, height),
-                            xytext=(0, 3),
-                            textcoords="offset points",
-                            ha='center', va='bottom')
-                            
-        self.ax.set_ylim(bottom=0, top=max(values)*1.15)
-        self.canvas.draw()
+        # Plot (artists are updated in place)
+        if self.chart is None:
+            return  # cards only; build_chart recalculates
+        view = self.view.get()
+        with run.span("update"):
+            self.start_chart(view)
+            if view == "Curves":
+                self.plot_curves(salary, retire_band, emp_pct, employer_pct)
+            elif view == "Heatmap":
+                self.plot_heatmap(salary, emp_pct, employer_pct)
+            elif view == "Horizon":
+                self.plot_horizon(salary, age, retire_band, emp_pct, employer_pct)
+            else:
+                # Unavailable vehicles (NaN) get an empty bar labelled n/a
+                bars = self.chart.bars("vehicles", np.nan_to_num(values, nan=0.0), colors)
+                self.chart.bar_labels("values", bars, ["n/a" if np.isnan(height) else f'£{height:.0f}'
+                                                       for height in values])
+                self.chart.rescale(x=False, y_floor=0, margin=0.15)
+        with run.span("draw"):
+            self.chart.redraw()
+        timings = run.finish()
+        if self.lbl_status is not None:
+            self.lbl_status.configure(text=timings)
+
+    def get_curves(self, emp_pct, employer_pct):
+        key = (emp_pct, employer_pct)
+        if self.curves_key != key:
+            self.curves = self.logic.efficiency_curves(employee_pct=emp_pct, employer_pct=employer_pct)
+            self.curves_key = key
+        return self.curves
+
+    def plot_curves(self, salary, retire_band, emp_pct, employer_pct):
+        curves = self.get_curves(emp_pct, employer_pct)
+        band = curves['bands'].index(retire_band)
+
+        # Taper (60%) and NI thresholds show up as steps in the pension curves
+        for i, vehicle in enumerate(VEHICLES):
+            self.chart.line(vehicle, curves['salaries'], curves['net_withdrawal'][i, band],
+                            label=vehicle, color=VEHICLE_COLORS[i], linewidth=1.5)
+        self.chart.vline("salary", salary, color='gray', linestyle=':', label="Your Salary")
+        self.chart.text("title", self.ax.title,
+                        f"Net Value of £1,000 Invested by Salary ({retire_band} Rate in Retirement)")
+        self.chart.rescale(margin=0.02)
+
+    def plot_heatmap(self, salary, emp_pct, employer_pct):
+        curves = self.get_curves(emp_pct, employer_pct)
+        salaries = curves['salaries']
+        best = curves['net_withdrawal'].max(axis=0)  # (band, salary)
+
+        step = salaries[1] - salaries[0] if len(salaries) > 1 else 1.0
+        extent = (salaries[0] - step / 2, salaries[-1] + step / 2, -0.5, len(curves['bands']) - 0.5)
+        # Nearest-neighbour keeps the band edges sharp and skips the slow
+        # antialiasing pass over 20k columns on every blit
+        image = self.chart.image("best", best, extent, cmap="viridis", interpolation="nearest",
+                                 vmin=NET_INVESTMENT, vmax=float(best.max()))
+        if self.colorbar is None:
+            self.colorbar = self.fig.colorbar(image, ax=self.ax, label="Best Net Withdrawal (£)")
+        self.chart.vline("salary", salary, color='white', linestyle=':')
+        self.chart.rescale(margin=0)
+
+    def plot_horizon(self, salary, age, retire_band, emp_pct, employer_pct):
+        from matplotlib.colors import ListedColormap
+
+        m = self.logic.horizon_matrix(salary, age, retire_tax_band=retire_band, employee_pct=emp_pct,
+                                      employer_pct=employer_pct, exact=bool(self.chk_exact.get()))
+        horizons, growth = m['horizons'], m['growth_rates']
+
+        dh = horizons[1] - horizons[0] if len(horizons) > 1 else 1.0
+        dg = growth[1] - growth[0] if len(growth) > 1 else 0.01
+        extent = (horizons[0] - dh / 2, horizons[-1] + dh / 2, growth[0] - dg / 2, growth[-1] + dg / 2)
+        image = self.chart.image("winner", m['best'].T, extent, cmap=ListedColormap(VEHICLE_COLORS),
+                                 interpolation="nearest", vmin=-0.5, vmax=len(VEHICLES) - 0.5)
+        if self.colorbar is None:
+            self.colorbar = self.fig.colorbar(image, ax=self.ax, ticks=range(len(VEHICLES)))
+            self.colorbar.ax.set_yticklabels(VEHICLES, fontsize=8)
+
+        # Pensions only become accessible from this horizon on
+        opens = PENSION_ACCESS_AGE - age - dh / 2
+        self.chart.vline("pension access", opens if horizons[0] < opens < horizons[-1] else None,
+                         color='white', linestyle='--')
+        self.chart.text("title", self.ax.title, f"Winning Wrapper by Horizon and Growth (Age {age:.0f} Today)")
+        self.chart.rescale(margin=0)
+
+    def start_chart(self, mode):
+        # Static decorations are set up once per chart type, not on every run
+        if self.chart_mode == mode:
+            return
+        self.chart_mode = mode
+        if self.colorbar is not None:
+            self.colorbar.remove()
+            self.colorbar = None
+        self.chart.reset()
+
+        from matplotlib.ticker import FuncFormatter
+
+        salary_axis = FuncFormatter(lambda x, p: f'£{x/1000:,.0f}k')
+        if mode == "Curves":
+            self.ax.xaxis.set_major_formatter(salary_axis)
+            self.ax.set_xlabel("Gross Salary")
+            self.ax.set_ylabel("Net Withdrawal (£)")
+            self.ax.axhline(y=NET_INVESTMENT, color='gray', linestyle='--', linewidth=0.8)
+            self.ax.grid(True, linestyle='--', alpha=0.5)
+            self.chart.legend(loc='upper left', fontsize=8)
+        elif mode == "Horizon":
+            self.ax.set_xlabel("Investment Horizon (Years)")
+            self.ax.set_ylabel("Real Growth Rate")
+            self.ax.yaxis.set_major_formatter(FuncFormatter(lambda y, p: f'{y:.0%}'))
+        elif mode == "Heatmap":
+            bands = list(RETIRE_TAX_RATES)
+            self.ax.set_title("Best Net Value of £1,000 by Salary and Retirement Tax Band")
+            self.ax.xaxis.set_major_formatter(salary_axis)
+            self.ax.set_xlabel("Gross Salary")
+            self.ax.set_yticks(range(len(bands)))
+            self.ax.set_yticklabels(bands)
+        else:
+            self.ax.set_title("Net Value of £1,000 (Post-Tax Income) Invested")
+            self.ax.set_ylabel("Net Withdrawal (£)")
+            self.ax.axhline(y=NET_INVESTMENT, color='gray', linestyle='--', label="Original Net Cash")
+
+            # Wrap labels for the chart axis
+            wrapped_labels = [v.replace(" ", "\n") for v in VEHICLES]
+            self.ax.set_xticks(range(len(VEHICLES)))
+            self.ax.set_xticklabels(wrapped_labels, fontsize=9)
 
 if __name__ == "__main__":
     app = App()
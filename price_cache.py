@@ -0,0 +1,249 @@
+"""
+On-disk daily price store, one file per ticker.
+
+Prices come from a provider (price_providers.py) already reduced to two
+arrays, trading dates (datetime64[D]) and prices (float64). Any date range
+is then served by slicing those arrays.
+
+Each ticker file also records the span of dates already asked of the data
+source. A request inside that span makes no network call. A request reaching
+past it downloads only the missing days: the tail from the last stored
+trading day (refetched, since it may have been a partial day), or the head
+before the first one. The last day is re-checked at most once a day.
+
+    cache = PriceCache()
+    dates, prices = cache.get("^GSPC", "2015-01-01", "2025-01-01")
+
+PriceCache.from_env() uses the provider chosen by FINANCE_PRICE_SOURCE. Only
+downloaded prices are written to disk; local files and synthetic prices are
+kept in memory.
+"""
+
+import os
+import threading
+import urllib.parse
+from datetime import datetime
+
+import numpy as np
+
+import price_providers
+from instrumentation import NULL_RUN
+from price_providers import download_yfinance
+
+PRICE_DIR = os.environ.get("FINANCE_PRICE_DIR",
+                           os.path.join(os.path.expanduser("~"), ".cache", "finance", "prices"))
+
+DAY = np.timedelta64(1, "D")
+
+
+def as_day(value):
+    """A date, datetime, string or datetime64 as datetime64[D]."""
+    if isinstance(value, datetime):
+        value = value.date()
+    return np.datetime64(value, "D")
+
+
+# =========================
+# Store
+# =========================
+
+class PriceCache:
+    def __init__(self, directory=PRICE_DIR, fetch=download_yfinance, fetch_many=None):
+        """
+        directory  - where the per-ticker files live (None: memory only)
+        fetch      - fetch(ticker, start, end) -> (dates, prices) for [start, end)
+        fetch_many - fetch_many(tickers, start, end) -> {ticker: (dates, prices)},
+                     one batched request for prefetch() (default: fetch each)
+        """
+        self.directory = directory
+        self.fetch = fetch
+        self.fetch_many = fetch_many or (lambda tickers, start, end:
+                                         {ticker: fetch(ticker, start, end) for ticker in tickers})
+
+        self._series = {}  # ticker -> dict of arrays, as stored on disk
+        self._locks = {}
+        self._lock = threading.Lock()
+
+        # Counters
+        self.downloads = 0
+        self.hits = 0
+
+    @classmethod
+    def from_env(cls):
+        provider = price_providers.from_env()
+        return cls(PRICE_DIR if provider.remote else None, provider.fetch, provider.fetch_many)
+
+    def _ticker_lock(self, ticker):
+        with self._lock:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _path(self, ticker):
+        return os.path.join(self.directory, urllib.parse.quote(ticker, safe="") + ".npz")
+
+    # --- Disk ---
+
+    def _load(self, ticker):
+        series = self._series.get(ticker)
+        if series is None and self.directory is not None:
+            try:
+                with np.load(self._path(ticker)) as f:
+                    series = {name: f[name] for name in f.files}
+            except (OSError, ValueError):
+                series = None
+            self._series[ticker] = series
+        return series
+
+    def _save(self, ticker, series):
+        self._series[ticker] = series
+        if self.directory is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(ticker)
+        temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp.npz"
+        np.savez(temp, **series)
+        os.replace(temp, path)
+
+    # --- Reading ---
+
+    def missing(self, ticker, start, end, today=None):
+        """The [start, end) ranges get() would have to download, as a list of pairs."""
+        start, end = as_day(start), as_day(end)
+        today = as_day(today or datetime.now())
+        series = self._load(ticker)
+        if series is None or not len(series["dates"]):
+            return [(start, end)]
+
+        ranges = []
+        if start < series["checked_from"]:
+            ranges.append((start, series["checked_from"]))
+        # Everything before checked_until was asked for already. If that reached
+        # the day of the check, nothing newer can exist until a later day
+        up_to_date = series["checked_until"] > series["checked_on"] and today <= series["checked_on"]
+        if end > series["checked_until"] and not up_to_date:
+            # From the last stored day on, as it may have been a partial day
+            ranges.append((min(series["dates"][-1], end - DAY), end))
+        return ranges
+
+    def get(self, ticker, start, end, run=NULL_RUN):
+        """
+        (dates, prices) of the trading days in [start, end), downloading only
+        what is not stored yet. run receives load / fetch / parse spans.
+        """
+        start, end = as_day(start), as_day(end)
+        with self._ticker_lock(ticker):
+            with run.span("load"):
+                ranges = self.missing(ticker, start, end)
+            if ranges:
+                self._update(ticker, ranges, run)
+            else:
+                self.hits += 1
+
+            with run.span("load"):
+                series = self._series[ticker]
+                dates = series["dates"]
+                lo, hi = np.searchsorted(dates, [start, end])
+                return dates[lo:hi], series["prices"][lo:hi]
+
+    def _update(self, ticker, ranges, run):
+        new = []
+        for lo, hi in ranges:
+            with run.span("fetch"):
+                new.append(self.fetch(ticker, lo, hi))
+                self.downloads += 1
+        self._merge(ticker, ranges, new, run)
+
+    def _merge(self, ticker, ranges, new, run):
+        with run.span("parse"):
+            old = self._series.get(ticker)
+            if old is not None:
+                new.append((old["dates"], old["prices"]))  # last, so downloaded days win
+
+            dates = np.concatenate([d.astype("datetime64[D]") for d, _ in new])
+            prices = np.concatenate([np.asarray(p, dtype=float) for _, p in new])
+            dates, first = np.unique(dates, return_index=True)
+            series = {
+                "dates": dates,
+                "prices": prices[first],
+                "checked_from": min([lo for lo, _ in ranges] + ([old["checked_from"]] if old else [])),
+                "checked_until": max([hi for _, hi in ranges] + ([old["checked_until"]] if old else [])),
+                "checked_on": as_day(datetime.now()),
+            }
+            series = {name: np.asarray(value) for name, value in series.items()}
+            self._save(ticker, series)
+
+    # --- Prefetching ---
+
+    def prefetch(self, tickers, start, end, progress=None):
+        """
+        Bring several tickers up to date for [start, end) on a background
+        thread, with one batched download per missing range. A get() for a
+        ticker that is still loading waits for it instead of downloading it
+        again. progress(done, total, failed) is called from that thread as
+        tickers finish. Returns the thread.
+        """
+        thread = threading.Thread(target=self._prefetch, daemon=True,
+                                  args=(list(dict.fromkeys(tickers)), as_day(start), as_day(end), progress))
+        thread.start()
+        return thread
+
+    def _prefetch(self, tickers, start, end, progress):
+        done, failed = [], []
+
+        def finished(ticker, ok=True):
+            (done if ok else failed).append(ticker)
+            if progress is not None:
+                progress(len(done) + len(failed), len(tickers), list(failed))
+
+        # Tickers missing the same days share a download
+        groups = {}
+        for ticker in tickers:
+            ranges = self.missing(ticker, start, end)
+            if ranges:
+                groups.setdefault(tuple(ranges), []).append(ticker)
+            else:
+                finished(ticker)
+
+        for ranges, group in groups.items():
+            # Locked in a fixed order, so two prefetches cannot deadlock
+            locks = {ticker: self._ticker_lock(ticker) for ticker in sorted(group)}
+            for lock in locks.values():
+                lock.acquire()
+            try:
+                # A get() may have loaded some of them in the meantime
+                for ticker in [ticker for ticker in locks if not self.missing(ticker, start, end)]:
+                    locks.pop(ticker).release()
+                    finished(ticker)
+                if not locks:
+                    continue
+
+                batches = []
+                for lo, hi in ranges:
+                    batches.append(self.fetch_many(list(locks), lo, hi))
+                    self.downloads += 1
+                for ticker in list(locks):
+                    self._merge(ticker, list(ranges), [batch[ticker] for batch in batches], NULL_RUN)
+                    locks.pop(ticker).release()
+                    finished(ticker, ok=len(self._series[ticker]["dates"]) > 0)
+            except Exception:
+                for ticker in locks:
+                    finished(ticker, ok=False)
+            finally:
+                for lock in locks.values():
+                    lock.release()
+
+    def clear(self, ticker=None):
+        """Forget one ticker (or every ticker), on disk too."""
+        if ticker is None:
+            tickers = set(self._series)
+            if self.directory is not None and os.path.isdir(self.directory):
+                tickers.update(urllib.parse.unquote(name[:-len(".npz")])
+                               for name in os.listdir(self.directory) if name.endswith(".npz"))
+        else:
+            tickers = {ticker}
+        for name in tickers:
+            self._series.pop(name, None)
+            if self.directory is not None and os.path.exists(self._path(name)):
+                os.remove(self._path(name))
+
+    def status_text(self):
+        return f"prices: {self.hits} cached, {self.downloads} downloads"
@@ -0,0 +1,317 @@
+"""
+Where daily prices come from.
+
+Every provider has fetch(ticker, start, end) -> (dates, prices): the trading
+days in [start, end) as datetime64[D] and one float price per day. PriceCache
+calls it for the days it has not stored yet, and fetch_many(tickers, start,
+end) -> {ticker: (dates, prices)} to load several tickers at once.
+
+    yfinance   - Yahoo Finance (the default; needs the network)
+    local      - one CSV or Parquet file per ticker in a directory
+    synthetic  - seeded geometric Brownian motion on an exchange calendar
+
+The backtester picks one with environment variables:
+
+    FINANCE_PRICE_SOURCE=local FINANCE_PRICE_FILES=fixtures/   read fixtures/^GSPC.csv, ...
+    FINANCE_PRICE_SOURCE=synthetic FINANCE_PRICE_SEED=7        reproducible made-up prices
+
+A fixture directory for offline runs can be filled from any source:
+
+    python price_providers.py fixtures/ ^GSPC ^FTSE --years 30 --source yfinance
+"""
+
+import argparse
+import functools
+import os
+import sys
+import threading
+import urllib.parse
+import zlib
+from datetime import datetime, timedelta
+
+import numpy as np
+
+SOURCES = ("yfinance", "local", "synthetic")
+
+
+def _empty():
+    return np.empty(0, dtype="datetime64[D]"), np.empty(0)
+
+
+def _slice(dates, prices, start, end):
+    lo, hi = np.searchsorted(dates, [np.datetime64(start, "D"), np.datetime64(end, "D")])
+    return dates[lo:hi], prices[lo:hi]
+
+
+# =========================
+# yfinance
+# =========================
+
+def normalise(df):
+    """
+    (dates, prices) from a yfinance download or a price file: 'Adj Close'
+    when present, otherwise 'Close', otherwise the first column; the first
+    ticker if there are several; NaNs dropped.
+    """
+    import pandas as pd
+
+    if df is None or df.empty:
+        return _empty()
+
+    # Determine price column (Adj Close preferred, fallback to Close)
+    # Check if using MultiIndex or flat index
+    if isinstance(df.columns, pd.MultiIndex):
+        price_col = 'Adj Close' if 'Adj Close' in df.columns.get_level_values(0) else 'Close'
+        df = df.xs(price_col, axis=1, level=0, drop_level=True)
+    elif 'Adj Close' in df.columns or 'Close' in df.columns:
+        price_col = 'Adj Close' if 'Adj Close' in df.columns else 'Close'
+        df = df[[price_col]]
+
+    # Take the first column regardless of name (yfinance sometimes labels it with the ticker)
+    series = df.iloc[:, 0].dropna()
+
+    index = series.index
+    if getattr(index, "tz", None) is not None:
+        index = index.tz_localize(None)
+    return index.values.astype("datetime64[D]"), series.to_numpy(dtype=float)
+
+
+class YFinanceProvider:
+    name = "yfinance"
+    remote = True  # worth keeping a copy on disk
+
+    def fetch(self, ticker, start, end):
+        """Daily prices for [start, end) from Yahoo Finance."""
+        import yfinance as yf
+
+        df = yf.download(ticker, start=str(start), end=str(end), progress=False)
+        return normalise(df)
+
+    def fetch_many(self, tickers, start, end):
+        """Several tickers in one download (yfinance fetches them in parallel)."""
+        import yfinance as yf
+
+        df = yf.download(list(tickers), start=str(start), end=str(end), progress=False,
+                         group_by="ticker", threads=True)
+        top = set(df.columns.get_level_values(0)) if df.columns.nlevels > 1 else set()
+        # A ticker that failed is missing or all NaN, and comes back empty
+        return {ticker: normalise(df[ticker] if ticker in top else None) for ticker in tickers}
+
+
+def download_yfinance(ticker, start, end):
+    return YFinanceProvider().fetch(ticker, start, end)
+
+
+# =========================
+# Local files
+# =========================
+
+class DirectoryProvider:
+    name = "local"
+    remote = False
+
+    def __init__(self, directory):
+        """
+        directory - holds <ticker>.csv or <ticker>.parquet per ticker: a date
+                    column first, then 'Adj Close' or 'Close' (or just one
+                    price column). '^GSPC.csv' and the quoted
+                    '%5EGSPC.csv' (as store() writes it) are both found.
+        """
+        self.directory = directory
+        self._files = {}  # path -> (mtime, dates, prices)
+        self._lock = threading.Lock()
+
+    def path(self, ticker, extension=".csv"):
+        """Where store() writes ticker."""
+        return os.path.join(self.directory, urllib.parse.quote(ticker, safe="") + extension)
+
+    def find(self, ticker):
+        """The ticker's existing file, or None."""
+        for extension in (".csv", ".parquet"):
+            for name in (urllib.parse.quote(ticker, safe=""), ticker):
+                path = os.path.join(self.directory, name + extension)
+                if os.path.exists(path):
+                    return path
+        return None
+
+    def fetch(self, ticker, start, end):
+        path = self.find(ticker)
+        if path is None:
+            raise FileNotFoundError(f"No price file for {ticker} in {self.directory}")
+        return _slice(*self._read(path), start, end)
+
+    def fetch_many(self, tickers, start, end):
+        # Files are local, so one after another; a ticker without a file comes back empty
+        return {ticker: self.fetch(ticker, start, end) if self.find(ticker) else _empty()
+                for ticker in tickers}
+
+    def _read(self, path):
+        # Whole files are read once and kept; a file changed on disk is read again
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            cached = self._files.get(path)
+            if cached is None or cached[0] != mtime:
+                import pandas as pd
+
+                if path.endswith(".parquet"):
+                    df = pd.read_parquet(path)
+                    if not isinstance(df.index, pd.DatetimeIndex):
+                        df = df.set_index(df.columns[0])
+                else:
+                    df = pd.read_csv(path, index_col=0, float_precision="round_trip")
+                df.index = pd.to_datetime(df.index)
+                dates, prices = normalise(df.sort_index())
+                cached = self._files[path] = (mtime, dates, prices)
+        return cached[1], cached[2]
+
+    def store(self, ticker, dates, prices, extension=".csv"):
+        """Write a ticker's prices as a fixture file; returns the path."""
+        import pandas as pd
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(ticker, extension)
+        df = pd.DataFrame({"Close": np.asarray(prices, dtype=float)},
+                          index=pd.DatetimeIndex(np.asarray(dates, dtype="datetime64[D]"), name="Date"))
+        if extension == ".parquet":
+            df.to_parquet(path)
+        else:
+            df.to_csv(path)
+        return path
+
+
+# =========================
+# Synthetic
+# =========================
+
+# Exchange holidays, so synthetic series skip the same days real data does
+CALENDARS = {"^FTSE": "LSE"}
+
+
+def calendar_of(ticker):
+    """'LSE' for London listings, 'NYSE' for everything else."""
+    return CALENDARS.get(ticker, "LSE" if ticker.endswith(".L") else "NYSE")
+
+
+@functools.lru_cache(maxsize=None)
+def _holiday_calendar(exchange):
+    from pandas.tseries import holiday as h
+
+    if exchange == "LSE":
+        rules = [
+            h.Holiday("New Year's Day", month=1, day=1, observance=h.next_monday),
+            h.GoodFriday,
+            h.EasterMonday,
+            h.Holiday("Early May", month=5, day=1, offset=h.DateOffset(weekday=h.MO(1)), start_date="1978-01-01"),
+            h.Holiday("Spring", month=5, day=31, offset=h.DateOffset(weekday=h.MO(-1))),
+            h.Holiday("Summer", month=8, day=31, offset=h.DateOffset(weekday=h.MO(-1))),
+            h.Holiday("Christmas", month=12, day=25, observance=h.next_monday),
+            h.Holiday("Boxing Day", month=12, day=26, observance=h.next_monday_or_tuesday),
+        ]
+    else:
+        rules = [
+            h.Holiday("New Year's Day", month=1, day=1, observance=h.sunday_to_monday),
+            h.USMartinLutherKingJr,
+            h.USPresidentsDay,
+            h.GoodFriday,
+            h.USMemorialDay,
+            h.Holiday("Juneteenth", month=6, day=19, observance=h.nearest_workday, start_date="2022-01-01"),
+            h.Holiday("Independence Day", month=7, day=4, observance=h.nearest_workday),
+            h.USLaborDay,
+            h.USThanksgivingDay,
+            h.Holiday("Christmas", month=12, day=25, observance=h.nearest_workday),
+        ]
+    return h.AbstractHolidayCalendar(name=exchange, rules=rules)
+
+
+@functools.lru_cache(maxsize=None)
+def trading_days(exchange, first, last):
+    """Weekdays from first to last (inclusive years) that are not holidays, as datetime64[D]."""
+    start, end = f"{first}-01-01", f"{last}-12-31"
+    holidays = _holiday_calendar(exchange).holidays(start, end).values.astype("datetime64[D]")
+    days = np.arange(start, f"{last + 1}-01-01", dtype="datetime64[D]")
+    return days[np.is_busday(days, holidays=holidays)]
+
+
+class SyntheticProvider:
+    name = "synthetic"
+    remote = False
+
+    # Every series starts at 100 on the first trading day of FIRST_YEAR; a
+    # ticker's path is fixed by (seed, ticker), whatever range is asked for
+    FIRST_YEAR = 1970
+    LAST_YEAR = 2100
+
+    def __init__(self, seed=0, drift=0.07, volatility=0.18):
+        self.seed = seed
+        self.drift = drift
+        self.volatility = volatility
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, ticker, start, end):
+        return _slice(*self.series(ticker), start, end)
+
+    def fetch_many(self, tickers, start, end):
+        return {ticker: self.fetch(ticker, start, end) for ticker in tickers}
+
+    def series(self, ticker):
+        """The ticker's whole synthetic history: (dates, prices)."""
+        with self._lock:
+            series = self._series.get(ticker)
+            if series is None:
+                dates = trading_days(calendar_of(ticker), self.FIRST_YEAR, self.LAST_YEAR)
+                rng = np.random.default_rng([self.seed, zlib.crc32(ticker.encode())])
+                dt = 1 / 252
+                steps = rng.normal((self.drift - self.volatility ** 2 / 2) * dt,
+                                   self.volatility * np.sqrt(dt), len(dates))
+                steps[0] = 0.0
+                series = self._series[ticker] = (dates, 100.0 * np.exp(np.cumsum(steps)))
+        return series
+
+
+# =========================
+# Configuration
+# =========================
+
+def make_provider(source="yfinance", files=None, seed=0):
+    """A provider by name (see SOURCES)."""
+    if source == "yfinance":
+        return YFinanceProvider()
+    if source == "local":
+        if not files:
+            raise ValueError("the local price source needs a directory (FINANCE_PRICE_FILES)")
+        return DirectoryProvider(files)
+    if source == "synthetic":
+        return SyntheticProvider(seed=int(seed))
+    raise ValueError(f"unknown price source {source!r} (expected one of {', '.join(SOURCES)})")
+
+
+def from_env():
+    return make_provider(os.environ.get("FINANCE_PRICE_SOURCE") or "yfinance",
+                         files=os.environ.get("FINANCE_PRICE_FILES") or None,
+                         seed=os.environ.get("FINANCE_PRICE_SEED") or 0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write price fixture files for offline runs.")
+    parser.add_argument("directory", help="fixture directory to write to")
+    parser.add_argument("tickers", nargs="+")
+    parser.add_argument("--years", type=float, default=30)
+    parser.add_argument("--source", choices=[s for s in SOURCES if s != "local"], default="yfinance")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic source seed")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    args = parser.parse_args(argv)
+
+    source = make_provider(args.source, seed=args.seed)
+    fixtures = DirectoryProvider(args.directory)
+    end = datetime.now().date() + timedelta(days=1)
+    start = end - timedelta(days=int(args.years * 365))
+    for ticker in args.tickers:
+        dates, prices = source.fetch(ticker, start, end)
+        path = fixtures.store(ticker, dates, prices, "." + args.format)
+        print(f"{ticker}: {len(dates)} days -> {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
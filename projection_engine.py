@@ -0,0 +1,562 @@
+"""
+Headless, batched version of the net worth projection in Portfolio_GUI.py.
+
+Every scenario in a batch is moved forward together, one year per vectorized
+step, so thousands of parameter sets cost roughly the same number of Python
+operations as a single one.
+"""
+
+import numpy as np
+
+import uk_tax
+from ledger import Ledger
+
+# Fiscal rules (same values the GUI uses)
+STATE_PENSION_AGE = 67
+STATE_PENSION_AMOUNT = 12000
+PENSION_ACCESS_AGE = 57
+LISA_ACCESS_AGE = 60
+
+# Inputs understood by the engine, with the GUI defaults
+PARAM_DEFAULTS = {
+    "base_salary": 32000,
+    "years": 40,
+    "start_age": 22,
+    "growth_rate": 0.06,
+    "inflation": 0.03,
+    "retire_age": 60,
+    "retire_income": 25000,
+    "pension_base": 2000,
+    "isa_base": 20000,
+    "cash_base": 11000,
+    "lisa_base": 0,
+    "pension_rate": 0.08,
+    "isa_rate": 0.11,
+    "cash_rate": 0.045,
+    "lisa_rate": 0.07,
+    "pension_employee_rate": 0.05,
+    "pension_employer_rate": 0.10,
+    "isa_contribution_rate": 0.15,
+    "lisa_max_contribution": 4000,
+    "lisa_bonus_rate": 0.25,
+    "property_price_start": 170000,
+    "deposit_rate": 0.10,
+    "house_price_growth": 0.05,
+    "mortgage_rate": 0.045,
+    "mortgage_term": 30,
+}
+
+# Per-year series produced for every scenario
+SERIES = (
+    "nominal_salary", "real_salary", "net_salary",
+    "pension", "isa", "cash", "lisa",
+    "house_price", "property_value", "mortgage_balance", "home_equity",
+    "net_worth", "shortfall",
+)
+
+# Series that carry state from one year to the next. Any result that recorded
+# these doubles as a set of per-year checkpoints (see simulate's resume_from).
+STATE_SERIES = (
+    "nominal_salary", "real_salary",
+    "pension", "isa", "cash", "lisa",
+    "house_price", "property_value", "mortgage_balance",
+)
+
+# Inputs that may vary year by year (see simulate's rate_paths)
+TIME_VARYING = (
+    "pension_rate", "isa_rate", "cash_rate", "lisa_rate",
+    "inflation", "house_price_growth",
+)
+
+
+def as_batch(params):
+    """
+    Normalise parameters into a dict of equal-length float arrays.
+
+    Accepts either a mapping of name -> scalar/array (broadcast together) or a
+    sequence of mappings (one per scenario). Missing names take the defaults.
+    """
+    if not hasattr(params, "keys"):
+        rows = list(params)
+        params = {key: [row.get(key, default) for row in rows]
+                  for key, default in PARAM_DEFAULTS.items()}
+
+    unknown = set(params) - set(PARAM_DEFAULTS)
+    if unknown:
+        raise KeyError(f"Unknown projection parameters: {sorted(unknown)}")
+
+    arrays = [np.asarray(params.get(key, default), dtype=float)
+              for key, default in PARAM_DEFAULTS.items()]
+    arrays = np.broadcast_arrays(*[np.atleast_1d(a) for a in arrays])
+    return {key: np.array(a, dtype=float) for key, a in zip(PARAM_DEFAULTS, arrays)}
+
+
+def net_pay(gross, pension_rate=0.05):
+    """
+    Vectorized take-home pay (see uk_tax).
+    Pension contribution is treated as salary sacrifice.
+    """
+    return uk_tax.net_pay(gross, pension_rate)
+
+
+def horizon(p):
+    """Number of simulated years (including year 0) shared by a batch."""
+    years = np.unique(np.trunc(p["years"]))
+    if len(years) != 1:
+        raise ValueError("All scenarios in a batch must share the same 'years'")
+    return max(int(years[0]), 1)
+
+
+def _initial_row(p):
+    start_age = np.trunc(p["start_age"])
+    zeros = np.zeros_like(p["base_salary"])
+    row = {
+        "nominal_salary": p["base_salary"].copy(),
+        "real_salary": p["base_salary"].copy(),
+        "net_salary": net_pay(p["base_salary"], p["pension_employee_rate"]),
+        "pension": p["pension_base"].copy(),
+        "isa": p["isa_base"].copy(),
+        "cash": p["cash_base"].copy(),
+        "lisa": p["lisa_base"].copy(),
+        "house_price": p["property_price_start"].copy(),
+        "property_value": zeros.copy(),
+        "mortgage_balance": zeros.copy(),
+        "home_equity": zeros.copy(),
+        "shortfall": zeros.copy(),
+    }
+    row["net_worth"] = row["pension"] + row["isa"] + row["cash"] + row["lisa"]
+    return start_age, row
+
+
+def _step(p, prev, year, house_bought, mortgage_payment):
+    """
+    Advance every scenario from `prev` (year - 1) to `year`.
+    Returns the new row; house_bought/mortgage_payment are updated in place.
+    """
+    inflation = p["inflation"]
+    current_age = np.trunc(p["start_age"]) + year
+    is_retired = current_age >= np.trunc(p["retire_age"])
+    working = ~is_retired
+
+    # --- Returns & Growth (Before Cashflows) ---
+    pen_growth = prev["pension"] * (1 + p["pension_rate"] - inflation)
+    isa_growth = prev["isa"] * (1 + p["isa_rate"] - inflation)
+    cash_growth = prev["cash"] * (1 + p["cash_rate"] - inflation)
+    lisa_growth = prev["lisa"] * (1 + p["lisa_rate"] - inflation)
+
+    # --- Cashflows (zero once retired) ---
+    nominal_salary = np.where(working, prev["nominal_salary"] * (1 + p["growth_rate"]), 0.0)
+    real_salary = np.where(working, prev["real_salary"] * (1 + p["growth_rate"] - inflation), 0.0)
+    net_salary = np.where(working, net_pay(real_salary, p["pension_employee_rate"]), 0.0)
+
+    pen_contrib = (p["pension_employee_rate"] + p["pension_employer_rate"]) * real_salary
+    isa_contrib = p["isa_contribution_rate"] * net_salary
+
+    lisa_open = working & ~house_bought
+    lisa_contrib = np.where(lisa_open, np.minimum(p["lisa_max_contribution"], 0.2 * net_salary), 0.0)
+    lisa_bonus = lisa_contrib * p["lisa_bonus_rate"]
+
+    # --- Drawdown waterfall (If Retired) ---
+    required = np.where(is_retired, p["retire_income"], 0.0)
+    remaining_need = np.where(current_age >= STATE_PENSION_AGE,
+                              np.maximum(0, required - STATE_PENSION_AMOUNT), required)
+
+    pension_open = current_age >= PENSION_ACCESS_AGE
+    lisa_drawable = pension_open & (current_age >= LISA_ACCESS_AGE)
+
+    # 1. Pension (>= 57), 2. LISA (>= 60), 3. ISA, 4. Cash
+    pen_withdraw = np.where(pension_open, np.minimum(remaining_need, pen_growth), 0.0)
+    remaining_need = remaining_need - pen_withdraw
+    lisa_withdraw = np.where(lisa_drawable, np.minimum(remaining_need, lisa_growth), 0.0)
+    remaining_need = remaining_need - lisa_withdraw
+    isa_withdraw = np.minimum(remaining_need, isa_growth)
+    remaining_need = remaining_need - isa_withdraw
+    cash_withdraw = np.minimum(remaining_need, cash_growth)
+    remaining_need = remaining_need - cash_withdraw
+    # Home equity is intentionally NOT accessed; what is left is a shortfall.
+
+    # --- Apply Changes ---
+    row = {
+        "nominal_salary": nominal_salary,
+        "real_salary": real_salary,
+        "net_salary": net_salary,
+        "pension": np.maximum(0, pen_growth + pen_contrib - pen_withdraw),
+        "isa": np.maximum(0, isa_growth + isa_contrib - isa_withdraw),
+        "cash": np.maximum(0, cash_growth - cash_withdraw),
+        "lisa": np.maximum(0, lisa_growth + lisa_contrib + lisa_bonus - lisa_withdraw),
+        "shortfall": remaining_need,
+    }
+
+    # ---------- PROPERTY ----------
+    house_growth = 1 + p["house_price_growth"] - inflation
+    mortgage_rate_real = (1 + p["mortgage_rate"]) / (1 + inflation) - 1
+
+    current_house_price = prev["house_price"] * house_growth
+    deposit_required = current_house_price * p["deposit_rate"]
+    buying = ~house_bought & (row["lisa"] >= deposit_required)
+
+    initial_mortgage = current_house_price - deposit_required
+    grown_property = prev["property_value"] * house_growth
+    repaid_mortgage = np.maximum(0, prev["mortgage_balance"] * (1 + mortgage_rate_real) - mortgage_payment)
+
+    row["house_price"] = current_house_price
+    row["property_value"] = np.where(buying, current_house_price,
+                                     np.where(house_bought, grown_property, 0.0))
+    row["mortgage_balance"] = np.where(buying, initial_mortgage,
+                                       np.where(house_bought, repaid_mortgage, 0.0))
+    row["home_equity"] = np.where(buying, deposit_required,
+                                  np.where(house_bought, row["property_value"] - row["mortgage_balance"], 0.0))
+    row["lisa"] = np.where(buying, row["lisa"] - deposit_required, row["lisa"])
+
+    term = p["mortgage_term"]
+    payment = np.divide(initial_mortgage, term, out=initial_mortgage.copy(), where=term > 0)
+    mortgage_payment[buying] = payment[buying]
+    house_bought |= buying
+
+    row["net_worth"] = row["pension"] + row["isa"] + row["cash"] + row["lisa"] + row["home_equity"]
+    return row, buying
+
+
+def simulate(params, rate_paths=None, record=SERIES, resume_from=None, resume_year=0):
+    """
+    Run a batch of projections.
+
+    rate_paths optionally maps names in TIME_VARYING to (scenarios x years)
+    arrays that replace the fixed rate for each simulated year. record limits
+    which series are stored (useful for large batches).
+
+    resume_from takes an earlier result for the same scenarios: years up to
+    and including resume_year are copied from it and only the later years are
+    simulated. The caller is responsible for the parameter changes not
+    affecting anything up to resume_year.
+
+    Returns a Ledger with one (scenarios x years) column per recorded series,
+    plus 'ages' (scenarios x years), 'purchase_year' (-1 if never bought) and
+    'mortgage_payment' per scenario.
+    """
+    p = as_batch(params)
+    years = horizon(p)
+    n = len(p["base_salary"])
+
+    rate_paths = rate_paths or {}
+    unknown = set(rate_paths) - set(TIME_VARYING)
+    if unknown:
+        raise KeyError(f"Rates that cannot vary by year: {sorted(unknown)}")
+    rate_paths = {key: np.broadcast_to(np.asarray(path, dtype=float), (n, years))
+                  for key, path in rate_paths.items()}
+
+    result = Ledger(record, (n, years))
+    start_age, row = _initial_row(p)
+
+    if resume_from is None:
+        resume_year = 0
+        result.set_year(0, row)
+        house_bought = np.zeros(n, dtype=bool)
+        mortgage_payment = np.zeros(n)
+        purchase_year = np.full(n, -1)
+    else:
+        resume_year = min(resume_year, years - 1)
+        missing = (set(record) | set(STATE_SERIES)) - set(resume_from)
+        if missing:
+            raise ValueError(f"Cannot resume: checkpoint lacks {sorted(missing)}")
+        for name in record:
+            result[name][:, :resume_year + 1] = resume_from[name][:, :resume_year + 1]
+        row = {name: resume_from[name][:, resume_year] for name in STATE_SERIES}
+        house_bought = (resume_from["purchase_year"] >= 0) & (resume_from["purchase_year"] <= resume_year)
+        mortgage_payment = np.where(house_bought, resume_from["mortgage_payment"], 0.0)
+        purchase_year = np.where(house_bought, resume_from["purchase_year"], -1)
+
+    p_year = dict(p)
+    for year in range(resume_year + 1, years):
+        for key, path in rate_paths.items():
+            p_year[key] = path[:, year]
+        row, buying = _step(p_year, row, year, house_bought, mortgage_payment)
+        purchase_year[buying] = year
+        result.set_year(year, row)
+
+    result["ages"] = start_age[:, None] + np.arange(years)
+    result["purchase_year"] = purchase_year
+    result["mortgage_payment"] = mortgage_payment
+    return result
+
+
+# Inputs that already shape year 0 (everything must be re-run)
+YEAR_ZERO_INPUTS = (
+    "base_salary", "pension_employee_rate",
+    "pension_base", "isa_base", "cash_base", "lisa_base",
+    "property_price_start",
+)
+
+
+class IncrementalProjector:
+    """
+    Keeps the last result and re-simulates only from the first year a
+    parameter change can affect (e.g. moving retire_age from 60 to 61 leaves
+    every year before age 60 untouched).
+    """
+
+    def __init__(self):
+        self.params = None
+        self.result = None
+        self.last_resume_year = None  # None = last run started from scratch
+
+    def first_affected_year(self, p):
+        """Earliest year index whose values can differ between the last run and `p`."""
+        old = self.params
+        if old is None or len(old["base_salary"]) != len(p["base_salary"]):
+            return 0
+
+        # Years past the old horizon are always new
+        first = min(horizon(old), horizon(p))
+        start_age = np.trunc(p["start_age"])
+        purchase_year = self.result["purchase_year"]
+        bought = purchase_year >= 0
+
+        for key in PARAM_DEFAULTS:
+            if key == "years" or np.array_equal(old[key], p[key]):
+                continue
+            if key in YEAR_ZERO_INPUTS:
+                return 0
+            if key == "retire_age":
+                # Retirement status only changes from the earlier of the two ages
+                year = np.minimum(np.trunc(old[key]), np.trunc(p[key])) - start_age
+            elif key == "retire_income":
+                year = np.trunc(p["retire_age"]) - start_age
+            elif key == "mortgage_rate":
+                # Only used to roll the balance forward after the purchase
+                year = np.where(bought, purchase_year + 1, first)
+            elif key == "mortgage_term":
+                # Fixes the payment in the purchase year
+                year = np.where(bought, purchase_year, first)
+            else:
+                year = 1
+            first = min(first, max(int(np.min(year)), 1))
+        return first
+
+    def run(self, params):
+        p = as_batch(params)
+        first = self.first_affected_year(p)
+
+        if first <= 0:
+            self.last_resume_year = None
+            result = simulate(p)
+        else:
+            self.last_resume_year = first - 1
+            result = simulate(p, resume_from=self.result, resume_year=first - 1)
+
+        self.params = p
+        self.result = result
+        return result
+
+
+# =========================
+# Monthly resolution
+# =========================
+
+MONTHLY_SERIES = (
+    "pension", "isa", "cash", "lisa",
+    "property_value", "mortgage_balance", "home_equity",
+    "net_worth", "shortfall",
+)
+
+_MONTHS = np.arange(1, 13)
+
+
+def _compounding(rate, inflation):
+    """
+    Monthly real growth factor g plus, for months k = 1..12 (and k = 0..12
+    offsets), G[k] = g**k and the annuity factor A[k] = (g**k - 1) / (g - 1),
+    so a balance B with a level monthly flow f is B * G[k] + f * A[k].
+    """
+    g = np.maximum(1 + rate - inflation, 0) ** (1 / 12)
+    k = np.arange(13)
+    G = g[:, None] ** k
+    with np.errstate(divide="ignore", invalid="ignore"):
+        A = np.where(np.isclose(g, 1)[:, None], k, (G - 1) / (g - 1)[:, None])
+    return G, A
+
+
+def _take(offset_table, offset):
+    """Pick table[i, offset[i, k]] for every scenario i and month k."""
+    return np.take_along_axis(offset_table, offset, axis=1)
+
+
+def simulate_monthly(params, record=SERIES, record_months=False):
+    """
+    Monthly-step version of simulate() (fixed rates only).
+
+    Within each year the salary is fixed, so every monthly contribution and
+    withdrawal stream is a level annuity: all 12 months are evaluated at once
+    in closed form instead of looping month by month. Contributions (including
+    the LISA bonus) are paid monthly, retirement income is drawn monthly, the
+    house can be bought in any month, and the mortgage is a standard
+    repayment loan at the nominal mortgage rate over mortgage_term.
+
+    Returns the same annual (scenarios x years) series as simulate(), taken
+    at each year end (shortfall is the annual total). With record_months, also
+    'monthly': a (scenarios x months) Ledger of MONTHLY_SERIES, month 0 being
+    the start. Without it only the year end of each balance is evaluated
+    (plus the months needed to find the purchase month).
+    """
+    p = as_batch(params)
+    years = horizon(p)
+    n = len(p["base_salary"])
+    months = 12 * (years - 1) + 1
+    inflation = p["inflation"]
+    start_age = np.trunc(p["start_age"])
+    rows = np.arange(n)[:, None]
+
+    result = Ledger(record, (n, years))
+    _, row = _initial_row(p)
+    result.set_year(0, row)
+    if record_months:
+        monthly = Ledger(MONTHLY_SERIES, (n, months))
+        monthly.set_year(0, row)
+
+    # Months of the year whose balances are evaluated (1..12, or just the year end)
+    k = _MONTHS if record_months else _MONTHS[-1:]
+
+    # Per-asset compounding tables (rates are fixed for the whole run)
+    G_pen, A_pen = _compounding(p["pension_rate"], inflation)
+    G_isa, A_isa = _compounding(p["isa_rate"], inflation)
+    G_cash, A_cash = _compounding(p["cash_rate"], inflation)
+    G_lisa, A_lisa = _compounding(p["lisa_rate"], inflation)
+    G_house, _ = _compounding(p["house_price_growth"], inflation)
+    deflator = (1 + inflation)[:, None] ** (np.arange(13) / 12)
+
+    # Repayment mortgage at the nominal rate
+    mortgage_i = p["mortgage_rate"] / 12
+    loan_months = np.maximum(np.round(p["mortgage_term"] * 12), 1)
+    growth_i = (1 + mortgage_i)[:, None] ** np.arange(13)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity_i = np.where((mortgage_i == 0)[:, None], np.arange(13),
+                             (growth_i - 1) / mortgage_i[:, None])
+        payment_factor = np.where(mortgage_i == 0, 1 / loan_months,
+                                  mortgage_i / (1 - (1 + mortgage_i) ** -loan_months))
+
+    # State carried between years
+    house_bought = np.zeros(n, dtype=bool)
+    purchase_year = np.full(n, -1)
+    mortgage_nominal = np.zeros(n)   # nominal balance owed
+    mortgage_deflator = np.ones(n)   # price level relative to the purchase month
+    mortgage_payment = np.zeros(n)   # nominal monthly payment
+
+    for year in range(1, years):
+        current_age = start_age + year
+        is_retired = current_age >= np.trunc(p["retire_age"])
+        working = ~is_retired
+
+        # --- Salary (annual pay rises, paid monthly) ---
+        nominal_salary = np.where(working, row["nominal_salary"] * (1 + p["growth_rate"]), 0.0)
+        real_salary = np.where(working, row["real_salary"] * (1 + p["growth_rate"] - inflation), 0.0)
+        net_salary = np.where(working, net_pay(real_salary, p["pension_employee_rate"]), 0.0)
+
+        pen_in = (p["pension_employee_rate"] + p["pension_employer_rate"]) * real_salary / 12
+        isa_in = p["isa_contribution_rate"] * net_salary / 12
+        lisa_in = np.where(working & ~house_bought,
+                           np.minimum(p["lisa_max_contribution"], 0.2 * net_salary) / 12, 0.0)
+        lisa_in = lisa_in * (1 + p["lisa_bonus_rate"])
+
+        # --- Drawdown waterfall on monthly amounts ---
+        # Each source can fund at most the level withdrawal that empties it
+        # exactly at the year end: B * G[12] / A[12].
+        required = np.where(is_retired, p["retire_income"], 0.0)
+        need = np.where(current_age >= STATE_PENSION_AGE,
+                        np.maximum(0, required - STATE_PENSION_AMOUNT), required) / 12
+
+        pension_open = current_age >= PENSION_ACCESS_AGE
+        lisa_drawable = pension_open & (current_age >= LISA_ACCESS_AGE)
+
+        def drawable(balance, G, A, allowed=True):
+            return np.where(allowed, balance * G[:, 12] / A[:, 12], 0.0)
+
+        pen_out = np.minimum(need, drawable(row["pension"], G_pen, A_pen, pension_open))
+        need = need - pen_out
+        lisa_out = np.minimum(need, drawable(row["lisa"], G_lisa, A_lisa, lisa_drawable))
+        need = need - lisa_out
+        isa_out = np.minimum(need, drawable(row["isa"], G_isa, A_isa))
+        need = need - isa_out
+        cash_out = np.minimum(need, drawable(row["cash"], G_cash, A_cash))
+        need = need - cash_out
+
+        # --- Balances for months k in closed form ---
+        pension = np.maximum(0, row["pension"][:, None] * G_pen[:, k] + (pen_in - pen_out)[:, None] * A_pen[:, k])
+        isa = np.maximum(0, row["isa"][:, None] * G_isa[:, k] + (isa_in - isa_out)[:, None] * A_isa[:, k])
+        cash = np.maximum(0, row["cash"][:, None] * G_cash[:, k] - cash_out[:, None] * A_cash[:, k])
+        shortfall = np.repeat(need[:, None], len(k), axis=1)
+
+        # ---------- PROPERTY ----------
+        # The LISA and house price need every month, to find the purchase month
+        lisa = np.maximum(0, row["lisa"][:, None] * G_lisa[:, 1:] + (lisa_in - lisa_out)[:, None] * A_lisa[:, 1:])
+        house_price = row["house_price"][:, None] * G_house[:, 1:]
+        deposit = house_price * p["deposit_rate"][:, None]
+        can_buy = ~house_bought[:, None] & (lisa >= deposit)
+        buying = can_buy.any(axis=1)
+        buy_month = np.where(buying, can_buy.argmax(axis=1) + 1, 13)  # 1..12, 13 = not this year
+
+        # LISA after the purchase: deposit paid, contributions stop
+        since_buy = np.clip(k[None, :] - buy_month[:, None], 0, 12)
+        bought_idx = np.minimum(buy_month, 12)[:, None] - 1
+        lisa_at_buy = np.take_along_axis(lisa, bought_idx, axis=1)
+        deposit_at_buy = np.take_along_axis(deposit, bought_idx, axis=1)
+        price_at_buy = np.take_along_axis(house_price, bought_idx, axis=1)
+        lisa_after = np.maximum(0, (lisa_at_buy - deposit_at_buy) * _take(G_lisa, since_buy)
+                                - lisa_out[:, None] * _take(A_lisa, since_buy))
+        owned_after = k[None, :] >= buy_month[:, None]
+        lisa = np.where(owned_after, lisa_after, lisa[:, k - 1])
+
+        # Mortgage: new loans start in their purchase month, older ones at month 0
+        new_loan = (price_at_buy - deposit_at_buy)[:, 0]
+        origin = np.where(house_bought, 0, buy_month)
+        loan_start = np.where(house_bought, mortgage_nominal, new_loan)
+        payment = np.where(house_bought, mortgage_payment, new_loan * payment_factor)
+        base_deflator = np.where(house_bought, mortgage_deflator, 1.0)
+
+        elapsed = np.clip(k[None, :] - origin[:, None], 0, 12)
+        nominal_owed = np.maximum(0, loan_start[:, None] * _take(growth_i, elapsed)
+                                  - payment[:, None] * _take(annuity_i, elapsed))
+        price_level = base_deflator[:, None] * _take(deflator, elapsed)
+
+        owned = house_bought[:, None] | owned_after
+        property_value = np.where(owned, house_price[:, k - 1], 0.0)
+        mortgage_balance = np.where(owned, nominal_owed / price_level, 0.0)
+        home_equity = property_value - mortgage_balance
+
+        # --- Carry state to next year ---
+        house_bought = house_bought | buying
+        purchase_year = np.where(buying, year, purchase_year)
+        mortgage_nominal = np.where(house_bought, nominal_owed[:, -1], 0.0)
+        mortgage_deflator = np.where(house_bought, price_level[:, -1], 1.0)
+        mortgage_payment = np.where(house_bought, payment, 0.0)
+
+        month_values = {
+            "pension": pension,
+            "isa": isa,
+            "cash": cash,
+            "lisa": lisa,
+            "property_value": property_value,
+            "mortgage_balance": mortgage_balance,
+            "home_equity": home_equity,
+            "net_worth": pension + isa + cash + lisa + home_equity,
+            "shortfall": shortfall,
+        }
+        if record_months:
+            monthly.set_year(slice(12 * (year - 1) + 1, 12 * year + 1), month_values)
+
+        # Year-end row, in the same shape simulate() produces
+        row = {name: values[:, -1] for name, values in month_values.items()}
+        row.update({
+            "nominal_salary": nominal_salary,
+            "real_salary": real_salary,
+            "net_salary": net_salary,
+            "house_price": house_price[:, -1],
+            "shortfall": need * 12,
+        })
+        result.set_year(year, row)
+
+    result["ages"] = start_age[:, None] + np.arange(years)
+    result["purchase_year"] = purchase_year
+    result["mortgage_payment"] = mortgage_payment * 12
+    if record_months:
+        result["monthly"] = monthly
+    return result
@@ -0,0 +1,143 @@
+"""
+Coalescing background recomputation for the GUIs.
+
+A slider drag fires its callback dozens of times a second. Instead of running
+a full simulation (and redraw) for each, callbacks submit their inputs here:
+only the newest submission is kept, a single worker thread computes it, and
+results that were overtaken by a newer submission are dropped before they
+reach Tk.
+
+The worker never calls Tk: it puts results on a queue that the Tk thread
+polls with after().
+"""
+
+import queue
+import threading
+import time
+import traceback
+from tkinter import TclError
+
+
+class RecomputeScheduler:
+    POLL_MS = 15  # how often the Tk thread checks for finished results
+
+    def __init__(self, widget, compute, on_result, on_error=None):
+        """
+        Create on the Tk thread.
+
+        widget    - any Tk widget; its after() polls for results
+        compute   - called on the worker thread with the submitted arguments;
+                    must not touch Tk
+        on_result - called on the Tk thread with compute's return value
+        on_error  - called on the Tk thread with the exception (optional;
+                    without it the traceback is printed to stderr)
+        """
+        self.widget = widget
+        self.compute = compute
+        self.on_result = on_result
+        self.on_error = on_error
+
+        self._lock = threading.Condition()
+        self._pending = None      # (generation, args) waiting to run
+        self._generation = 0      # id of the newest submission
+        self._running = False
+        self._results = queue.Queue()  # (generation, result, error) for the Tk thread
+
+        # Counters
+        self.submitted = 0
+        self.completed = 0
+        self.coalesced = 0        # replaced while still waiting to run
+        self.dropped = 0          # computed, but a newer submission existed
+        self.last_compute_time = 0.0
+
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+        self.widget.after(self.POLL_MS, self._poll)
+
+    def submit(self, *args):
+        with self._lock:
+            self._generation += 1
+            self.submitted += 1
+            if self._pending is not None:
+                self.coalesced += 1
+            self._pending = (self._generation, args)
+            self._lock.notify()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "queue_depth": int(self._pending is not None) + int(self._running),
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "coalesced": self.coalesced,
+                "dropped": self.dropped,
+                "last_compute_time": self.last_compute_time,
+            }
+
+    def status_text(self):
+        s = self.stats()
+        return (f"{s['last_compute_time']*1000:.0f} ms | queue {s['queue_depth']} | "
+                f"saved {s['coalesced'] + s['dropped']} of {s['submitted']} runs")
+
+    def _is_current(self, generation):
+        with self._lock:
+            return generation == self._generation
+
+    def _worker(self):
+        while True:
+            with self._lock:
+                while self._pending is None:
+                    self._lock.wait()
+                generation, args = self._pending
+                self._pending = None
+                self._running = True
+
+            start = time.perf_counter()
+            try:
+                result = self.compute(*args)
+                error = None
+            except Exception as e:
+                result, error = None, e
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                self._running = False
+                self.last_compute_time = elapsed
+                stale = generation != self._generation
+                if stale:
+                    self.dropped += 1
+
+            if not stale:
+                self._results.put((generation, result, error))
+
+    def _poll(self):
+        # Tk thread: hand over whatever the worker finished since the last poll
+        try:
+            while True:
+                try:
+                    generation, result, error = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                self._deliver(generation, result, error)
+        finally:
+            try:
+                self.widget.after(self.POLL_MS, self._poll)
+            except (RuntimeError, TclError):
+                pass  # Tk has gone (window closed); stop polling
+
+    def _deliver(self, generation, result, error):
+        # A newer submission may have arrived while this was queued on Tk
+        if not self._is_current(generation):
+            with self._lock:
+                self.dropped += 1
+            return
+
+        with self._lock:
+            self.completed += 1
+        if error is not None:
+            if self.on_error is not None:
+                self.on_error(error)
+            else:
+                traceback.print_exception(type(error), error, error.__traceback__)
+        else:
+            self.on_result(result)
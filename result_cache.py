@@ -0,0 +1,131 @@
+"""
+Bounded in-memory cache of simulation results.
+
+Results are keyed by canonical_key(), a hash of the float-normalised inputs,
+so the same configuration always maps to the same key no matter how it was
+typed in (30 vs "30.0", key order, int vs float). The least recently used
+entry is evicted once the cache holds more than max_entries results or, when
+max_bytes is set, more than max_bytes of result arrays.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def _normalise(value):
+    """Floats (or nested lists/tuples of floats) in one canonical form."""
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_normalise(v) for v in np.asarray(value, dtype=float).ravel().tolist()]
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, str):
+        return value
+    value = float(value) + 0.0  # also folds -0.0 into 0.0
+    return "nan" if value != value else value
+
+
+def canonical_key(params, **extra):
+    """
+    Stable hash of a parameter mapping (plus any extra settings such as the
+    run mode). Keys are sorted and values float-normalised before hashing.
+    """
+    payload = {name: _normalise(value) for name, value in params.items()}
+    payload["__extra__"] = {name: _normalise(value) for name, value in extra.items()}
+    text = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def sizeof(value):
+    """Approximate memory held by a result (its NumPy arrays)."""
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sum(sizeof(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(sizeof(v) for v in value)
+    return 0
+
+
+class ResultCache:
+    def __init__(self, max_entries=32, max_bytes=None):
+        """
+        max_entries - most results kept
+        max_bytes   - optional limit on the total size of the kept results
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries = OrderedDict()  # key -> (value, size), oldest first
+        self._lock = threading.Lock()
+        self.bytes = 0
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            # Always keep the newest entry, even if it alone is over max_bytes
+            while len(self._entries) > 1 and (
+                    len(self._entries) > self.max_entries
+                    or (self.max_bytes is not None and self.bytes > self.max_bytes)):
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self.bytes -= old_size
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Cached value for key, or compute() it and store the result."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def status_text(self):
+        s = self.stats()
+        return (f"cache {s['entries']}/{self.max_entries} | "
+                f"{s['hits']} hits, {s['misses']} misses, {s['evictions']} evicted")
+
+
+_MISSING = object()
@@ -0,0 +1,178 @@
+"""
+Append-only on-disk store for large scenario batches.
+
+A store is a directory of shards. Each shard holds one .npy file per column
+plus a '_key' column with the 16-byte parameter hash of every row (see
+param_hashes). Shards are written to a temporary directory and renamed into
+place, so a crash never leaves a half-written shard behind; whatever was
+committed before the crash is still there on restart.
+
+Columns are read back memory-mapped, so slicing a store of millions of rows
+only touches the pages that are actually used.
+
+One writer at a time per store.
+"""
+
+import json
+import os
+import shutil
+import uuid
+
+import numpy as np
+
+import projection_engine
+
+KEY = "_key"
+KEY_DTYPE = "S16"
+
+_META = "meta.json"
+_SHARD_PREFIX = "shard-"
+
+
+# =========================
+# Parameter hashing
+# =========================
+
+_M1 = np.uint64(0x9E3779B97F4A7C15)
+_M2 = np.uint64(0xBF58476D1CE4E5B9)
+_M3 = np.uint64(0x94D049BB133111EB)
+
+
+def _mix(h):
+    # splitmix64 finaliser
+    h = (h ^ (h >> np.uint64(30))) * _M2
+    h = (h ^ (h >> np.uint64(27))) * _M3
+    return h ^ (h >> np.uint64(31))
+
+
+def param_hashes(params):
+    """
+    128-bit hash of every scenario's full parameter set (defaults filled in),
+    as a (scenarios,) array of 16-byte keys. Computed column by column with
+    vectorized integer mixing, so millions of scenarios hash in a fraction of
+    a second. Equal parameter values always give equal keys (-0.0 == 0.0).
+    """
+    p = projection_engine.as_batch(params)
+    n = len(p["base_salary"])
+    lanes = [np.full(n, np.uint64(seed)) for seed in (0x243F6A8885A308D3, 0x13198A2E03707344)]
+    with np.errstate(over="ignore"):
+        for name in sorted(projection_engine.PARAM_DEFAULTS):
+            bits = (np.ascontiguousarray(p[name], dtype=np.float64) + 0.0).view(np.uint64)
+            lanes = [_mix((h ^ bits) * _M1 + np.uint64(i)) for i, h in enumerate(lanes)]
+    return np.stack(lanes, axis=1).view(KEY_DTYPE).ravel()
+
+
+# =========================
+# Store
+# =========================
+
+class ResultStore:
+    def __init__(self, path, dtype=None):
+        """
+        Open (or create) the store at `path`. dtype is the row layout of the
+        results; an existing store keeps the layout it was created with.
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._clean_temp()
+
+        meta_path = os.path.join(path, _META)
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                self.dtype = np.dtype([tuple(field) for field in json.load(f)["dtype"]])
+            if dtype is not None and np.dtype(dtype) != self.dtype:
+                raise ValueError(f"Store at {path} holds {self.dtype}, not {np.dtype(dtype)}")
+        elif dtype is not None:
+            self.dtype = np.dtype(dtype)
+            with open(meta_path, "w") as f:
+                json.dump({"dtype": [[name, self.dtype[name].str] for name in self.dtype.names]}, f)
+        else:
+            raise ValueError(f"No store at {path}; pass dtype to create one")
+
+        self._shards = sorted(d for d in os.listdir(path) if d.startswith(_SHARD_PREFIX))
+        self._counts = [len(self._load(shard, KEY)) for shard in self._shards]
+        self._keys = None  # cached key index, see contains()
+
+    def _clean_temp(self):
+        # Leftovers from a write that crashed before its rename
+        for entry in os.listdir(self.path):
+            if entry.startswith(".tmp-"):
+                shutil.rmtree(os.path.join(self.path, entry), ignore_errors=True)
+
+    def _load(self, shard, column):
+        return np.load(os.path.join(self.path, shard, column + ".npy"), mmap_mode="r")
+
+    def __len__(self):
+        return sum(self._counts)
+
+    @property
+    def columns(self):
+        return self.dtype.names
+
+    # --- Writing ---
+
+    def append(self, keys, rows):
+        """Commit one shard: keys (n,) and a structured array of n rows."""
+        keys = np.asarray(keys, dtype=KEY_DTYPE)
+        if rows.dtype != self.dtype:
+            raise ValueError(f"Rows are {rows.dtype}, store holds {self.dtype}")
+        if len(keys) != len(rows):
+            raise ValueError("keys and rows differ in length")
+        if not len(rows):
+            return
+
+        name = f"{_SHARD_PREFIX}{len(self._shards):06d}"
+        temp = os.path.join(self.path, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(temp)
+        np.save(os.path.join(temp, KEY + ".npy"), keys)
+        for column in self.dtype.names:
+            np.save(os.path.join(temp, column + ".npy"), np.ascontiguousarray(rows[column]))
+        os.replace(temp, os.path.join(self.path, name))
+
+        self._shards.append(name)
+        self._counts.append(len(rows))
+        if self._keys is not None:
+            self._keys = np.union1d(self._keys, keys)
+
+    # --- Reading ---
+
+    def keys(self):
+        """Every stored key, in storage order."""
+        if not self._shards:
+            return np.empty(0, dtype=KEY_DTYPE)
+        return np.concatenate([self._load(shard, KEY) for shard in self._shards])
+
+    def contains(self, keys):
+        """Boolean mask: which of `keys` are already stored."""
+        if self._keys is None:
+            self._keys = np.unique(self.keys())
+        return np.isin(np.asarray(keys, dtype=KEY_DTYPE), self._keys, assume_unique=False)
+
+    def read(self, start=0, stop=None, columns=None):
+        """
+        Rows [start, stop) in storage order as a structured array (only the
+        requested columns). Only the shards overlapping the slice are mapped.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        columns = list(columns or self.dtype.names)
+        dtype = np.dtype([(name, self.dtype[name]) if name != KEY else (KEY, KEY_DTYPE)
+                          for name in columns])
+        out = np.empty(max(stop - start, 0), dtype=dtype)
+
+        offset = 0
+        for shard, count in zip(self._shards, self._counts):
+            lo, hi = max(start - offset, 0), min(stop - offset, count)
+            if lo < hi:
+                at = offset + lo - start
+                for name in columns:
+                    out[name][at:at + hi - lo] = self._load(shard, name)[lo:hi]
+            offset += count
+            if offset >= stop:
+                break
+        return out
+
+    def iter_shards(self, columns=None):
+        """Yield each shard as a dict of memory-mapped columns."""
+        columns = list(columns or self.dtype.names)
+        for shard in self._shards:
+            yield {name: self._load(shard, name) for name in columns}
@@ -0,0 +1,115 @@
+"""
+Goal-seek questions answered on top of the projection engine.
+
+    earliest_retire_age  - earliest retirement age with no income shortfall
+    max_retire_income    - highest retirement income that never runs short
+
+Both take a batch of scenarios and search all of them in lockstep. The
+working-life years are simulated once (with retirement switched off) and
+every probe resumes from that run's checkpoint at the candidate retirement
+year, so a probe only pays for the retirement years.
+"""
+
+import numpy as np
+
+import projection_engine
+
+SHORTFALL_TOLERANCE = 1e-6
+
+
+def _prepare(params, survive_to_age):
+    p = projection_engine.as_batch(params)
+    start_age = np.trunc(p["start_age"])
+
+    # Make sure the horizon reaches the age we need to survive to
+    if survive_to_age is not None:
+        needed = int(np.max(np.trunc(survive_to_age) - start_age)) + 1
+        p["years"][:] = max(projection_engine.horizon(p), needed)
+        last_index = np.trunc(survive_to_age) - start_age
+    else:
+        last_index = np.full(len(start_age), projection_engine.horizon(p) - 1)
+
+    # Working life only: the state before retirement does not depend on
+    # retire_age or retire_income, so this run is a checkpoint for every probe.
+    working = dict(p, retire_age=np.full_like(p["retire_age"], np.inf))
+    checkpoint = projection_engine.simulate(
+        working, record=projection_engine.STATE_SERIES + ("shortfall",))
+    return p, start_age, last_index, checkpoint
+
+
+def _solvent(p, start_age, last_index, checkpoint):
+    """True where a scenario never runs short up to its last_index year."""
+    first_retired = np.maximum(np.trunc(p["retire_age"]) - start_age, 1)
+    resume_year = max(int(first_retired.min()) - 1, 0)
+
+    result = projection_engine.simulate(p, record=("shortfall",),
+                                        resume_from=checkpoint, resume_year=resume_year)
+    years = np.arange(result["shortfall"].shape[1])
+    in_range = years[None, :] <= last_index[:, None]
+    return ~((result["shortfall"] > SHORTFALL_TOLERANCE) & in_range).any(axis=1)
+
+
+def earliest_retire_age(params, min_age=None, max_age=75, survive_to_age=None):
+    """
+    Earliest whole retirement age (between min_age and max_age) with no
+    shortfall, per scenario. NaN where even max_age runs short.
+
+    min_age defaults to the year after start_age. Shortfalls are checked up
+    to survive_to_age, or the end of the simulated horizon.
+    """
+    p, start_age, last_index, checkpoint = _prepare(params, survive_to_age)
+    n = len(start_age)
+
+    lo = start_age + 1 if min_age is None else np.broadcast_to(np.trunc(min_age), (n,)).astype(float)
+    hi = np.broadcast_to(np.trunc(max_age), (n,)).astype(float)
+    lo = np.minimum(lo, hi)
+
+    p["retire_age"] = hi.copy()
+    found = _solvent(p, start_age, last_index, checkpoint)
+
+    # Bisection on integer ages, all scenarios at once
+    active = found & (lo < hi)
+    while active.any():
+        mid = np.where(active, np.floor((lo + hi) / 2), hi)
+        p["retire_age"] = mid
+        ok = _solvent(p, start_age, last_index, checkpoint)
+        hi = np.where(active & ok, mid, hi)
+        lo = np.where(active & ~ok, mid + 1, lo)
+        active = lo < hi
+
+    return np.where(found, hi, np.nan)
+
+
+def max_retire_income(params, survive_to_age=None, high=None, tolerance=1.0):
+    """
+    Highest retirement income (to within `tolerance` pounds) that never runs
+    short up to survive_to_age, per scenario, keeping each scenario's
+    retire_age.
+
+    The search starts from `high` (default: double until it fails).
+    """
+    p, start_age, last_index, checkpoint = _prepare(params, survive_to_age)
+    n = len(start_age)
+
+    lo = np.zeros(n)
+    if high is None:
+        hi = np.full(n, 10000.0)
+        p["retire_income"] = hi.copy()
+        ok = _solvent(p, start_age, last_index, checkpoint)
+        while ok.any() and hi.max() < 1e12:
+            lo = np.where(ok, hi, lo)
+            hi = np.where(ok, hi * 2, hi)
+            p["retire_income"] = hi.copy()
+            ok = _solvent(p, start_age, last_index, checkpoint)
+    else:
+        hi = np.broadcast_to(np.asarray(high, dtype=float), (n,)).copy()
+
+    # Bisection on income, all scenarios at once
+    while (hi - lo > tolerance).any():
+        mid = (lo + hi) / 2
+        p["retire_income"] = mid
+        ok = _solvent(p, start_age, last_index, checkpoint)
+        lo = np.where(ok, mid, lo)
+        hi = np.where(ok, hi, mid)
+
+    return lo
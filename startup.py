@@ -0,0 +1,166 @@
+"""
+Cold-start helpers for the GUIs.
+
+Importing matplotlib, pandas and yfinance takes longer than building the
+whole window, so the apps show their inputs first and only load those
+libraries when they are needed: the chart is created once the window is on
+screen (after_mapped), and libraries only needed later are imported on a
+background thread in the meantime (preload).
+
+The Portfolio Projector also keeps the result of its default inputs on disk
+(save_snapshot / load_snapshot), so the first chart needs no simulation.
+
+Run this module to see what each app imports at startup:
+
+    python startup.py [Portfolio_GUI Portfolio_Backtester pension_efficiency]
+"""
+
+import hashlib
+import os
+import subprocess
+import sys
+import threading
+
+SNAPSHOT_DIR = os.environ.get("FINANCE_SNAPSHOT_DIR",
+                              os.path.join(os.path.expanduser("~"), ".cache", "finance"))
+
+# Libraries the apps defer (reported as loaded or deferred)
+HEAVY_MODULES = ("matplotlib", "pandas", "yfinance")
+
+# What an embedded chart needs
+CHART_MODULES = ("matplotlib.figure", "matplotlib.ticker", "matplotlib.backends.backend_tkagg")
+
+APPS = ("Portfolio_GUI", "Portfolio_Backtester", "pension_efficiency")
+
+
+# =========================
+# Deferred work
+# =========================
+
+def after_mapped(widget, callback):
+    """Run callback once on the Tk thread, after widget first appears on screen."""
+    state = {"done": False}
+
+    def on_map(event):
+        if state["done"] or event.widget is not widget:
+            return  # <Map> also fires for every child widget
+        state["done"] = True
+        widget.after_idle(callback)  # let the first paint finish
+
+    widget.bind("<Map>", on_map, add="+")
+
+
+def preload(*modules):
+    """Import modules on a background thread; returns the thread."""
+    def load():
+        for name in modules:
+            try:
+                __import__(name)
+            except ImportError:
+                pass  # reported properly by the real import at first use
+
+    thread = threading.Thread(target=load, daemon=True)
+    thread.start()
+    return thread
+
+
+def load_then(widget, modules, callback, poll_ms=30):
+    """Import modules on a background thread, then run callback on the Tk thread."""
+    thread = preload(*modules)
+
+    def check():
+        if thread.is_alive():
+            widget.after(poll_ms, check)
+        else:
+            callback()
+
+    check()
+
+
+# =========================
+# Default scenario snapshots
+# =========================
+
+def source_hash(*modules):
+    """Hash of the source files of modules, so snapshots expire when the code changes."""
+    h = hashlib.blake2b(digest_size=8)
+    for module in modules:
+        with open(module.__file__, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def _snapshot_path(name):
+    return os.path.join(SNAPSHOT_DIR, f"{name}.npz")
+
+
+def load_snapshot(name, key, loader):
+    """loader(path) of the snapshot saved under key, or None if missing or stale."""
+    import numpy as np
+
+    path = _snapshot_path(name)
+    try:
+        with np.load(path) as f:
+            if str(f["snapshot_key"]) != key:
+                return None
+        return loader(path)
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def save_snapshot(name, key, saver):
+    """saver(path, snapshot_key=key) writes the snapshot; written atomically."""
+    path = _snapshot_path(name)
+    temp = f"{path}.{os.getpid()}.tmp.npz"
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        saver(temp, snapshot_key=key)
+        os.replace(temp, path)
+    except OSError:
+        # A read-only home directory only costs the fast start
+        if os.path.exists(temp):
+            os.remove(temp)
+
+
+# =========================
+# Import-time report
+# =========================
+
+def import_times(module):
+    """
+    Cumulative import time (ms) of every package loaded by
+    `import module`, measured in a fresh interpreter with -X importtime.
+    """
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    # Lines look like "import time:  self [us] | cumulative | name"
+    times = {}
+    for line in proc.stderr.splitlines():
+        fields = line.split("|")
+        if not line.startswith("import time:") or len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        # A package costs as much as its most expensive module (e.g. matplotlib.pyplot)
+        package = fields[2].strip().split(".")[0]
+        times[package] = max(times.get(package, 0.0), int(fields[1]) / 1000)
+    return times
+
+
+def report(modules=APPS):
+    for module in modules:
+        times = import_times(module)
+        heaviest = sorted(times.items(), key=lambda item: -item[1])[:6]
+        print(f"{module}: {times[module]:.0f} ms to import")
+        for name, ms in heaviest:
+            if name not in (module, "site"):
+                print(f"    {name:<24} {ms:8.1f} ms")
+        loaded = [name for name in HEAVY_MODULES if name in times]
+        deferred = [name for name in HEAVY_MODULES if name not in times]
+        print(f"    loaded at startup: {', '.join(loaded) or '-'}")
+        print(f"    deferred:          {', '.join(deferred) or '-'}")
+
+
+if __name__ == "__main__":
+    report(sys.argv[1:] or APPS)
@@ -0,0 +1,228 @@
+"""
+Parameter sweeps over the projection engine.
+
+The Cartesian grid of the requested ranges is split into chunks that are run
+on a process pool. Workers rebuild their own slice of the grid from the
+ranges and send back a compact structured array, never per-scenario lists.
+
+Example:
+    python sweep.py retire_age=50:70:1 retire_income=20000:40000:1000 --out sweep.npy
+
+With --store DIR, finished chunks are written to a result store as they
+complete, and re-running the same command skips everything already stored.
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import projection_engine
+import result_store
+
+# Metrics kept per scenario
+METRICS = [
+    ("final_net_worth", "f8"),
+    ("first_shortfall_year", "i2"),   # -1 = never short
+    ("first_shortfall_age", "f8"),    # NaN = never short
+    ("min_isa_before_pension", "f8"), # NaN = already past pension access age
+]
+
+
+def result_dtype(names):
+    return np.dtype([(name, "f8") for name in names] + METRICS)
+
+
+def grid_size(ranges):
+    return int(np.prod([len(values) for values in ranges.values()], dtype=np.int64))
+
+
+def grid_slice(ranges, start, stop):
+    """Parameters for grid points [start, stop) of the Cartesian product."""
+    return grid_points(ranges, np.arange(start, stop))
+
+
+def grid_points(ranges, points):
+    """Parameters for the given flat grid point numbers."""
+    shape = [len(values) for values in ranges.values()]
+    index = np.unravel_index(np.asarray(points, dtype=np.int64), shape)
+    return {name: np.asarray(values, dtype=float)[i]
+            for (name, values), i in zip(ranges.items(), index)}
+
+
+def summarize(result):
+    """Reduce a simulate() result to the METRICS columns."""
+    net_worth = result["net_worth"]
+    ages = result["ages"]
+    short = result["shortfall"] > 1e-6
+
+    any_short = short.any(axis=1)
+    first_year = np.where(any_short, short.argmax(axis=1), -1)
+    first_age = np.where(any_short, ages[np.arange(len(ages)), first_year], np.nan)
+
+    pre_access = ages < projection_engine.PENSION_ACCESS_AGE
+    isa = np.where(pre_access, result["isa"], np.inf).min(axis=1)
+
+    return {
+        "final_net_worth": net_worth[:, -1],
+        "first_shortfall_year": first_year,
+        "first_shortfall_age": first_age,
+        "min_isa_before_pension": np.where(np.isinf(isa), np.nan, isa),
+    }
+
+
+def _run_chunk(args):
+    ranges, base, start, stop = args[:4]
+    points = args[4] if len(args) > 4 else np.arange(start, stop)  # subset left to run
+    params = dict(base)
+    params.update(grid_points(ranges, points))
+
+    result = projection_engine.simulate(params, record=("net_worth", "isa", "shortfall"))
+    metrics = summarize(result)
+
+    out = np.empty(len(points), dtype=result_dtype(ranges))
+    for name in ranges:
+        out[name] = params[name]
+    for name, _ in METRICS:
+        out[name] = metrics[name]
+    return out
+
+
+def run_sweep(ranges, base=None, chunk_size=4096, max_workers=None):
+    """
+    Run every combination of `ranges` (name -> sequence of values) on top of
+    the fixed `base` parameters.
+
+    Returns a structured array with one row per grid point: the swept
+    parameters followed by the METRICS columns, in C (last-name-fastest) order.
+    """
+    ranges = {name: list(values) for name, values in ranges.items()}
+    base = dict(base or {})
+    unknown = (set(ranges) | set(base)) - set(projection_engine.PARAM_DEFAULTS)
+    if unknown:
+        raise KeyError(f"Unknown projection parameters: {sorted(unknown)}")
+
+    total = grid_size(ranges)
+    jobs = [(ranges, base, start, min(start + chunk_size, total))
+            for start in range(0, total, chunk_size)]
+    if not jobs:
+        return np.empty(0, dtype=result_dtype(ranges))
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1 or len(jobs) == 1:
+        parts = [_run_chunk(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            parts = list(pool.map(_run_chunk, jobs))
+
+    return np.concatenate(parts)
+
+
+def run_sweep_to_store(ranges, store, base=None, chunk_size=4096, max_workers=None):
+    """
+    Like run_sweep, but every finished chunk is appended to `store` (a
+    result_store.ResultStore, or a directory to open one in) as soon as it
+    completes. Scenarios whose parameter hash is already stored are skipped,
+    so an interrupted sweep picks up where it stopped.
+
+    Returns (store, computed, skipped).
+    """
+    ranges = {name: list(values) for name, values in ranges.items()}
+    base = dict(base or {})
+    unknown = (set(ranges) | set(base)) - set(projection_engine.PARAM_DEFAULTS)
+    if unknown:
+        raise KeyError(f"Unknown projection parameters: {sorted(unknown)}")
+    if not isinstance(store, result_store.ResultStore):
+        store = result_store.ResultStore(store, result_dtype(ranges))
+
+    total = grid_size(ranges)
+    jobs = []
+    skipped = 0
+    for start in range(0, total, chunk_size):
+        stop = min(start + chunk_size, total)
+        points = np.arange(start, stop)
+        keys = result_store.param_hashes({**base, **grid_points(ranges, points)})
+        todo = ~store.contains(keys)
+        skipped += int((~todo).sum())
+        if todo.any():
+            jobs.append(((ranges, base, start, stop, points[todo]), keys[todo]))
+
+    max_workers = max_workers or os.cpu_count() or 1
+    computed = 0
+    if max_workers == 1 or len(jobs) <= 1:
+        for args, keys in jobs:
+            part = _run_chunk(args)
+            store.append(keys, part)
+            computed += len(part)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            # map() yields in order as chunks finish, so each is committed early
+            for (args, keys), part in zip(jobs, pool.map(_run_chunk, [args for args, _ in jobs])):
+                store.append(keys, part)
+                computed += len(part)
+
+    return store, computed, skipped
+
+
+# =========================
+# Command line
+# =========================
+
+def parse_range(text):
+    """'name=start:stop:step' (stop inclusive) or 'name=a,b,c'."""
+    name, _, spec = text.partition("=")
+    if not spec:
+        raise argparse.ArgumentTypeError(f"Expected name=values, got '{text}'")
+    if ":" in spec:
+        start, stop, step = (float(x) for x in spec.split(":"))
+        count = int(np.floor((stop - start) / step + 1e-9)) + 1
+        values = start + step * np.arange(count)
+    else:
+        values = [float(x) for x in spec.split(",")]
+    return name, list(values)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep projection inputs across a grid.")
+    parser.add_argument("ranges", nargs="+", type=parse_range,
+                        help="name=start:stop:step or name=a,b,c")
+    parser.add_argument("--set", dest="base", action="append", type=parse_range, default=[],
+                        help="fixed input, e.g. --set years=50")
+    parser.add_argument("--out", help="write results to .npy or .csv")
+    parser.add_argument("--store", help="append results to a resumable result store directory; "
+                                        "scenarios already in it are skipped")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    args = parser.parse_args(argv)
+
+    ranges = dict(args.ranges)
+    base = {name: values[0] for name, values in args.base}
+    if args.store:
+        store, computed, skipped = run_sweep_to_store(ranges, args.store, base, chunk_size=args.chunk_size,
+                                                      max_workers=args.workers)
+        print(f"{computed:,} scenarios run, {skipped:,} already stored | "
+              f"{len(store):,} in {args.store}")
+        if not args.out:
+            return 0
+        results = store.read()
+    else:
+        results = run_sweep(ranges, base, chunk_size=args.chunk_size, max_workers=args.workers)
+
+    solvent = results["first_shortfall_year"] < 0
+    print(f"{len(results):,} scenarios | {solvent.sum():,} never short "
+          f"({solvent.mean():.1%})" if len(results) else "No scenarios")
+
+    if args.out:
+        if args.out.endswith(".csv"):
+            np.savetxt(args.out, results, delimiter=",", header=",".join(results.dtype.names),
+                       comments="", fmt="%.10g")
+        else:
+            np.save(args.out, results)
+        print(f"Saved to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
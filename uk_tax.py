@@ -0,0 +1,194 @@
+"""
+UK income tax, National Insurance and student loan rules.
+
+Band definitions live in TAX_YEARS, one entry per tax year. Each year is
+compiled once into piecewise-linear breakpoints: every deduction is a linear
+function of pay between consecutive breakpoints, so evaluating a whole array
+of salaries is a single np.interp over the table, with no per-salary
+branching. The compiled tables also give the marginal rates directly (the
+slope of each segment).
+
+All deductions are charged on pay after salary-sacrifice pension
+contributions, which is how every tool in this repo treats the pension.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+# Bands are (lower threshold, rate) pairs, each rate applying from its
+# threshold up to the next one. Income tax thresholds are on taxable income
+# (pay above the personal allowance); NI and student loan thresholds are on pay.
+TAX_YEARS = {
+    "2024/25": {
+        "personal_allowance": 12570,
+        "taper_threshold": 100000,   # allowance falls by £1 for every £2 above this
+        "taper_rate": 0.5,
+        "income_tax": [(0, 0.20), (37700, 0.40), (125140, 0.45)],
+        "ni": [(12570, 0.08), (50270, 0.02)],
+        "student_loan": [(27295, 0.09)],  # Plan 2
+    },
+    "2025/26": {
+        "personal_allowance": 12570,
+        "taper_threshold": 100000,
+        "taper_rate": 0.5,
+        "income_tax": [(0, 0.20), (37700, 0.40), (125140, 0.45)],
+        "ni": [(12570, 0.08), (50270, 0.02)],
+        "student_loan": [(28470, 0.09)],
+    },
+}
+
+DEFAULT_TAX_YEAR = "2025/26"
+
+DEDUCTIONS = ("income_tax", "ni", "student_loan")
+
+
+# =========================
+# Direct evaluation of the bands (used to compile the tables)
+# =========================
+
+def _banded(amount, bands):
+    total = 0.0
+    for i, (lower, rate) in enumerate(bands):
+        upper = bands[i + 1][0] if i + 1 < len(bands) else np.inf
+        total += rate * min(max(amount - lower, 0.0), upper - lower)
+    return total
+
+
+def _allowance(pay, year):
+    excess = max(pay - year["taper_threshold"], 0.0)
+    return max(year["personal_allowance"] - excess * year["taper_rate"], 0.0)
+
+
+def _deduction(name, pay, year):
+    if name == "income_tax":
+        return _banded(max(pay - _allowance(pay, year), 0.0), year["income_tax"])
+    return _banded(pay, year[name])
+
+
+def _breakpoints(year):
+    """Every pay level where the slope of some deduction can change."""
+    allowance = year["personal_allowance"]
+    taper = year["taper_threshold"]
+    t = year["taper_rate"]
+
+    points = {0.0, allowance, taper, taper + allowance / t}
+    for limit, _ in year["income_tax"]:
+        # Pay at which taxable income reaches the band limit: with the full
+        # allowance, inside the taper, and with no allowance left
+        points.update([limit + allowance, (limit + allowance + taper * t) / (1 + t), limit])
+    for name in ("ni", "student_loan"):
+        points.update(limit for limit, _ in year[name])
+    return np.array(sorted(x for x in points if x >= 0))
+
+
+# =========================
+# Compiled rules
+# =========================
+
+# Batch size from which total_deductions switches from np.interp to hinges
+HINGE_MIN_SIZE = 256
+
+
+def _kinks(xs, values):
+    """Breakpoints and slope changes of a piecewise-linear table with values[0] == 0."""
+    slopes = np.diff(values) / np.diff(xs)
+    steps = np.diff(slopes, prepend=0.0)
+    keep = np.abs(steps) > 1e-12
+    return xs[:-1][keep], steps[keep]
+
+class TaxRules:
+    """One tax year compiled to piecewise-linear tables."""
+
+    # Last breakpoint, standing in for "no upper limit" so np.interp covers
+    # every realistic salary without clamping
+    TOP = 1e12
+
+    def __init__(self, tax_year=DEFAULT_TAX_YEAR):
+        if tax_year not in TAX_YEARS:
+            raise KeyError(f"Unknown tax year '{tax_year}' (have {sorted(TAX_YEARS)})")
+        year = TAX_YEARS[tax_year]
+        self.tax_year = tax_year
+
+        xs = np.append(_breakpoints(year), self.TOP)
+        values = np.array([[_deduction(name, x, year) for x in xs] for name in DEDUCTIONS])
+
+        self.breakpoints = xs
+        self.values = values                                   # (deduction, breakpoint)
+        # Rates are given to a few decimals; rounding drops the float noise of the diff
+        self.slopes = np.round(np.diff(values, axis=1) / np.diff(xs), 10)  # (deduction, segment)
+        self.totals = values.sum(axis=0)
+        self.totals_no_loan = values[:2].sum(axis=0)
+
+        # The same totals as a sum of hinges, value(0) + sum(k * max(pay - b, 0)),
+        # keeping only breakpoints where the combined slope really changes
+        self.kinks = _kinks(xs, self.totals)
+        self.kinks_no_loan = _kinks(xs, self.totals_no_loan)
+
+    def deductions(self, pay):
+        """Dict of income_tax, ni and student_loan for an array of pay."""
+        pay = np.asarray(pay, dtype=float)
+        return {name: np.interp(pay, self.breakpoints, self.values[i])
+                for i, name in enumerate(DEDUCTIONS)}
+
+    def total_deductions(self, pay, student_loan=True):
+        pay = np.asarray(pay, dtype=float)
+        if pay.size < HINGE_MIN_SIZE:
+            # Few salaries: one interp call has the least overhead
+            totals = self.totals if student_loan else self.totals_no_loan
+            return np.interp(pay, self.breakpoints, totals)
+
+        # Large batches: a handful of in-place passes beats interp's per-element search
+        points, steps = self.kinks if student_loan else self.kinks_no_loan
+        out = np.zeros_like(pay)
+        tmp = np.empty_like(pay)
+        for point, step in zip(points, steps):
+            np.subtract(pay, point, out=tmp)
+            np.maximum(tmp, 0.0, out=tmp)
+            tmp *= step
+            out += tmp
+        return out
+
+    def marginal_rates(self, pay):
+        """Dict of the rate on the next £1 of pay, per deduction."""
+        segment = np.searchsorted(self.breakpoints, np.asarray(pay, dtype=float), side="right") - 1
+        segment = np.clip(segment, 0, self.slopes.shape[1] - 1)
+        return {name: self.slopes[i, segment] for i, name in enumerate(DEDUCTIONS)}
+
+
+@lru_cache(maxsize=None)
+def rules(tax_year=DEFAULT_TAX_YEAR):
+    """Compiled TaxRules for a tax year (compiled once, then shared)."""
+    return TaxRules(tax_year)
+
+
+# =========================
+# Pay
+# =========================
+
+def breakdown(gross, pension_rate=0.05, tax_year=DEFAULT_TAX_YEAR, student_loan=True):
+    """
+    Take-home pay and its deductions for an array of gross salaries.
+    Returns a dict of net, pension, income_tax, ni and student_loan.
+    """
+    gross = np.asarray(gross, dtype=float)
+    pension = pension_rate * gross
+    out = rules(tax_year).deductions(gross - pension)
+    if not student_loan:
+        out["student_loan"] = np.zeros_like(out["ni"])
+    out["pension"] = pension
+    out["net"] = gross - pension - out["income_tax"] - out["ni"] - out["student_loan"]
+    return out
+
+
+def net_pay(gross, pension_rate=0.05, tax_year=DEFAULT_TAX_YEAR, student_loan=True):
+    """Take-home pay for an array of gross salaries (pension as salary sacrifice)."""
+    gross = np.asarray(gross, dtype=float)
+    pension = pension_rate * gross
+    return gross - pension - rules(tax_year).total_deductions(gross - pension, student_loan)
+
+
+def marginal_rates(gross, tax_year=DEFAULT_TAX_YEAR):
+    """(income_tax_rate, ni_rate) on the next £1 of gross pay."""
+    rates = rules(tax_year).marginal_rates(gross)
+    return rates["income_tax"], rates["ni"]